@@ -0,0 +1,229 @@
+"""Routing Benchmark - Measure accuracy and latency of tool routers
+
+Runs every query of a labeled corpus through one or more routers and reports
+per-tool precision/recall, the most frequent confusion pairs and the routing
+latency distribution, so routing changes can be judged on both axes.
+
+Usage (from the backend directory):
+    python -m benchmarks.routing_benchmark
+    python -m benchmarks.routing_benchmark \\
+        --router langgraph_pipeline.router:ToolRouter \\
+        --router my_routers.embedding:EmbeddingRouter --repeat 20 --json report.json
+
+A router is any class that can be passed to GraphBuilder(tool_registry, router=...):
+it is constructed with a tool registry and must provide an async
+route_query(query, active_tools) returning {"matched_tools": [{"tool": ...}, ...]}.
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "routing_corpus.jsonl"
+DEFAULT_ROUTER = "langgraph_pipeline.router:ToolRouter"
+NO_TOOL = "<none>"
+
+
+def load_corpus(path: Path) -> List[Dict[str, Any]]:
+    """Load labeled queries from a JSONL file"""
+    corpus = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if "query" not in entry or "expected_tools" not in entry:
+                raise ValueError(f"{path}:{line_no}: entry needs 'query' and 'expected_tools'")
+            corpus.append(entry)
+    return corpus
+
+
+def load_router(spec: str, tool_registry=None):
+    """Instantiate a router from a 'module.path:ClassName' spec"""
+    module_name, _, class_name = spec.partition(":")
+    if not class_name:
+        raise ValueError(f"Router spec must look like 'module:Class', got '{spec}'")
+    router_class = getattr(importlib.import_module(module_name), class_name)
+    return router_class(tool_registry)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+async def run_router(
+    router,
+    corpus: List[Dict[str, Any]],
+    repeat: int = 5,
+    active_tools: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Route every corpus query and collect accuracy and latency figures"""
+    counts = defaultdict(lambda: {"tp": 0, "fp": 0, "fn": 0})
+    confusion = Counter()
+    latencies_us = []
+    exact_matches = 0
+    primary_hits = 0
+    primary_total = 0
+
+    for entry in corpus:
+        expected = set(entry["expected_tools"])
+        routing = None
+
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            routing = await router.route_query(entry["query"], active_tools)
+            latencies_us.append((time.perf_counter() - start) * 1_000_000)
+
+        predicted_list = [match["tool"] for match in routing.get("matched_tools", [])]
+        predicted = set(predicted_list)
+
+        for tool in expected & predicted:
+            counts[tool]["tp"] += 1
+        for tool in predicted - expected:
+            counts[tool]["fp"] += 1
+        for tool in expected - predicted:
+            counts[tool]["fn"] += 1
+
+        # Pair every missed tool with every spurious one (or with "<none>")
+        missed = sorted(expected - predicted) or [NO_TOOL]
+        extra = sorted(predicted - expected) or [NO_TOOL]
+        if expected != predicted:
+            for expected_tool in missed:
+                for predicted_tool in extra:
+                    confusion[(expected_tool, predicted_tool)] += 1
+
+        if expected == predicted:
+            exact_matches += 1
+        if expected:
+            primary_total += 1
+            if predicted_list and predicted_list[0] in expected:
+                primary_hits += 1
+
+    per_tool = {}
+    for tool, c in sorted(counts.items()):
+        precision = c["tp"] / (c["tp"] + c["fp"]) if c["tp"] + c["fp"] else 0.0
+        recall = c["tp"] / (c["tp"] + c["fn"]) if c["tp"] + c["fn"] else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        per_tool[tool] = {**c, "precision": precision, "recall": recall, "f1": f1}
+
+    total_tp = sum(c["tp"] for c in counts.values())
+    total_fp = sum(c["fp"] for c in counts.values())
+    total_fn = sum(c["fn"] for c in counts.values())
+    latencies_us.sort()
+
+    return {
+        "queries": len(corpus),
+        "exact_match": exact_matches / len(corpus) if corpus else 0.0,
+        "primary_accuracy": primary_hits / primary_total if primary_total else 0.0,
+        "micro_precision": total_tp / (total_tp + total_fp) if total_tp + total_fp else 0.0,
+        "micro_recall": total_tp / (total_tp + total_fn) if total_tp + total_fn else 0.0,
+        "per_tool": per_tool,
+        "confusion_pairs": [
+            {"expected": e, "predicted": p, "count": n}
+            for (e, p), n in confusion.most_common()
+        ],
+        "latency_us": {
+            "samples": len(latencies_us),
+            "mean": statistics.fmean(latencies_us) if latencies_us else 0.0,
+            "p50": percentile(latencies_us, 50),
+            "p90": percentile(latencies_us, 90),
+            "p99": percentile(latencies_us, 99),
+            "max": latencies_us[-1] if latencies_us else 0.0
+        }
+    }
+
+
+def print_report(name: str, report: Dict[str, Any], top_confusions: int = 10):
+    """Print a human readable report for one router"""
+    print("\n" + "=" * 80)
+    print(f"🔀 {name}")
+    print("=" * 80)
+    print(f"   • Queries:          {report['queries']}")
+    print(f"   • Exact set match:  {report['exact_match']:.1%}")
+    print(f"   • Primary accuracy: {report['primary_accuracy']:.1%}")
+    print(f"   • Micro precision:  {report['micro_precision']:.1%}")
+    print(f"   • Micro recall:     {report['micro_recall']:.1%}")
+
+    latency = report["latency_us"]
+    print(
+        f"   • Latency (µs):     p50={latency['p50']:.1f} p90={latency['p90']:.1f} "
+        f"p99={latency['p99']:.1f} max={latency['max']:.1f} mean={latency['mean']:.1f}"
+    )
+
+    print(f"\n   {'tool':<16}{'prec':>8}{'recall':>8}{'f1':>8}{'tp':>6}{'fp':>6}{'fn':>6}")
+    for tool, m in report["per_tool"].items():
+        print(
+            f"   {tool:<16}{m['precision']:>8.2f}{m['recall']:>8.2f}{m['f1']:>8.2f}"
+            f"{m['tp']:>6}{m['fp']:>6}{m['fn']:>6}"
+        )
+
+    if report["confusion_pairs"]:
+        print("\n   Top confusion pairs (expected → predicted):")
+        for pair in report["confusion_pairs"][:top_confusions]:
+            print(f"   {pair['count']:>5} × {pair['expected']} → {pair['predicted']}")
+
+
+def print_comparison(reports: Dict[str, Dict[str, Any]]):
+    """Print a side-by-side summary when several routers were benchmarked"""
+    print("\n" + "=" * 80)
+    print("📊 COMPARISON")
+    print("=" * 80)
+    print(f"   {'router':<40}{'exact':>8}{'prec':>8}{'recall':>8}{'p50 µs':>10}{'p99 µs':>10}")
+    for name, r in reports.items():
+        print(
+            f"   {name:<40}{r['exact_match']:>8.1%}{r['micro_precision']:>8.1%}"
+            f"{r['micro_recall']:>8.1%}{r['latency_us']['p50']:>10.1f}{r['latency_us']['p99']:>10.1f}"
+        )
+
+
+async def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark tool routing accuracy and latency")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Labeled JSONL corpus")
+    parser.add_argument(
+        "--router",
+        action="append",
+        dest="routers",
+        help=f"Router as module:Class (repeatable, default: {DEFAULT_ROUTER})"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query")
+    parser.add_argument("--active-tools", help="Comma-separated active tools (default: all)")
+    parser.add_argument("--json", type=Path, help="Also write the full report to this file")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.corpus)
+    active_tools = [t.strip() for t in args.active_tools.split(",")] if args.active_tools else None
+
+    reports = {}
+    for spec in args.routers or [DEFAULT_ROUTER]:
+        router = load_router(spec)
+        reports[spec] = await run_router(router, corpus, args.repeat, active_tools)
+        print_report(spec, reports[spec])
+
+    if len(reports) > 1:
+        print_comparison(reports)
+
+    if args.json:
+        args.json.write_text(json.dumps(reports, indent=2), encoding="utf-8")
+        print(f"\n💾 Report written to {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,107 @@
+"""Startup Benchmark - Measure cold-start time and memory of tool registration
+
+Each run starts a fresh interpreter, imports the tool registry and registers
+all tools, then reports wall time and current RSS. Two modes are compared:
+
+    lazy   - register_all_tools() only (tools import on first use)
+    eager  - additionally load every tool, as startup did before lazy loading
+
+Usage (from the backend directory):
+    python -m benchmarks.startup_benchmark
+    python -m benchmarks.startup_benchmark --runs 10 --mode lazy --json startup.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+CHILD_SCRIPT = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+from utils.startup_profiler import current_rss_mb
+from utils.tool_registry import ToolRegistry
+registry = ToolRegistry()
+asyncio.run(registry.register_all_tools())
+if sys.argv[1] == "eager":
+    async def load_all():
+        for name in registry.get_tool_names():
+            await registry.load_tool(name)
+    asyncio.run(load_all())
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "startup_ms": elapsed * 1000,
+    "rss_mb": current_rss_mb(),
+    "tools_loaded": len(registry.get_all_tools()),
+    "modules": len(sys.modules)
+}))
+"""
+
+
+def run_once(mode: str) -> Dict[str, Any]:
+    """Start a fresh interpreter and measure one registration"""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, mode],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"{mode} run failed:\n{proc.stderr}")
+
+    # Registry logging goes to stderr; the last stdout line is the measurement
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_ms"] = wall_ms
+    return result
+
+
+def summarize(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Median of every numeric field across runs"""
+    return {
+        key: round(statistics.median(sample[key] for sample in samples), 2)
+        for key in samples[0]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure tool registry cold-start time and RSS")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per mode")
+    parser.add_argument("--mode", choices=["lazy", "eager", "both"], default="both")
+    parser.add_argument("--json", help="Write the summary to this file")
+    args = parser.parse_args(argv)
+
+    modes = ["lazy", "eager"] if args.mode == "both" else [args.mode]
+    report = {}
+
+    for mode in modes:
+        samples = [run_once(mode) for _ in range(args.runs)]
+        report[mode] = summarize(samples)
+
+    print(f"{'mode':<8}{'process ms':>12}{'startup ms':>12}{'RSS MB':>12}{'tools':>7}{'modules':>9}")
+    for mode, summary in report.items():
+        print(
+            f"{mode:<8}{summary['process_ms']:>12.1f}{summary['startup_ms']:>12.1f}"
+            f"{summary['rss_mb']:>12.1f}{summary['tools_loaded']:>7.0f}{summary['modules']:>9.0f}"
+        )
+
+    if "lazy" in report and "eager" in report:
+        saved_ms = report["eager"]["startup_ms"] - report["lazy"]["startup_ms"]
+        saved_mb = report["eager"]["rss_mb"] - report["lazy"]["rss_mb"]
+        print(f"\nLazy loading saves {saved_ms:.1f} ms and {saved_mb:.1f} MB at startup")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Startup Profile - Import-time tree, per-phase startup cost and a budget check
+
+Runs two fresh interpreters from the backend directory:
+
+    1. python -X importtime -c "import main"  -> per-module import cost tree
+    2. main.lifespan() startup + shutdown      -> time and RSS per startup phase
+                                                  (utils.startup_profiler)
+
+and writes a combined report. With --budget-ms / --rss-budget-mb the script
+exits with status 1 when startup exceeds the budget, so it can run in CI as a
+regression check.
+
+Usage (from the backend directory):
+    python -m benchmarks.startup_profile
+    python -m benchmarks.startup_profile --output startup_report.json --budget-ms 4000 --rss-budget-mb 400
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+LIFESPAN_SCRIPT = """
+import asyncio
+import main
+
+async def run():
+    async with main.lifespan(main.app):
+        pass
+
+asyncio.run(run())
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse `-X importtime` output into rows with depth, self and cumulative ms"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        if line.count("|") < 2:
+            continue
+        head, cumulative_us, name = line.split("|", 2)
+        self_us = head.replace("import time:", "").strip()
+        stripped = name.lstrip()
+        rows.append({
+            "module": stripped.strip(),
+            "depth": (len(name) - len(stripped) - 1) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us.strip()) / 1000
+        })
+    return rows
+
+
+def build_tree(rows: List[Dict[str, Any]], min_ms: float) -> List[Dict[str, Any]]:
+    """Nest importtime rows (children are printed before their parent) above min_ms"""
+    roots: List[Dict[str, Any]] = []
+    pending: Dict[int, List[Dict[str, Any]]] = {}
+
+    for row in rows:
+        node = {**row, "children": pending.pop(row["depth"] + 1, [])}
+        if row["cumulative_ms"] < min_ms:
+            continue
+        if row["depth"] == 0:
+            roots.append(node)
+        else:
+            pending.setdefault(row["depth"], []).append(node)
+
+    roots.sort(key=lambda node: node["cumulative_ms"], reverse=True)
+    return roots
+
+
+def profile_imports(min_ms: float) -> Dict[str, Any]:
+    """Import main under -X importtime and summarize module costs"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import main failed:\n{proc.stderr[-2000:]}")
+
+    rows = parse_importtime(proc.stderr)
+    return {
+        "modules": len(rows),
+        "total_ms": round(sum(row["self_ms"] for row in rows), 2),
+        "top_self": sorted(rows, key=lambda row: row["self_ms"], reverse=True)[:20],
+        "tree": build_tree(rows, min_ms)
+    }
+
+
+def profile_lifespan() -> Dict[str, Any]:
+    """Run the app's startup and shutdown and collect the phase report"""
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = Path(tmp) / "startup.json"
+        env = {**os.environ, "STARTUP_PROFILE_PATH": str(report_path)}
+        proc = subprocess.run(
+            [sys.executable, "-c", LIFESPAN_SCRIPT],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            env=env
+        )
+        if proc.returncode != 0 or not report_path.exists():
+            raise RuntimeError(f"lifespan run failed:\n{proc.stderr[-2000:]}")
+        return json.loads(report_path.read_text(encoding="utf-8"))
+
+
+def check_budget(startup: Dict[str, Any], budget_ms: Optional[float], rss_budget_mb: Optional[float]) -> List[str]:
+    """Budget violations, empty when within budget"""
+    violations = []
+    if budget_ms is not None and startup["total_ms"] > budget_ms:
+        violations.append(f"startup took {startup['total_ms']:.0f} ms (budget {budget_ms:.0f} ms)")
+    if rss_budget_mb is not None and startup["rss_mb"] > rss_budget_mb:
+        violations.append(f"RSS reached {startup['rss_mb']:.0f} MB (budget {rss_budget_mb:.0f} MB)")
+    return violations
+
+
+def print_tree(nodes: List[Dict[str, Any]], max_depth: int, indent: int = 0):
+    for node in nodes:
+        print(f"{node['cumulative_ms']:>10.1f} {node['self_ms']:>9.1f}  {'  ' * indent}{node['module']}")
+        if indent < max_depth:
+            print_tree(sorted(node["children"], key=lambda n: n["cumulative_ms"], reverse=True), max_depth, indent + 1)
+
+
+def print_report(report: Dict[str, Any], max_depth: int):
+    imports = report["imports"]
+    print(f"\n📦 IMPORTS: {imports['modules']} modules, {imports['total_ms']:.0f} ms")
+    print(f"{'cumul ms':>10} {'self ms':>9}  module")
+    print_tree(imports["tree"], max_depth)
+
+    startup = report["startup"]
+    print(f"\n🚀 STARTUP: {startup['total_ms']:.0f} ms, RSS {startup['rss_mb']:.0f} MB")
+    print(f"{'phase':<22}{'ms':>10}{'RSS MB':>10}")
+    for phase in startup["phases"]:
+        print(f"{phase['phase']:<22}{phase['duration_ms']:>10.1f}{phase['rss_mb']:>10.1f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Profile server imports and startup phases")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--budget-ms", type=float, default=_env_float("STARTUP_BUDGET_MS"))
+    parser.add_argument("--rss-budget-mb", type=float, default=_env_float("STARTUP_RSS_BUDGET_MB"))
+    parser.add_argument("--min-ms", type=float, default=5.0, help="Hide imports cheaper than this")
+    parser.add_argument("--depth", type=int, default=2, help="Import tree depth to print")
+    args = parser.parse_args(argv)
+
+    report = {"imports": profile_imports(args.min_ms), "startup": profile_lifespan()}
+    violations = check_budget(report["startup"], args.budget_ms, args.rss_budget_mb)
+    report["budget"] = {
+        "budget_ms": args.budget_ms,
+        "rss_budget_mb": args.rss_budget_mb,
+        "violations": violations
+    }
+
+    print_report(report, args.depth)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📝 Report written to {args.output}")
+
+    if violations:
+        for violation in violations:
+            print(f"❌ Startup budget exceeded: {violation}")
+        return 1
+    if args.budget_ms is not None or args.rss_budget_mb is not None:
+        print("✅ Startup within budget")
+    return 0
+
+
+def _env_float(name: str) -> Optional[float]:
+    value = os.environ.get(name)
+    return float(value) if value else None
+
+
+if __name__ == "__main__":
+    sys.exit(main())
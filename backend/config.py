@@ -1,6 +1,6 @@
 import os
 from pydantic_settings import BaseSettings
-from typing import Optional, List
+from typing import Optional, List, Dict
 from pydantic import field_validator
 
 class Settings(BaseSettings):
@@ -16,6 +16,33 @@ class Settings(BaseSettings):
     # Database Configuration
     MONGODB_URL: str = "mongodb://localhost:27017"
     DATABASE_NAME: str = "ai_mcp_orchestrator"
+    STORAGE_BACKEND: str = "auto"  # mongo | sqlite | auto (MongoDB, falling back to SQLite when unreachable)
+    SQLITE_PATH: str = "./workspace/chat_store.db"  # Embedded WAL-mode database for the sqlite backend
+    MEMORY_MAX_SESSIONS: int = 1000  # real_ai_server: sessions kept in memory (LRU)
+    MEMORY_MAX_SESSION_MESSAGES: int = 200  # real_ai_server: recent messages kept per session
+    MEMORY_MAX_LOGS: int = 5000  # real_ai_server: recent chat log entries kept in memory
+    HISTORY_CACHE_ENABLED: bool = True  # Serve recent history pages from per-session ring buffers
+    HISTORY_CACHE_SESSIONS: int = 1000  # Sessions with a ring buffer (LRU)
+    HISTORY_CACHE_MESSAGES: int = 100  # Newest messages kept per session
+    HISTORY_CACHE_VALIDATE: bool = True  # Check the session's latest seq before a hit (needed with several workers)
+    SESSION_MEMORY_TOKEN_BUDGET: int = 4000  # History tokens loaded into LLM memory when a session is rehydrated
+    SESSION_REHYDRATE_MAX_MESSAGES: int = 100  # Newest messages read when rehydrating (before the token budget)
+    SESSION_REHYDRATE_CONCURRENCY: int = 8  # Session loads allowed at once after a restart
+    TOOL_LOG_INLINE_MAX_BYTES: int = 4096  # Larger tool results are summarized inline and stored compressed
+    TOOL_LOG_COMPRESSION: str = ""  # zstd | zlib (default: zstd when installed)
+    RETENTION_ENABLED: bool = False  # Archive and delete history past its retention in the background
+    RETENTION_DAYS: Dict[str, int] = {"chat_messages": 90, "tool_logs": 30}  # 0 keeps a collection forever
+    RETENTION_SWEEP_INTERVAL_S: float = 3600
+    RETENTION_ARCHIVE_DIR: str = "./workspace/archive"  # Empty deletes without archiving
+    RETENTION_BATCH_SIZE: int = 1000
+    MONGO_MAX_POOL_SIZE: int = 50  # Connections per worker process, shared by all components
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: int = 60000  # Close connections idle longer than this
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 2000  # Fail a checkout instead of waiting forever on a saturated pool
+    DB_WRITE_BEHIND_ENABLED: bool = True  # Batch chat/tool-log inserts off the response path
+    DB_WRITE_BATCH_SIZE: int = 100  # Flush once this many documents are queued...
+    DB_WRITE_FLUSH_MS: float = 200  # ...or this long after the first one arrived
+    DB_WRITE_QUEUE_MAX: int = 5000  # Writers wait (backpressure) when this many are pending
     
     # Server Configuration
     HOST: str = "0.0.0.0"
@@ -25,16 +52,77 @@ class Settings(BaseSettings):
     # CORS Settings
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:5173"]
     
-    @field_validator('CORS_ORIGINS', mode='before')
+    @field_validator('CORS_ORIGINS', 'TOOL_PRELOAD', mode='before')
     @classmethod
     def parse_cors_origins(cls, v):
         if isinstance(v, str):
-            return [origin.strip() for origin in v.split(',')]
+            return [origin.strip() for origin in v.split(',') if origin.strip()]
         return v
     
     # MCP Configuration
     MCP_TIMEOUT: int = 30
     MAX_CONCURRENT_TOOLS: int = 5
+    TOOL_PRELOAD: List[str] = []  # Tools imported at startup; all others load on first use
+    TOOL_INIT_TIMEOUT: float = 1.0  # Per-tool startup deadline; slower initializers finish in the background
+    
+    # Router Configuration
+    ROUTER_CONFIDENCE_THRESHOLD: float = 0.6  # Only tools above this are re-ranked by latency
+    ROUTER_LATENCY_WEIGHT: float = 0.3  # 0 = keyword relevance only, 1 = latency only
+    ROUTER_LATENCY_REFERENCE_MS: float = 1000.0  # Latency that scores 0.5 on the speed scale
+    ROUTER_MIN_SUCCESS_RATE: float = 0.5  # Tools below this are treated as unhealthy
+    TOOL_STATS_DECAY: float = 0.2
+    TOOL_STATS_WINDOW: int = 200
+    TOOL_CACHE_MAX_ENTRIES: int = 512
+    PARAM_EXTRACTION_MIN_CONFIDENCE: float = 0.7  # Above this, skip the LLM intent/planning call
+    ROUTER_MIN_READINESS: float = 0.3  # Tools below this readiness are ranked behind ready ones
+    
+    # Background tool health probing
+    HEALTH_PROBE_ENABLED: bool = True
+    HEALTH_PROBE_INTERVAL_S: float = 60.0
+    HEALTH_PROBE_JITTER: float = 0.2  # Probes spread over this fraction of the interval
+    HEALTH_PROBE_CONCURRENCY: int = 2
+    HEALTH_PROBE_TIMEOUT_S: float = 5.0
+    HEALTH_DEAD_AFTER: int = 3  # Consecutive failed probes before a tool scores 0
+    
+    # Process pool for cpu-class tools (see services/process_pool.py)
+    CPU_POOL_ENABLED: bool = True
+    CPU_POOL_WORKERS: int = 2
+    CPU_POOL_MAX_TASKS_PER_CHILD: int = 200  # Worker is replaced after this many calls
+    CPU_POOL_MAX_RSS_GROWTH_MB: float = 256.0  # Pool is recycled when a worker grows this much
+    CPU_POOL_TIMEOUT_S: float = 30.0  # Per-call deadline; a stuck worker is killed
+    
+    # Per-tool thread pools for blocking libraries: tool -> [workers, queue limit]
+    BULKHEAD_LIMITS: Dict[str, List[int]] = {
+        "web_search": [4, 16],
+        "wikipedia": [4, 16],
+        "translator": [2, 8],
+        "email": [2, 4]
+    }
+    BULKHEAD_DEFAULT_WORKERS: int = 2
+    BULKHEAD_DEFAULT_QUEUE: int = 8
+    
+    # Event-loop lag monitor (reports at /api/debug/loop-lag)
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_LAG_INTERVAL_MS: float = 100.0
+    LOOP_LAG_THRESHOLD_MS: float = 250.0  # Stalls longer than this are captured with their stack
+    LOOP_LAG_MAX_REPORTS: int = 50
+    
+    # Write the startup phase report (see benchmarks/startup_profile.py) to this file
+    STARTUP_PROFILE_PATH: Optional[str] = None
+    
+    # WebSocket connections
+    WS_MAX_IN_FLIGHT: int = 4  # chat / multi_tool requests running at once per connection
+    WS_SEND_QUEUE_MAX: int = 100  # Outbound messages queued per connection
+    WS_SLOW_CONSUMER_POLICY: str = "drop_oldest"  # drop_oldest | coalesce | disconnect (when a broadcast finds the queue full)
+    WS_SEND_TIMEOUT_S: float = 10.0  # A send taking longer marks the connection dead
+    
+    # Speculative prefetch while typing (WebSocket "typing" messages)
+    SPECULATION_ENABLED: bool = True
+    SPECULATION_BUDGET: int = 5  # Speculative executions per session per window
+    SPECULATION_WINDOW_S: float = 60.0
+    SPECULATION_MAX_IN_FLIGHT: int = 2
+    SPECULATION_DEBOUNCE_MS: float = 300.0
+    SPECULATION_MIN_CONFIDENCE: float = 0.6
     
     # Email Configuration (for Email MCP)
     SMTP_HOST: Optional[str] = None
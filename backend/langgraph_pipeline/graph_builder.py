@@ -1,11 +1,12 @@
 """Graph Builder - Build LangGraph orchestration pipeline"""
 
 from langgraph.graph import StateGraph, END
-from typing import Dict, Any, TypedDict, Annotated
+from typing import Dict, Any, Optional, TypedDict, Annotated
 from typing_extensions import TypedDict
 import operator
 from .llm_agent import LLMAgent
 from .router import ToolRouter
+from .speculation import SpeculativePrefetcher
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,10 +24,12 @@ class AgentState(TypedDict):
 class GraphBuilder:
     """Build and manage LangGraph orchestration pipeline"""
     
-    def __init__(self, tool_registry):
+    def __init__(self, tool_registry, router=None):
         self.tool_registry = tool_registry
         self.llm_agent = LLMAgent()
-        self.router = ToolRouter(tool_registry)
+        # Any object with ToolRouter's interface can be plugged in (see benchmarks/routing_benchmark.py)
+        self.router = router or ToolRouter(tool_registry)
+        self.speculator = SpeculativePrefetcher(self.router)
         self.graph = self._build_graph()
         
         logger.info("✅ LangGraph pipeline built")
@@ -62,7 +65,12 @@ class GraphBuilder:
         try:
             logger.info("📊 Analyzing intent...")
             
-            analysis = await self.llm_agent.analyze_intent(state["query"])
+            # Confident local routing + parameter extraction makes the LLM planning call redundant
+            analysis = await self._local_intent(state["query"], state.get("active_tools", []))
+            if analysis:
+                logger.info(f"⚡ Local plan for {analysis['tool']}.{analysis['action']} - skipping LLM intent call")
+            else:
+                analysis = await self.llm_agent.analyze_intent(state["query"])
             
             state["messages"].append({
                 "node": "analyze_intent",
@@ -76,6 +84,26 @@ class GraphBuilder:
             state["error"] = str(e)
             return state
     
+    async def _local_intent(self, query: str, active_tools: list) -> Optional[Dict[str, Any]]:
+        """Intent analysis from the keyword router and rule-based extractor, if confident"""
+        routing = await self.router.route_query(query, active_tools)
+        if not routing["primary_tool"]:
+            return None
+        
+        plan = self.router.plan_action(routing["primary_tool"], query)
+        if not plan:
+            return None
+        
+        return {
+            "success": True,
+            "source": "local",
+            "query": query,
+            "tool": routing["primary_tool"],
+            "action": plan["action"],
+            "params": plan["params"],
+            "confidence": plan["confidence"]
+        }
+    
     async def _route_tools_node(self, state: AgentState) -> AgentState:
         """Route to appropriate tools"""
         try:
@@ -121,11 +149,12 @@ class GraphBuilder:
             # Execute primary tool (simplified - in production, execute based on query)
             primary_tool = matched_tools[0]["tool"]
             
-            # Mock execution - in production, parse query to extract action and params
+            # Derive action and params from the query where the router knows how
+            plan = self.router.plan_action(primary_tool, state["query"]) or {"action": "execute", "params": {}}
             result = await self.router.execute_tool(
                 primary_tool,
-                "execute",
-                {}
+                plan["action"],
+                plan["params"]
             )
             
             state["tool_results"] = {primary_tool: result}
@@ -6,10 +6,15 @@ from langchain.memory import ConversationBufferMemory
 from langchain.schema import HumanMessage, AIMessage, SystemMessage
 from typing import Dict, Any, List
 from config import settings
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for budgeting prompt history"""
+    return len(text) // 4 + 1
+
 class LLMAgent:
     """LLM Agent using Google Gemini 2.0 Flash"""
     
@@ -27,8 +32,12 @@ class LLMAgent:
             convert_system_message_to_human=True
         )
         
-        # Conversation memory
+        # Conversation memory, rehydrated lazily from `store` (a ChatStore) on first use
         self.sessions = {}
+        self.store = None
+        self._loading: Dict[str, asyncio.Task] = {}
+        self._rehydrate_slots = asyncio.Semaphore(max(1, settings.SESSION_REHYDRATE_CONCURRENCY))
+        self.rehydration_stats = {"loaded": 0, "empty": 0, "deduplicated": 0, "failed": 0, "messages": 0}
         
         logger.info(f"✅ LLM Agent initialized with {self.model_name}")
     
@@ -41,6 +50,79 @@ class LLMAgent:
             )
         return self.sessions[session_id]
     
+    async def load_session_memory(self, session_id: str) -> ConversationBufferMemory:
+        """
+        Get session memory, rehydrating it from persisted history on first access
+        
+        Concurrent first requests for a session share one load. Loads are
+        limited to SESSION_REHYDRATE_CONCURRENCY at a time so a restart under
+        traffic does not stampede the database.
+        """
+        if session_id in self.sessions or self.store is None or not self.store.is_connected():
+            return self.get_session_memory(session_id)
+        
+        task = self._loading.get(session_id)
+        if task is None:
+            task = asyncio.create_task(self._rehydrate(session_id))
+            self._loading[session_id] = task
+            task.add_done_callback(lambda _: self._loading.pop(session_id, None))
+        else:
+            self.rehydration_stats["deduplicated"] += 1
+        
+        # Shielded: one cancelled request must not abort the load others are waiting on
+        await asyncio.shield(task)
+        return self.get_session_memory(session_id)
+    
+    async def _rehydrate(self, session_id: str):
+        async with self._rehydrate_slots:
+            if session_id in self.sessions:
+                return
+            try:
+                # Newest window only - one indexed range scan, never the full history
+                history = await self.store.get_chat_history(
+                    session_id,
+                    limit=settings.SESSION_REHYDRATE_MAX_MESSAGES,
+                    fields=["role", "content"]
+                )
+            except Exception as e:
+                self.rehydration_stats["failed"] += 1
+                logger.warning(f"⚠️  Could not rehydrate session {session_id}: {str(e)}")
+                history = []
+            
+            # Generated meanwhile by a request that did not wait for the load
+            if session_id in self.sessions:
+                return
+            
+            window = self._token_window(history, settings.SESSION_MEMORY_TOKEN_BUDGET)
+            memory = ConversationBufferMemory(return_messages=True, memory_key="chat_history")
+            for msg in window:
+                if msg["role"] == "user":
+                    memory.chat_memory.add_user_message(msg["content"])
+                else:
+                    memory.chat_memory.add_ai_message(msg["content"])
+            self.sessions[session_id] = memory
+            
+            self.rehydration_stats["loaded" if window else "empty"] += 1
+            self.rehydration_stats["messages"] += len(window)
+            if window:
+                logger.info(f"🧠 Rehydrated session {session_id} with {len(window)} messages")
+    
+    @staticmethod
+    def _token_window(history: List[Dict[str, Any]], budget: int) -> List[Dict[str, Any]]:
+        """Newest user/assistant messages that fit the token budget, oldest first"""
+        window, used = [], 0
+        for msg in reversed(history):
+            if msg.get("role") not in ("user", "assistant") or not msg.get("content"):
+                continue
+            used += estimate_tokens(msg["content"])
+            if used > budget:
+                break
+            window.append(msg)
+        # Start on a user turn so the model never sees an orphaned reply first
+        while window and window[-1]["role"] != "user":
+            window.pop()
+        return list(reversed(window))
+    
     async def generate_response(
         self,
         query: str,
@@ -61,7 +143,7 @@ class LLMAgent:
             Dictionary with AI response and metadata
         """
         try:
-            memory = self.get_session_memory(session_id)
+            memory = await self.load_session_memory(session_id)
             
             # Build system prompt
             system_prompt = self._build_system_prompt(tools_available)
@@ -1,6 +1,14 @@
 """Tool Router - Route queries to appropriate MCP tools"""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterator, Optional, Tuple
+from config import settings
+from .tool_stats import ToolStatsTracker
+from .tool_cache import ToolResultCache
+from utils.param_extractor import ParamExtractor
+from services.process_pool import run_blocking
+from utils.loop_monitor import loop_monitor
+import asyncio
+import time
 import re
 import logging
 
@@ -12,6 +20,26 @@ class ToolRouter:
     def __init__(self, tool_registry):
         self.tool_registry = tool_registry
         
+        # Live per-tool latency / success statistics used for ranking
+        self.tool_stats = ToolStatsTracker(
+            decay=settings.TOOL_STATS_DECAY,
+            window=settings.TOOL_STATS_WINDOW
+        )
+        self.latency_weight = settings.ROUTER_LATENCY_WEIGHT
+        self.confidence_threshold = settings.ROUTER_CONFIDENCE_THRESHOLD
+        
+        # Background readiness scores (services.health_prober), attached at startup
+        self.health_prober = None
+        
+        # Worker processes for cpu-class tools (services.process_pool), attached at startup
+        self.process_pool = None
+        
+        # Results of idempotent tool actions (see each tool's cacheable_actions)
+        self.result_cache = ToolResultCache(max_entries=settings.TOOL_CACHE_MAX_ENTRIES)
+        
+        # Rule-based parameter extraction driven by each tool's schema
+        self.param_extractor = ParamExtractor(tool_registry)
+        
         # Tool keywords for routing
         self.tool_keywords = {
             "web_search": ["search", "find", "look up", "google", "web", "internet", "online"],
@@ -63,8 +91,9 @@ class ToolRouter:
                     })
                     break
         
-        # Sort by confidence
+        # Sort by confidence, then prefer fast healthy tools among confident matches
         matched_tools.sort(key=lambda x: x["confidence"], reverse=True)
+        matched_tools = self._rank_by_performance(matched_tools)
         
         return {
             "query": query,
@@ -78,6 +107,70 @@ class ToolRouter:
         matches = sum(1 for keyword in keywords if keyword in query)
         return min(matches / len(keywords) + 0.5, 1.0)
     
+    def _rank_by_performance(self, matched_tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Re-rank confident matches by a blend of relevance and observed speed
+        
+        Tools above the confidence threshold are scored as
+        (1 - w) * confidence + w * speed, where speed is 1.0 for instant tools,
+        0.5 at ROUTER_LATENCY_REFERENCE_MS and tends to 0 for slow ones. Unhealthy
+        tools (low live success rate or readiness below ROUTER_MIN_READINESS) drop
+        behind healthy ones; matches below the threshold keep their keyword
+        order at the end.
+        """
+        reference = settings.ROUTER_LATENCY_REFERENCE_MS / 1000
+        confident, others = [], []
+        
+        for match in matched_tools:
+            tool_name = match["tool"]
+            latency = self.tool_stats.expected_latency(tool_name)
+            speed = reference / (reference + latency) if latency is not None else 0.5
+            
+            readiness = self.health_prober.readiness_score(tool_name) if self.health_prober else None
+            
+            match["readiness"] = readiness
+            match["healthy"] = (
+                self.tool_stats.is_healthy(tool_name, settings.ROUTER_MIN_SUCCESS_RATE)
+                and (readiness is None or readiness >= settings.ROUTER_MIN_READINESS)
+            )
+            match["latency_ms"] = round(latency * 1000, 2) if latency is not None else None
+            match["score"] = round(
+                (1 - self.latency_weight) * match["confidence"] + self.latency_weight * speed,
+                4
+            )
+            
+            if match["confidence"] >= self.confidence_threshold:
+                confident.append(match)
+            else:
+                others.append(match)
+        
+        confident.sort(key=lambda x: (x["healthy"], x["score"]), reverse=True)
+        others.sort(key=lambda x: x["healthy"], reverse=True)
+        return confident + others
+    
+    def plan_action(self, tool_name: str, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Derive a concrete action and parameters for a tool from the raw query
+        
+        Returns:
+            {"action": ..., "params": {...}, "confidence": ...} or None when
+            local extraction is unsupported or not confident enough
+        """
+        extraction = self.param_extractor.extract(tool_name, query)
+        if not extraction or extraction["confidence"] < settings.PARAM_EXTRACTION_MIN_CONFIDENCE:
+            return None
+        
+        return {
+            "action": extraction["action"],
+            "params": extraction["params"],
+            "confidence": extraction["confidence"]
+        }
+    
+    def is_cacheable(self, tool_name: str, action: str) -> bool:
+        """Whether a tool declares this action idempotent and cacheable"""
+        metadata = self.tool_registry.get_tool_metadata(tool_name) if self.tool_registry else None
+        return bool(metadata) and action in metadata.get("cacheable_actions", {})
+    
     async def execute_tool(
         self,
         tool_name: str,
@@ -96,7 +189,7 @@ class ToolRouter:
             Tool execution result
         """
         try:
-            tool = self.tool_registry.get_tool(tool_name)
+            tool = await self.tool_registry.load_tool(tool_name, timeout=settings.TOOL_INIT_TIMEOUT)
             
             if not tool:
                 return {
@@ -104,6 +197,13 @@ class ToolRouter:
                     "error": f"Tool '{tool_name}' not found or not active"
                 }
             
+            if self.tool_registry.get_tool_state(tool_name) == "warming":
+                return {
+                    "success": False,
+                    "error": f"Tool '{tool_name}' is still warming up, try again shortly",
+                    "tool": tool_name
+                }
+            
             if not tool.enabled:
                 return {
                     "success": False,
@@ -112,14 +212,24 @@ class ToolRouter:
             
             logger.info(f"🔧 Executing {tool_name}.{action}")
             
-            # Execute tool
-            result = await tool.execute(action=action, **params)
+            # Idempotent actions are served from / stored in the result cache
+            cache_ttl = getattr(tool, "cacheable_actions", {}).get(action)
+            if cache_ttl:
+                result, cached = await self.result_cache.get_or_run(
+                    self.result_cache.make_key(tool_name, action, params),
+                    lambda: self._timed_execute(tool, tool_name, action, params),
+                    cache_ttl
+                )
+            else:
+                result = await self._timed_execute(tool, tool_name, action, params)
+                cached = False
             
             return {
                 "success": True,
                 "tool": tool_name,
                 "action": action,
-                "result": result
+                "result": result,
+                "cached": cached
             }
             
         except Exception as e:
@@ -130,28 +240,67 @@ class ToolRouter:
                 "tool": tool_name
             }
     
+    async def _timed_execute(
+        self,
+        tool,
+        tool_name: str,
+        action: str,
+        params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Execute a tool and record its latency and outcome"""
+        start = time.perf_counter()
+        try:
+            with loop_monitor.activity(f"tool:{tool_name}"):
+                result = await self._dispatch(tool, tool_name, action, params)
+        except Exception:
+            self.tool_stats.record(tool_name, time.perf_counter() - start, False)
+            raise
+        
+        succeeded = result.get("success", True) if isinstance(result, dict) else True
+        self.tool_stats.record(tool_name, time.perf_counter() - start, succeeded)
+        return result
+    
+    async def _dispatch(
+        self,
+        tool,
+        tool_name: str,
+        action: str,
+        params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Run a tool call where its execution class says it belongs"""
+        execution_class = getattr(tool, "execution_class", "io-async")
+        
+        if execution_class == "cpu" and self.process_pool:
+            metadata = self.tool_registry.get_tool_metadata(tool_name)
+            return await self.process_pool.run(metadata["module"], metadata["class"], action, params)
+        
+        if execution_class in ("cpu", "io-blocking"):
+            # Keep GIL-holding / blocking work off the event loop thread
+            return await asyncio.to_thread(run_blocking, tool, action, params)
+        
+        return await tool.execute(action=action, **params)
+    
     async def execute_multi_tool(
         self,
-        tool_actions: List[Dict[str, Any]]
+        tool_actions: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
     ) -> Dict[str, Any]:
         """
-        Execute multiple tools in sequence
+        Execute multiple tools concurrently
         
         Args:
             tool_actions: List of tool actions to execute
+            max_concurrency: Maximum actions in flight (default: MAX_CONCURRENT_TOOLS)
+            timeout: Per-action timeout in seconds (default: MCP_TIMEOUT)
             
         Returns:
-            Combined results
+            Combined results, in the same order as tool_actions
         """
-        results = []
+        results: List[Optional[Dict[str, Any]]] = [None] * len(tool_actions)
         
-        for tool_action in tool_actions:
-            result = await self.execute_tool(
-                tool_action["tool"],
-                tool_action["action"],
-                tool_action.get("params", {})
-            )
-            results.append(result)
+        async for item in self.iter_multi_tool(tool_actions, max_concurrency, timeout):
+            results[item["index"]] = item["result"]
         
         return {
             "success": all(r.get("success", False) for r in results),
@@ -159,6 +308,79 @@ class ToolRouter:
             "count": len(results)
         }
     
+    async def iter_multi_tool(
+        self,
+        tool_actions: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute multiple tools concurrently, yielding each result as it completes
+        
+        Args:
+            tool_actions: List of tool actions to execute
+            max_concurrency: Maximum actions in flight (default: MAX_CONCURRENT_TOOLS)
+            timeout: Per-action timeout in seconds (default: MCP_TIMEOUT)
+            
+        Yields:
+            Dictionaries with the action's position in tool_actions and its result
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or settings.MAX_CONCURRENT_TOOLS))
+        timeout = timeout or settings.MCP_TIMEOUT
+        
+        tasks = [
+            asyncio.create_task(self._execute_indexed(index, tool_action, semaphore, timeout))
+            for index, tool_action in enumerate(tool_actions)
+        ]
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, result = await next_done
+                yield {"index": index, "result": result}
+        finally:
+            # Consumer stopped early or was cancelled - don't leave actions running
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def _execute_indexed(
+        self,
+        index: int,
+        tool_action: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        timeout: float
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Execute one action of a multi-tool call, never raising"""
+        tool_name = tool_action.get("tool")
+        
+        async with semaphore:
+            try:
+                result = await asyncio.wait_for(
+                    self.execute_tool(
+                        tool_name,
+                        tool_action.get("action"),
+                        tool_action.get("params", {})
+                    ),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"⏱️ {tool_name} timed out after {timeout}s")
+                result = {
+                    "success": False,
+                    "error": f"Tool '{tool_name}' timed out after {timeout}s",
+                    "tool": tool_name
+                }
+            except Exception as e:
+                logger.error(f"❌ Tool execution error: {str(e)}")
+                result = {
+                    "success": False,
+                    "error": str(e),
+                    "tool": tool_name
+                }
+        
+        return index, result
+    
     def suggest_tools(self, query: str) -> List[str]:
         """Suggest tools based on query analysis"""
         routing = self.route_query(query)
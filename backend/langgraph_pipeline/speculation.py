@@ -0,0 +1,149 @@
+"""Speculation - Prefetch cacheable tool results while the user is typing"""
+
+from typing import Dict, Any, List, Optional
+from collections import deque
+from config import settings
+import asyncio
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class _SessionState:
+    """Speculation bookkeeping for one chat session"""
+    
+    def __init__(self):
+        self.pending: Optional[asyncio.Task] = None  # debounced planning task
+        self.running: Dict[str, asyncio.Task] = {}  # cache key -> speculative execution
+        self.started_at = deque()  # start times inside the budget window
+
+class SpeculativePrefetcher:
+    """
+    Warms the router's tool result cache from partial queries
+    
+    Only high-confidence matches whose planned action is declared cacheable by
+    the tool are executed. Each session has a rolling budget of speculative
+    executions and a cap on how many may run at once; speculation that no
+    longer matches the latest input (or the final query) is cancelled.
+    """
+    
+    def __init__(self, router):
+        self.router = router
+        self.enabled = settings.SPECULATION_ENABLED
+        self.budget = settings.SPECULATION_BUDGET
+        self.window = settings.SPECULATION_WINDOW_S
+        self.max_in_flight = settings.SPECULATION_MAX_IN_FLIGHT
+        self.debounce = settings.SPECULATION_DEBOUNCE_MS / 1000
+        self.min_confidence = settings.SPECULATION_MIN_CONFIDENCE
+        self.min_query_length = 6
+        self.sessions: Dict[str, _SessionState] = {}
+        self.stats = {"started": 0, "cancelled": 0, "skipped_budget": 0}
+    
+    async def on_typing(self, session_id: str, partial_query: str, active_tools: List[str] = None):
+        """Handle a partial query; planning is debounced so only pauses in typing speculate"""
+        if not self.enabled or len(partial_query.strip()) < self.min_query_length:
+            return
+        
+        state = self.sessions.setdefault(session_id, _SessionState())
+        if state.pending and not state.pending.done():
+            state.pending.cancel()
+        
+        state.pending = asyncio.create_task(
+            self._speculate_after_pause(session_id, state, partial_query, active_tools)
+        )
+    
+    async def reconcile(self, session_id: str, final_query: str, active_tools: List[str] = None):
+        """Cancel speculation that the final query does not need"""
+        state = self.sessions.get(session_id)
+        if not state:
+            return
+        
+        if state.pending and not state.pending.done():
+            state.pending.cancel()
+        
+        planned = await self._plan(final_query, active_tools)
+        self._cancel_stale(state, {item["key"] for item in planned})
+    
+    def end_session(self, session_id: str):
+        """Drop all speculation for a session"""
+        state = self.sessions.pop(session_id, None)
+        if not state:
+            return
+        
+        if state.pending and not state.pending.done():
+            state.pending.cancel()
+        self._cancel_stale(state, set())
+    
+    async def _speculate_after_pause(
+        self,
+        session_id: str,
+        state: _SessionState,
+        partial_query: str,
+        active_tools: List[str]
+    ):
+        await asyncio.sleep(self.debounce)
+        
+        try:
+            planned = await self._plan(partial_query, active_tools)
+        except Exception as e:
+            logger.warning(f"⚠️  Speculation planning failed: {str(e)}")
+            return
+        
+        self._cancel_stale(state, {item["key"] for item in planned})
+        
+        for item in planned:
+            key = item["key"]
+            if key in state.running or self.router.result_cache.contains(key):
+                continue
+            if len(state.running) >= self.max_in_flight or not self._take_budget(state):
+                self.stats["skipped_budget"] += 1
+                break
+            
+            logger.info(f"🔮 Speculating {item['tool']}.{item['action']} for session {session_id}")
+            self.stats["started"] += 1
+            task = asyncio.create_task(
+                self.router.execute_tool(item["tool"], item["action"], item["params"])
+            )
+            state.running[key] = task
+            task.add_done_callback(lambda _t, k=key: state.running.pop(k, None))
+    
+    async def _plan(self, query: str, active_tools: List[str] = None) -> List[Dict[str, Any]]:
+        """Cacheable tool calls the router would make for this query"""
+        routing = await self.router.route_query(query, active_tools)
+        planned = []
+        
+        for match in routing["matched_tools"]:
+            if match["confidence"] < self.min_confidence or not match.get("healthy", True):
+                continue
+            
+            plan = self.router.plan_action(match["tool"], query)
+            if not plan or not self.router.is_cacheable(match["tool"], plan["action"]):
+                continue
+            
+            planned.append({
+                "tool": match["tool"],
+                "action": plan["action"],
+                "params": plan["params"],
+                "key": self.router.result_cache.make_key(match["tool"], plan["action"], plan["params"])
+            })
+        
+        return planned
+    
+    def _take_budget(self, state: _SessionState) -> bool:
+        """Consume one unit of the session's rolling speculation budget"""
+        now = time.monotonic()
+        while state.started_at and now - state.started_at[0] > self.window:
+            state.started_at.popleft()
+        
+        if len(state.started_at) >= self.budget:
+            return False
+        
+        state.started_at.append(now)
+        return True
+    
+    def _cancel_stale(self, state: _SessionState, keep: set):
+        """Cancel running speculation whose result is no longer wanted"""
+        for key, task in list(state.running.items()):
+            if key not in keep and not task.done():
+                task.cancel()
+                self.stats["cancelled"] += 1
@@ -0,0 +1,111 @@
+"""Tool Cache - TTL/LRU cache for results of idempotent tool actions"""
+
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple
+from collections import OrderedDict
+import asyncio
+import json
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ToolResultCache:
+    """Caches successful, non-degraded results and de-duplicates identical in-flight executions"""
+    
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(tool_name: str, action: str, params: Dict[str, Any]) -> str:
+        """Build a stable cache key for a tool call"""
+        return f"{tool_name}:{action}:{json.dumps(params or {}, sort_keys=True, default=str)}"
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached result if present and not expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: Dict[str, Any], ttl: float):
+        """Store a result for ttl seconds, evicting the least recently used entry"""
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    @staticmethod
+    def is_cacheable(result: Any) -> bool:
+        """Only full successes are cached - not failures or degraded fallbacks (mock data carries a `note`)"""
+        return (
+            isinstance(result, dict)
+            and result.get("success", True)
+            and not result.get("degraded")
+            and "note" not in result
+        )
+    
+    def contains(self, key: str) -> bool:
+        """Whether the key is cached or currently being computed"""
+        return key in self._inflight or self.get(key) is not None
+    
+    async def get_or_run(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Dict[str, Any]]],
+        ttl: float
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Return a cached result, join an identical in-flight call, or run factory
+        
+        Returns:
+            Tuple of (result, served_from_cache)
+        """
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached, True
+        
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                result = await asyncio.shield(inflight)
+                self.hits += 1
+                return result, True
+            except asyncio.CancelledError:
+                # The call we joined was cancelled (e.g. abandoned speculation) - run our own
+                if asyncio.current_task().cancelling():
+                    raise
+        
+        self.misses += 1
+        task = asyncio.ensure_future(factory())
+        self._inflight[key] = task
+        try:
+            result = await task
+            if self.is_cacheable(result):
+                self.set(key, result, ttl)
+            return result, False
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
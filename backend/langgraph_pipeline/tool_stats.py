@@ -0,0 +1,103 @@
+"""Tool Stats - Rolling latency and success statistics per MCP tool"""
+
+from typing import Dict, Any, Optional
+from collections import deque
+import threading
+import time
+
+
+class ToolStats:
+    """Decayed averages and a recent-sample window for a single tool"""
+    
+    def __init__(self, decay: float = 0.2, window: int = 200):
+        self.decay = decay
+        self.samples = deque(maxlen=window)
+        self.ewma_latency: Optional[float] = None
+        self.ewma_success: float = 1.0
+        self.count = 0
+        self.failures = 0
+        self.last_updated: Optional[float] = None
+    
+    def record(self, latency: float, success: bool):
+        """Record one execution (latency in seconds)"""
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency += self.decay * (latency - self.ewma_latency)
+        
+        self.ewma_success += self.decay * ((1.0 if success else 0.0) - self.ewma_success)
+        self.samples.append(latency)
+        self.count += 1
+        if not success:
+            self.failures += 1
+        self.last_updated = time.time()
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile over the recent window"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+        return ordered[rank]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable view with latencies in milliseconds"""
+        def ms(value):
+            return round(value * 1000, 2) if value is not None else None
+        
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "success_rate": round(self.ewma_success, 4),
+            "latency_ms": {
+                "ewma": ms(self.ewma_latency),
+                "p50": ms(self.percentile(50)),
+                "p90": ms(self.percentile(90)),
+                "p99": ms(self.percentile(99))
+            },
+            "last_updated": self.last_updated
+        }
+
+
+class ToolStatsTracker:
+    """Thread-safe collection of ToolStats keyed by tool name"""
+    
+    def __init__(self, decay: float = 0.2, window: int = 200, min_samples: int = 5):
+        self.decay = decay
+        self.window = window
+        self.min_samples = min_samples
+        self._stats: Dict[str, ToolStats] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, tool_name: str, latency: float, success: bool):
+        """Record one execution of a tool"""
+        with self._lock:
+            stats = self._stats.get(tool_name)
+            if stats is None:
+                stats = self._stats[tool_name] = ToolStats(self.decay, self.window)
+            stats.record(latency, success)
+    
+    def get(self, tool_name: str) -> Optional[ToolStats]:
+        """Get stats for a tool, if it has been executed"""
+        return self._stats.get(tool_name)
+    
+    def is_healthy(self, tool_name: str, min_success_rate: float) -> bool:
+        """A tool is healthy until enough samples show a low success rate"""
+        stats = self._stats.get(tool_name)
+        if stats is None or stats.count < self.min_samples:
+            return True
+        return stats.ewma_success >= min_success_rate
+    
+    def expected_latency(self, tool_name: str) -> Optional[float]:
+        """Best current latency estimate (seconds), None when unknown"""
+        stats = self._stats.get(tool_name)
+        if stats is None:
+            return None
+        # Blend the decayed mean with the median so one outlier doesn't dominate
+        p50 = stats.percentile(50)
+        return (stats.ewma_latency + p50) / 2 if p50 is not None else stats.ewma_latency
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Stats for all tools"""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._stats.items()}
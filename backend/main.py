@@ -1,14 +1,27 @@
+import time
+_import_start = time.perf_counter()
+
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 from typing import Dict
 from config import settings
-from routes import chat_routes, mcp_routes, memory_routes, websocket_routes
-from services.db_service import DatabaseService
+from routes import chat_routes, mcp_routes, memory_routes, websocket_routes, metrics_routes, debug_routes
+from services.storage import open_store
+from services.mongo_client import mongo_client
+from services.health_prober import HealthProber
+from services.process_pool import ProcessToolPool
+from services.retention import RetentionSweeper
+from utils.bulkhead import shutdown_bulkheads
+from utils.loop_monitor import loop_monitor, LoopActivityMiddleware
+from utils.startup_profiler import startup_profiler
 from utils.tool_registry import ToolRegistry
 from langgraph_pipeline.graph_builder import GraphBuilder
 
+startup_profiler.record("imports", _import_start)
+
 # Configure logging with colors
 import sys
 from datetime import datetime
@@ -49,11 +62,14 @@ logger = logging.getLogger(__name__)
 db_service = None
 tool_registry = None
 graph_builder = None
+health_prober = None
+process_pool = None
+retention_sweeper = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
-    global db_service, tool_registry, graph_builder
+    global db_service, tool_registry, graph_builder, health_prober, process_pool, retention_sweeper
     
     # Startup banner
     print("\n" + "="*80)
@@ -61,27 +77,82 @@ async def lifespan(app: FastAPI):
     print("="*80)
     logger.info("Initializing system components...")
     
+    # Watch for code that blocks the event loop from the very start
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    
     try:
-        # Initialize database
-        db_service = DatabaseService()
-        await db_service.connect()
-        logger.info("✅ Database connected successfully")
-        
-        # Initialize tool registry
+        # Connect storage and warm up tools concurrently - startup is bounded
+        # by the slowest of the two rather than their sum
         tool_registry = ToolRegistry()
-        await tool_registry.register_all_tools()
+        with startup_profiler.phase("database_and_tools"):
+            db_service, _ = await asyncio.gather(
+                startup_profiler.measure("database", open_store()),
+                startup_profiler.measure("tool_registry", tool_registry.register_all_tools())
+            )
+        if db_service.is_connected():
+            logger.info(f"✅ Storage connected ({db_service.backend})")
+        
+        # Keep the hot collections bounded: archive, then delete, expired history
+        retention_sweeper = RetentionSweeper(
+            db_service,
+            settings.RETENTION_DAYS,
+            archive_dir=settings.RETENTION_ARCHIVE_DIR or None,
+            interval=settings.RETENTION_SWEEP_INTERVAL_S,
+            batch_size=settings.RETENTION_BATCH_SIZE
+        )
+        if settings.RETENTION_ENABLED:
+            retention_sweeper.start()
+        
         active_tools = tool_registry.get_active_tools()
         logger.info(f"✅ Registered {len(active_tools)} MCP tools")
         
+        # Push tool catalog changes to WebSocket clients instead of having them poll
+        tool_registry.add_catalog_listener(websocket_routes.notify_catalog_changed)
+        
         # Log all registered tools
         print("\n📦 REGISTERED MCP TOOLS:")
         for tool_name in active_tools:
-            print(f"   • {tool_name}")
+            state = tool_registry.get_tool_state(tool_name)
+            print(f"   • {tool_name}" + (f" ({state})" if state == "warming" else ""))
         
         # Initialize LangGraph
-        graph_builder = GraphBuilder(tool_registry)
+        with startup_profiler.phase("langgraph"):
+            graph_builder = GraphBuilder(tool_registry)
         logger.info("✅ LangGraph pipeline initialized")
         
+        # Returning sessions get their conversation back from storage on first use
+        graph_builder.llm_agent.store = db_service
+        
+        # Probe loaded tools in the background; the router avoids tools that look dead
+        health_prober = HealthProber(tool_registry, tool_stats=graph_builder.router.tool_stats)
+        graph_builder.router.health_prober = health_prober
+        if settings.HEALTH_PROBE_ENABLED:
+            health_prober.start()
+        
+        # Warm worker processes for cpu-class tools (pandas, eval/exec)
+        if settings.CPU_POOL_ENABLED:
+            cpu_tools = [
+                (entry["module"], entry["class"])
+                for entry in tool_registry.manifest.values()
+                if entry.get("execution_class") == "cpu"
+            ]
+            process_pool = ProcessToolPool(
+                cpu_tools,
+                max_workers=settings.CPU_POOL_WORKERS,
+                max_tasks_per_child=settings.CPU_POOL_MAX_TASKS_PER_CHILD,
+                max_rss_growth_mb=settings.CPU_POOL_MAX_RSS_GROWTH_MB,
+                timeout=settings.CPU_POOL_TIMEOUT_S
+            )
+            await startup_profiler.measure("process_pool", process_pool.start())
+            graph_builder.router.process_pool = process_pool
+        
+        startup_profiler.finish()
+        startup_report = startup_profiler.report()
+        logger.info(f"⏱️  Startup took {startup_report['total_ms']:.0f} ms, RSS {startup_report['rss_mb']:.0f} MB")
+        if settings.STARTUP_PROFILE_PATH:
+            startup_profiler.write_report(settings.STARTUP_PROFILE_PATH)
+        
         # Server info
         print("\n" + "="*80)
         print(f"🌐 SERVER RUNNING")
@@ -104,7 +175,15 @@ async def lifespan(app: FastAPI):
     # Shutdown
     print("\n" + "="*80)
     logger.info("🛑 Shutting down AI-MCP Orchestrator...")
+    await health_prober.stop()
+    if process_pool:
+        await process_pool.shutdown()
+    await tool_registry.shutdown()
+    await retention_sweeper.stop()
+    shutdown_bulkheads()
+    await loop_monitor.stop()
     await db_service.disconnect()
+    mongo_client.close()
     logger.info("✅ Cleanup complete")
     print("="*80 + "\n")
 
@@ -125,11 +204,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Label each request with its route so event-loop stalls can be attributed
+app.add_middleware(LoopActivityMiddleware, monitor=loop_monitor)
+
 # Include routers
 app.include_router(chat_routes.router, prefix="/api/chat", tags=["Chat"])
 app.include_router(mcp_routes.router, prefix="/api/mcp", tags=["MCP Tools"])
 app.include_router(memory_routes.router, prefix="/api/memory", tags=["Memory"])
 app.include_router(websocket_routes.router, prefix="/api/ws", tags=["WebSocket"])
+app.include_router(metrics_routes.router, prefix="/api/metrics", tags=["Metrics"])
+app.include_router(debug_routes.router, prefix="/api/debug", tags=["Debug"])
 
 @app.get("/")
 async def root():
@@ -145,6 +229,7 @@ async def health_check():
     return {
         "status": "healthy",
         "database": "connected" if db_service and db_service.is_connected() else "disconnected",
+        "storage": db_service.backend if db_service else None,
         "tools_registered": len(tool_registry.get_active_tools()) if tool_registry else 0
     }
 
@@ -1,39 +1,45 @@
-"""MCP Tools Package - 17+ integrated tools for AI orchestration"""
-
-from .web_search_mcp import WebSearchTool
-from .file_manager_mcp import FileManagerTool
-from .db_mcp import DatabaseTool
-from .email_mcp import EmailTool
-from .drive_mcp import DriveTool
-from .automation_mcp import AutomationTool
-from .memory_mcp import MemoryTool
-from .analytics_mcp import AnalyticsTool
-from .knowledgebase_mcp import KnowledgebaseTool
-from .api_integration_mcp import APIIntegrationTool
-from .climate_mcp import ClimateTool
-from .wikipedia_mcp import WikipediaTool
-from .python_code_mcp import PythonCodeTool
-from .screen_monitor_mcp import ScreenMonitorTool
-from .system_monitor_mcp import SystemMonitorTool
-from .calculator_mcp import CalculatorTool
-from .translator_mcp import TranslatorTool
-
-__all__ = [
-    "WebSearchTool",
-    "FileManagerTool",
-    "DatabaseTool",
-    "EmailTool",
-    "DriveTool",
-    "AutomationTool",
-    "MemoryTool",
-    "AnalyticsTool",
-    "KnowledgebaseTool",
-    "APIIntegrationTool",
-    "ClimateTool",
-    "WikipediaTool",
-    "PythonCodeTool",
-    "ScreenMonitorTool",
-    "SystemMonitorTool",
-    "CalculatorTool",
-    "TranslatorTool",
-]
+"""MCP Tools Package - 17+ integrated tools for AI orchestration
+
+Tool modules pull in heavy optional dependencies (pandas, duckduckgo_search,
+aiofiles, ...), so classes are imported lazily on first attribute access.
+The registry works from the static manifest.json and only imports a tool
+module when that tool is first used.
+"""
+
+import importlib
+
+# Class name -> module (relative to this package)
+TOOL_MODULES = {
+    "WebSearchTool": ".web_search_mcp",
+    "FileManagerTool": ".file_manager_mcp",
+    "DatabaseTool": ".db_mcp",
+    "EmailTool": ".email_mcp",
+    "DriveTool": ".drive_mcp",
+    "AutomationTool": ".automation_mcp",
+    "MemoryTool": ".memory_mcp",
+    "AnalyticsTool": ".analytics_mcp",
+    "KnowledgebaseTool": ".knowledgebase_mcp",
+    "APIIntegrationTool": ".api_integration_mcp",
+    "ClimateTool": ".climate_mcp",
+    "WikipediaTool": ".wikipedia_mcp",
+    "PythonCodeTool": ".python_code_mcp",
+    "ScreenMonitorTool": ".screen_monitor_mcp",
+    "SystemMonitorTool": ".system_monitor_mcp",
+    "CalculatorTool": ".calculator_mcp",
+    "TranslatorTool": ".translator_mcp",
+}
+
+__all__ = list(TOOL_MODULES)
+
+
+def __getattr__(name):
+    """Import a tool class on first access (PEP 562)"""
+    if name in TOOL_MODULES:
+        tool_class = getattr(importlib.import_module(TOOL_MODULES[name], __name__), name)
+        globals()[name] = tool_class
+        return tool_class
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
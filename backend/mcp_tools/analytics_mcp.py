@@ -16,6 +16,9 @@ class AnalyticsTool:
         self.description = "Analyze data and generate insights"
         self.enabled = True
         
+        # Heavy synchronous work - run in the process pool
+        self.execution_class = "cpu"
+        
     async def execute(self, action: str, **kwargs) -> Dict[str, Any]:
         """
         Execute analytics operation
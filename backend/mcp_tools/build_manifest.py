@@ -0,0 +1,53 @@
+"""Build the static tool manifest used for lazy loading
+
+The registry serves tool metadata (name, description, schema, ...) from
+manifest.json without importing tool modules. Regenerate it after adding a
+tool or changing a tool's schema (run from the backend directory):
+
+    python -m mcp_tools.build_manifest
+"""
+
+from typing import Dict, Any, List
+from pathlib import Path
+import importlib
+import json
+import sys
+
+from mcp_tools import TOOL_MODULES
+
+MANIFEST_PATH = Path(__file__).resolve().parent / "manifest.json"
+
+
+def build_manifest() -> List[Dict[str, Any]]:
+    """Instantiate every tool once and collect its static metadata"""
+    entries = []
+    
+    for class_name, module_name in TOOL_MODULES.items():
+        module = importlib.import_module(module_name, "mcp_tools")
+        tool = getattr(module, class_name)()
+        
+        entries.append({
+            "name": tool.name,
+            "module": module.__name__,
+            "class": class_name,
+            "description": tool.description,
+            "enabled": True,
+            "has_initialize": hasattr(tool, "initialize"),
+            "has_health_check": hasattr(tool, "health_check"),
+            "execution_class": getattr(tool, "execution_class", "io-async"),
+            "cacheable_actions": getattr(tool, "cacheable_actions", {}),
+            "schema": tool.get_schema() if hasattr(tool, "get_schema") else None
+        })
+    
+    return entries
+
+
+def main() -> int:
+    entries = build_manifest()
+    MANIFEST_PATH.write_text(json.dumps(entries, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"✅ Wrote {len(entries)} tools to {MANIFEST_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
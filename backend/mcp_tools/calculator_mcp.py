@@ -14,6 +14,9 @@ class CalculatorTool:
         self.description = "Perform mathematical calculations and conversions"
         self.enabled = True
         
+        # Heavy synchronous work - run in the process pool
+        self.execution_class = "cpu"
+        
     async def execute(self, action: str, **kwargs) -> Dict[str, Any]:
         """
         Execute calculator operation
@@ -14,6 +14,9 @@ class ClimateTool:
         self.description = "Get weather forecasts and climate information for any location"
         self.enabled = True
         
+        # Idempotent actions the router may cache (action -> TTL seconds)
+        self.cacheable_actions = {"weather": 600, "forecast": 1800, "climate": 86400}
+        
     async def execute(self, action: str, **kwargs) -> Dict[str, Any]:
         """
         Execute climate operation
@@ -125,6 +128,15 @@ class ClimateTool:
             "note": "General climate information"
         }
     
+    async def health_check(self) -> Dict[str, Any]:
+        """Cheap probe - degraded when only mock data is available"""
+        result = await self._get_weather("London")
+        return {
+            "success": result.get("success", False),
+            "degraded": "note" in result,
+            "error": result.get("note") or result.get("error")
+        }
+    
     def get_schema(self) -> Dict[str, Any]:
         """Return tool schema for LangChain"""
         return {
@@ -2,13 +2,14 @@
 
 from typing import Dict, Any, List
 from config import settings
+from services.mongo_client import MongoClientProvider, mongo_client
 import logging
 
 logger = logging.getLogger(__name__)
 
 # Try to import motor, but make it optional
 try:
-    from motor.motor_asyncio import AsyncIOMotorClient
+    import motor  # noqa: F401 - the shared client in services.mongo_client needs it
     MOTOR_AVAILABLE = True
 except ImportError:
     MOTOR_AVAILABLE = False
@@ -17,21 +18,22 @@ except ImportError:
 class DatabaseTool:
     """MCP tool for database operations"""
     
-    def __init__(self):
+    def __init__(self, client_provider: MongoClientProvider = None):
         self.name = "database"
         self.description = "Query and manage MongoDB database (requires motor package)"
         self.enabled = MOTOR_AVAILABLE
+        self.client_provider = client_provider or mongo_client
         self.client = None
         self.db = None
         
     async def initialize(self):
-        """Initialize database connection"""
+        """Initialize database connection (shares the server's client and pool)"""
         if not MOTOR_AVAILABLE:
             logger.warning("⚠️  Motor not available - Database tool disabled")
             return
             
         try:
-            self.client = AsyncIOMotorClient(settings.MONGODB_URL, serverSelectionTimeoutMS=3000)
+            self.client = self.client_provider.get_client()
             self.db = self.client[settings.DATABASE_NAME]
             await self.client.admin.command('ping')
             logger.info("✅ Database tool initialized")
@@ -140,6 +142,14 @@ class DatabaseTool:
             "count": count
         }
     
+    async def health_check(self) -> Dict[str, Any]:
+        """Cheap probe - ping the server"""
+        if not self.client:
+            return {"success": False, "error": "Database not connected"}
+        
+        await self.client.admin.command('ping')
+        return {"success": True}
+    
     def get_schema(self) -> Dict[str, Any]:
         """Return tool schema for LangChain"""
         return {
@@ -5,6 +5,7 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Dict, Any
 from config import settings
+from utils.bulkhead import get_bulkhead
 import logging
 
 logger = logging.getLogger(__name__)
@@ -68,10 +69,8 @@ class EmailTool:
             else:
                 msg.attach(MIMEText(body, 'plain'))
             
-            with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-                server.starttls()
-                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-                server.send_message(msg)
+            # smtplib blocks for the whole SMTP conversation
+            await get_bulkhead(self.name).run(self._send_sync, msg)
             
             logger.info(f"📧 Email sent to {to}")
             
@@ -85,6 +84,13 @@ class EmailTool:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    def _send_sync(self, msg):
+        """Synchronous SMTP send helper"""
+        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.MCP_TIMEOUT) as server:
+            server.starttls()
+            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+            server.send_message(msg)
+    
     async def _create_draft(self, to: str, subject: str, body: str) -> Dict[str, Any]:
         """Create email draft (stored locally)"""
         draft = {
@@ -15,6 +15,9 @@ class PythonCodeTool:
         self.description = "Execute Python code and return results (safe sandbox)"
         self.enabled = True
         
+        # Heavy synchronous work - run in the process pool
+        self.execution_class = "cpu"
+        
     async def execute(self, action: str, **kwargs) -> Dict[str, Any]:
         """
         Execute Python code operation
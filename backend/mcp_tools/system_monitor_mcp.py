@@ -13,6 +13,9 @@ class SystemMonitorTool:
         self.description = "Monitor CPU, memory, disk, network, and system performance"
         self.enabled = True
         
+        # Blocking psutil sampling - run on a worker thread
+        self.execution_class = "io-blocking"
+        
     async def execute(self, action: str, **kwargs) -> Dict[str, Any]:
         """
         Execute system monitor operation
@@ -1,6 +1,7 @@
 """Translator MCP Tool - Translate text between languages"""
 
 from typing import Dict, Any
+from utils.bulkhead import get_bulkhead
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,6 +14,9 @@ class TranslatorTool:
         self.description = "Translate text between different languages"
         self.enabled = True
         
+        # Idempotent actions the router may cache (action -> TTL seconds)
+        self.cacheable_actions = {"translate": 86400, "detect": 86400, "languages": 86400}
+        
         # Common language codes
         self.languages = {
             "en": "English",
@@ -68,7 +72,7 @@ class TranslatorTool:
             from googletrans import Translator
             
             translator = Translator()
-            result = translator.translate(text, src=from_lang, dest=to_lang)
+            result = await get_bulkhead(self.name).run(translator.translate, text, src=from_lang, dest=to_lang)
             
             return {
                 "success": True,
@@ -103,7 +107,7 @@ class TranslatorTool:
             from googletrans import Translator
             
             translator = Translator()
-            detection = translator.detect(text)
+            detection = await get_bulkhead(self.name).run(translator.detect, text)
             
             return {
                 "success": True,
@@ -136,6 +140,15 @@ class TranslatorTool:
             "count": len(self.languages)
         }
     
+    async def health_check(self) -> Dict[str, Any]:
+        """Cheap probe - degraded when googletrans is not installed"""
+        result = await self._detect_language("hello")
+        return {
+            "success": result.get("success", False),
+            "degraded": "note" in result,
+            "error": result.get("note") or result.get("error")
+        }
+    
     def get_schema(self) -> Dict[str, Any]:
         """Return tool schema for LangChain"""
         return {
@@ -1,8 +1,8 @@
 """Web Search MCP Tool - Search the web using DuckDuckGo"""
 
-import asyncio
 from typing import Dict, Any, List
 from duckduckgo_search import DDGS
+from utils.bulkhead import get_bulkhead
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,10 +29,8 @@ class WebSearchTool:
         try:
             logger.info(f"🔍 Web Search: {query}")
             
-            # Run search in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            results = await loop.run_in_executor(
-                None,
+            # Run search in this tool's own bounded thread pool to avoid blocking
+            results = await get_bulkhead(self.name).run(
                 self._search_sync,
                 query,
                 max_results
@@ -65,6 +63,11 @@ class WebSearchTool:
                 })
             return results
     
+    async def health_check(self) -> Dict[str, Any]:
+        """Cheap probe - a one-result search"""
+        results = await get_bulkhead(self.name).run(self._search_sync, "python", 1)
+        return {"success": bool(results)}
+    
     def get_schema(self) -> Dict[str, Any]:
         """Return tool schema for LangChain"""
         return {
@@ -1,6 +1,7 @@
 """Wikipedia MCP Tool - Search and retrieve Wikipedia articles"""
 
 from typing import Dict, Any, List
+from utils.bulkhead import get_bulkhead
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,6 +14,9 @@ class WikipediaTool:
         self.description = "Search Wikipedia and retrieve article summaries"
         self.enabled = True
         
+        # Idempotent actions the router may cache (action -> TTL seconds)
+        self.cacheable_actions = {"search": 3600, "summary": 3600, "content": 3600}
+        
     async def execute(self, action: str, **kwargs) -> Dict[str, Any]:
         """
         Execute Wikipedia operation
@@ -43,7 +47,7 @@ class WikipediaTool:
         try:
             import wikipedia
             
-            results = wikipedia.search(query, results=limit)
+            results = await get_bulkhead(self.name).run(wikipedia.search, query, results=limit)
             
             return {
                 "success": True,
@@ -60,17 +64,7 @@ class WikipediaTool:
         try:
             import wikipedia
             
-            summary = wikipedia.summary(title, sentences=3)
-            page = wikipedia.page(title)
-            
-            return {
-                "success": True,
-                "action": "summary",
-                "title": title,
-                "summary": summary,
-                "url": page.url,
-                "categories": page.categories[:5] if hasattr(page, 'categories') else []
-            }
+            return await get_bulkhead(self.name).run(self._fetch_summary, title)
         except wikipedia.exceptions.DisambiguationError as e:
             return {
                 "success": False,
@@ -90,20 +84,50 @@ class WikipediaTool:
         try:
             import wikipedia
             
-            page = wikipedia.page(title)
-            
-            return {
-                "success": True,
-                "action": "content",
-                "title": page.title,
-                "content": page.content[:2000],  # First 2000 chars
-                "url": page.url,
-                "images": page.images[:3] if hasattr(page, 'images') else [],
-                "references": page.references[:5] if hasattr(page, 'references') else []
-            }
+            return await get_bulkhead(self.name).run(self._fetch_content, title)
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    # Page properties (content, categories, images, references) are lazy and each
+    # one is another blocking HTTP request, so the whole result is built off the loop
+    
+    @staticmethod
+    def _fetch_summary(title: str) -> Dict[str, Any]:
+        import wikipedia
+        
+        summary = wikipedia.summary(title, sentences=3)
+        page = wikipedia.page(title)
+        return {
+            "success": True,
+            "action": "summary",
+            "title": title,
+            "summary": summary,
+            "url": page.url,
+            "categories": page.categories[:5]
+        }
+    
+    @staticmethod
+    def _fetch_content(title: str) -> Dict[str, Any]:
+        import wikipedia
+        
+        page = wikipedia.page(title)
+        return {
+            "success": True,
+            "action": "content",
+            "title": page.title,
+            "content": page.content[:2000],  # First 2000 chars
+            "url": page.url,
+            "images": page.images[:3],
+            "references": page.references[:5]
+        }
+    
+    async def health_check(self) -> Dict[str, Any]:
+        """Cheap probe - a one-result search"""
+        import wikipedia
+        
+        results = await get_bulkhead(self.name).run(wikipedia.search, "Python", results=1)
+        return {"success": bool(results)}
+    
     def get_schema(self) -> Dict[str, Any]:
         """Return tool schema for LangChain"""
         return {
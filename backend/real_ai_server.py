@@ -6,10 +6,14 @@ import uvicorn
 import google.generativeai as genai
 from config import settings
 import asyncio
+from collections import OrderedDict, deque
 from datetime import datetime
 import json
 import httpx
-import re
+import math
+from utils.param_extractor import ParamExtractor
+from utils.loop_monitor import loop_monitor, LoopActivityMiddleware
+from services.storage import open_store
 
 app = FastAPI(title="AI-MCP Server with Real Tools")
 
@@ -26,9 +30,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Session storage (in-memory for now)
-SESSIONS = {}
-CHAT_LOGS = []
+# Attribute event-loop stalls (e.g. synchronous Gemini calls) to the route that caused them
+app.add_middleware(LoopActivityMiddleware, monitor=loop_monitor)
+
+@app.on_event("startup")
+async def start_loop_monitor():
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+
+@app.on_event("shutdown")
+async def stop_loop_monitor():
+    await loop_monitor.stop()
+
+@app.on_event("startup")
+async def open_history_store():
+    global STORE
+    STORE = await open_store("sqlite")
+
+@app.on_event("shutdown")
+async def close_history_store():
+    if STORE:
+        await STORE.disconnect()
+
+# Rule-based parameter extraction (locations, expressions, ...)
+PARAM_EXTRACTOR = ParamExtractor()
+CALC_NAMESPACE = {
+    "abs": abs, "round": round, "min": min, "max": max, "sum": sum, "pow": pow,
+    "sqrt": math.sqrt, "sin": math.sin, "cos": math.cos, "tan": math.tan,
+    "log": math.log, "log10": math.log10, "exp": math.exp, "pi": math.pi, "e": math.e
+}
+
+# Recent sessions and logs stay in memory (bounded, least recently used sessions
+# evicted first); the full history is persisted to the embedded SQLite store
+SESSIONS = OrderedDict()
+CHAT_LOGS = deque(maxlen=settings.MEMORY_MAX_LOGS)
+STORE = None
 
 # MCP Tools
 MOCK_TOOLS = [
@@ -98,11 +134,8 @@ async def execute_mcp_tool(tool_name: str, query: str, params: dict = None):
             location = params.get("location", "London")
             if location == "auto-detect":
                 # Extract location from query
-                location_match = re.search(r'in\s+([A-Za-z\s]+)', query, re.IGNORECASE)
-                if location_match:
-                    location = location_match.group(1).strip()
-                else:
-                    location = "London"
+                extracted = PARAM_EXTRACTOR.extract_location(query)
+                location = extracted[0] if extracted else "London"
             
             async with httpx.AsyncClient() as client:
                 url = f"https://wttr.in/{location}?format=j1"
@@ -178,13 +211,8 @@ async def execute_mcp_tool(tool_name: str, query: str, params: dict = None):
         
         elif tool_name == "calculator":
             # Real calculator
-            expression = params.get("expression", query)
-            math_match = re.search(r'[\d\s\+\-\*/\(\)\.]+', expression)
-            if math_match:
-                expression = math_match.group(0).strip()
-            
-            allowed_chars = set('0123456789+-*/()., ')
-            if not all(c in allowed_chars for c in expression):
+            extracted = PARAM_EXTRACTOR.extract_expression(params.get("expression", query))
+            if not extracted:
                 return {
                     "success": False,
                     "tool": "calculator",
@@ -192,7 +220,9 @@ async def execute_mcp_tool(tool_name: str, query: str, params: dict = None):
                     "data": {}
                 }
             
-            result = eval(expression)
+            # The extractor only accepts arithmetic, math functions and constants
+            expression = extracted[0]
+            result = eval(expression, {"__builtins__": {}, **CALC_NAMESPACE})
             
             return {
                 "success": True,
@@ -268,7 +298,7 @@ async def execute_mcp_tool(tool_name: str, query: str, params: dict = None):
             "data": {}
         }
 
-def save_to_log(session_id: str, role: str, content: str, tools_used: list = None):
+async def save_to_log(session_id: str, role: str, content: str, tools_used: list = None):
     """Save chat interaction to log"""
     log_entry = {
         "session_id": session_id,
@@ -283,9 +313,15 @@ def save_to_log(session_id: str, role: str, content: str, tools_used: list = Non
     if session_id not in SESSIONS:
         SESSIONS[session_id] = {
             "created_at": datetime.now().isoformat(),
-            "messages": []
+            "messages": deque(maxlen=settings.MEMORY_MAX_SESSION_MESSAGES)
         }
+        while len(SESSIONS) > settings.MEMORY_MAX_SESSIONS:
+            SESSIONS.popitem(last=False)
+    SESSIONS.move_to_end(session_id)
     SESSIONS[session_id]["messages"].append(log_entry)
+    
+    if STORE and STORE.is_connected():
+        await STORE.save_chat_message(session_id, role, content, {"tools_used": tools_used or []})
 
 @app.get("/")
 async def root():
@@ -306,6 +342,14 @@ async def health():
         "sessions": len(SESSIONS)
     }
 
+@app.get("/api/debug/loop-lag")
+async def get_loop_lag(limit: int = 20):
+    return {
+        "success": True,
+        "loop_lag": loop_monitor.snapshot(),
+        "reports": loop_monitor.recent_reports(limit)
+    }
+
 @app.get("/api/mcp/tools")
 async def list_tools():
     return {
@@ -327,8 +371,11 @@ async def toggle_tool(request: dict):
     return {"success": False, "error": "Tool not found"}
 
 @app.get("/api/sessions")
-async def get_sessions():
-    """Get all chat sessions"""
+async def get_sessions(limit: int = 100):
+    """Get recent chat sessions"""
+    if STORE and STORE.is_connected():
+        return {"success": True, "sessions": await STORE.get_sessions(limit)}
+    
     return {
         "success": True,
         "sessions": [
@@ -345,7 +392,14 @@ async def get_sessions():
 async def get_session(session_id: str):
     """Get specific session history"""
     if session_id not in SESSIONS:
-        raise HTTPException(status_code=404, detail="Session not found")
+        # Evicted from memory (or from a previous run) - read it back from the store
+        history = await STORE.get_chat_history(session_id, limit=settings.MEMORY_MAX_SESSION_MESSAGES) if STORE else []
+        if not history:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return {
+            "success": True,
+            "session": {"created_at": history[0]["timestamp"], "messages": history}
+        }
     
     return {
         "success": True,
@@ -368,7 +422,7 @@ async def send_message(request: dict):
     session_id = request.get("session_id", "default")
     
     # Save user message to log
-    save_to_log(session_id, "user", query)
+    await save_to_log(session_id, "user", query)
     
     try:
         # Detect which tools to use
@@ -495,7 +549,7 @@ Now provide your beautifully formatted response based on the tool results above:
         tools_used = [t["name"] for t in tools_to_execute]
         
         # Save AI response to log
-        save_to_log(session_id, "assistant", ai_response, tools_used)
+        await save_to_log(session_id, "assistant", ai_response, tools_used)
         
         return {
             "success": True,
@@ -505,10 +559,10 @@ Now provide your beautifully formatted response based on the tool results above:
             "session_id": session_id,
             "model": "gemini-2.0-flash-exp"
         }
-        
+    
     except Exception as e:
         error_msg = f"I apologize, but I encountered an error: {str(e)}\n\nPlease try again."
-        save_to_log(session_id, "assistant", error_msg, [])
+        await save_to_log(session_id, "assistant", error_msg, [])
         
         return {
             "success": False,
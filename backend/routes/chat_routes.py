@@ -1,8 +1,10 @@
 """Chat Routes - Handle chat interactions"""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
+from utils.pagination import parse_fields, page_cursors, ndjson_stream, decode_cursor
 import uuid
 
 router = APIRouter()
@@ -38,18 +40,12 @@ async def send_message(request: ChatRequest):
             active_tools=active_tools
         )
         
-        # Save to database
+        # Save the turn (one sequence reservation; the inserts are batched behind the response)
         if db_service and db_service.is_connected():
-            await db_service.save_chat_message(
-                session_id=session_id,
-                role="user",
-                content=request.query
-            )
-            await db_service.save_chat_message(
-                session_id=session_id,
-                role="assistant",
-                content=result.get("response", "")
-            )
+            await db_service.save_chat_messages(session_id, [
+                {"role": "user", "content": request.query},
+                {"role": "assistant", "content": result.get("response", "")}
+            ])
         
         return ChatResponse(
             success=result.get("success", False),
@@ -63,20 +59,58 @@ async def send_message(request: ChatRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/history/{session_id}")
-async def get_chat_history(session_id: str, limit: int = 50):
-    """Get chat history for a session"""
+async def get_chat_history(
+    session_id: str,
+    limit: int = Query(50, ge=1, le=500),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    exclude: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$")
+):
+    """
+    Get chat history for a session
+    
+    Pages are bounded by `limit`; pass the returned `cursors.before` to page back
+    through older messages or `cursors.after` for newer ones. `fields` / `exclude`
+    are comma-separated projections (e.g. fields=role,content). `format=ndjson`
+    streams the whole session as newline-delimited JSON for export.
+    """
     from main import db_service, graph_builder
     
     try:
         # Try database first
         if db_service and db_service.is_connected():
-            history = await db_service.get_chat_history(session_id, limit)
-            return {"success": True, "history": history, "session_id": session_id}
+            if format == "ndjson":
+                # Validate now - once the stream starts the 200 has already been sent
+                if after:
+                    decode_cursor(after)
+                messages = db_service.iter_chat_history(
+                    session_id, after=after, fields=parse_fields(fields), exclude=parse_fields(exclude)
+                )
+                return StreamingResponse(ndjson_stream(messages), media_type="application/x-ndjson")
+            
+            history = await db_service.get_chat_history(
+                session_id,
+                limit,
+                before=before,
+                after=after,
+                fields=parse_fields(fields),
+                exclude=parse_fields(exclude)
+            )
+            return {
+                "success": True,
+                "history": history,
+                "session_id": session_id,
+                "cursors": page_cursors(history, "seq")
+            }
         
         # Fall back to in-memory
         history = graph_builder.llm_agent.get_session_history(session_id)
         return {"success": True, "history": history, "session_id": session_id}
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -0,0 +1,21 @@
+"""Debug Routes - Runtime diagnostics"""
+
+from fastapi import APIRouter
+from utils.loop_monitor import loop_monitor
+from utils.startup_profiler import startup_profiler
+
+router = APIRouter()
+
+@router.get("/loop-lag")
+async def get_loop_lag(limit: int = 20):
+    """Get event-loop lag statistics and recent blocking reports with stacks"""
+    return {
+        "success": True,
+        "loop_lag": loop_monitor.snapshot(),
+        "reports": loop_monitor.recent_reports(limit)
+    }
+
+@router.get("/startup")
+async def get_startup_profile():
+    """Get time and RSS of each startup phase"""
+    return {"success": True, "startup": startup_profiler.report()}
@@ -1,6 +1,6 @@
 """MCP Routes - Manage MCP tools"""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 
@@ -16,25 +16,31 @@ class ToolExecuteRequest(BaseModel):
     params: Optional[Dict[str, Any]] = {}
 
 @router.get("/tools")
-async def list_tools():
-    """List all available MCP tools"""
+async def list_tools(request: Request):
+    """List all available MCP tools (supports If-None-Match)"""
     from main import tool_registry
     
     try:
-        tools_info = tool_registry.get_all_tools_info()
-        return {
-            "success": True,
-            "tools": tools_info,
-            "count": len(tools_info)
+        catalog = tool_registry.get_catalog()
+        headers = {
+            "ETag": catalog["etag"],
+            "Cache-Control": "no-cache",
+            "X-Catalog-Version": str(catalog["version"])
         }
         
+        if_none_match = request.headers.get("if-none-match", "")
+        if catalog["etag"] in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+        
+        return Response(content=catalog["body"], media_type="application/json", headers=headers)
+        
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/tools/{tool_name}")
 async def get_tool_info(tool_name: str):
-    """Get information about a specific tool"""
-    from main import tool_registry
+    """Get information about a specific tool, including its readiness"""
+    from main import tool_registry, health_prober
     
     try:
         tool_info = tool_registry.get_tool_info(tool_name)
@@ -42,6 +48,9 @@ async def get_tool_info(tool_name: str):
         if not tool_info:
             raise HTTPException(status_code=404, detail=f"Tool '{tool_name}' not found")
         
+        if health_prober:
+            tool_info["readiness"] = health_prober.get_readiness(tool_name)
+        
         return {"success": True, "tool": tool_info}
         
     except HTTPException:
@@ -1,7 +1,9 @@
 """Memory Routes - Manage conversation memory"""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional
+from utils.pagination import parse_fields, page_cursors, ndjson_stream
 
 router = APIRouter()
 
@@ -9,21 +11,61 @@ router = APIRouter()
 async def get_tool_logs(
     session_id: Optional[str] = None,
     tool_name: Optional[str] = None,
-    limit: int = 50
+    limit: int = Query(50, ge=1, le=500),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    exclude: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$")
 ):
-    """Get tool execution logs"""
+    """
+    Get tool execution logs, newest first
+    
+    Page with `cursors.before` (older) / `cursors.after` (newer), trim documents
+    with `fields` / `exclude` (e.g. exclude=result) and export everything with
+    `format=ndjson`.
+    """
     from main import db_service
     
     try:
         if db_service and db_service.is_connected():
-            logs = await db_service.get_tool_logs(session_id, tool_name, limit)
-            return {"success": True, "logs": logs, "count": len(logs)}
+            if format == "ndjson":
+                logs = db_service.iter_tool_logs(
+                    session_id, tool_name, fields=parse_fields(fields), exclude=parse_fields(exclude)
+                )
+                return StreamingResponse(ndjson_stream(logs), media_type="application/x-ndjson")
+            
+            logs = await db_service.get_tool_logs(
+                session_id,
+                tool_name,
+                limit,
+                before=before,
+                after=after,
+                fields=parse_fields(fields),
+                exclude=parse_fields(exclude)
+            )
+            return {"success": True, "logs": logs, "count": len(logs), "cursors": page_cursors(logs, "_id")}
         
         return {"success": True, "logs": [], "message": "Database not connected"}
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/logs/{log_id}")
+async def get_tool_log(log_id: str):
+    """Get one tool log with its full result (large results are loaded only here)"""
+    from main import db_service
+    
+    if not (db_service and db_service.is_connected()):
+        raise HTTPException(status_code=503, detail="Database not connected")
+    
+    log = await db_service.get_tool_log(log_id)
+    if not log:
+        raise HTTPException(status_code=404, detail="Log not found")
+    return {"success": True, "log": log}
+
 @router.get("/stats")
 async def get_memory_stats():
     """Get memory and usage statistics"""
@@ -32,7 +74,7 @@ async def get_memory_stats():
     try:
         stats = {
             "database_connected": db_service.is_connected() if db_service else False,
-            "total_tools": len(tool_registry.get_all_tools()) if tool_registry else 0,
+            "total_tools": len(tool_registry.get_tool_names()) if tool_registry else 0,
             "active_tools": len(tool_registry.get_active_tools()) if tool_registry else 0
         }
         
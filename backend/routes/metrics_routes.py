@@ -0,0 +1,52 @@
+"""Metrics Routes - Runtime metrics for tools and execution pools"""
+
+from fastapi import APIRouter, HTTPException
+from utils.bulkhead import bulkhead_snapshot
+from utils.loop_monitor import loop_monitor
+from services.mongo_client import mongo_client
+from routes import websocket_routes
+
+router = APIRouter()
+
+@router.get("")
+async def get_metrics():
+    """Get execution metrics for tools, bulkheads, caches and pools"""
+    from main import graph_builder, process_pool, db_service, retention_sweeper
+    
+    try:
+        metrics = {
+            "bulkheads": bulkhead_snapshot(),
+            "loop_lag": loop_monitor.snapshot(),
+            "websockets": websocket_routes.connection_stats()
+        }
+        
+        if graph_builder:
+            metrics["tools"] = graph_builder.router.tool_stats.snapshot()
+            metrics["result_cache"] = graph_builder.router.result_cache.stats()
+            metrics["speculation"] = graph_builder.speculator.stats
+            metrics["session_memory"] = {
+                "sessions": len(graph_builder.llm_agent.sessions),
+                **graph_builder.llm_agent.rehydration_stats
+            }
+        
+        if process_pool:
+            metrics["process_pool"] = process_pool.snapshot()
+        
+        if db_service:
+            metrics["write_buffers"] = db_service.write_buffer_stats()
+            if db_service.history_cache is not None:
+                metrics["history_cache"] = db_service.history_cache.stats()
+            metrics["mongo_pool"] = mongo_client.snapshot()
+        
+        if retention_sweeper:
+            metrics["retention"] = retention_sweeper.stats()
+        
+        return {"success": True, "metrics": metrics}
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/bulkheads")
+async def get_bulkhead_metrics():
+    """Get queue depth and saturation of each tool's thread pool"""
+    return {"success": True, "bulkheads": bulkhead_snapshot()}
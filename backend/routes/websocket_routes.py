@@ -1,68 +1,324 @@
 """WebSocket Routes - Real-time communication"""
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import Dict, Set
+from typing import Dict, Set, Optional, Any
+from collections import deque
+from config import settings
+from utils.loop_monitor import loop_monitor
+from utils.pagination import json_default
+import asyncio
 import json
 import logging
+import uuid
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Long-running message types get a worker task each; everything else is
+# answered inline by the reader so it stays responsive while turns run
+WORKER_MESSAGE_TYPES = ("chat", "multi_tool")
+
+SLOW_CONSUMER_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+# Totals across connections that have already closed
+_totals = {"dropped": 0, "coalesced": 0, "slow_disconnects": 0, "pruned": 0}
+
+def encode_message(message: Dict) -> str:
+    """Serialize an outgoing message (tool results may hold datetimes, ObjectIds, ...)"""
+    return json.dumps(message, default=json_default)
+
+class ClientConnection:
+    """
+    One WebSocket client: a bounded outbox drained by a writer task, and the
+    in-flight tasks handling its messages
+    
+    Replies to the client's own requests wait for room in the outbox, so
+    only that client's workers slow down. Broadcasts never wait: when the
+    outbox is full, `policy` decides - drop the oldest queued broadcast,
+    coalesce (replace a queued broadcast with the same coalesce key, else
+    drop the oldest) or disconnect the client. Replies are never dropped.
+    Messages are serialized when queued, so encoding errors reach the
+    sender; a send that fails or takes longer than `send_timeout` means the
+    client is gone, and it is pruned.
+    """
+    
+    def __init__(
+        self,
+        websocket: WebSocket,
+        session_id: str,
+        max_in_flight: int,
+        max_queue: int = 100,
+        policy: str = "drop_oldest",
+        send_timeout: float = 10.0
+    ):
+        self.websocket = websocket
+        self.session_id = session_id
+        self.max_in_flight = max(1, max_in_flight)
+        self.in_flight: Dict[str, asyncio.Task] = {}
+        
+        self.max_queue = max(1, max_queue)
+        self.policy = policy if policy in SLOW_CONSUMER_POLICIES else "drop_oldest"
+        self.send_timeout = send_timeout
+        self.closed = False
+        self._closing: Optional[asyncio.Task] = None
+        self._outbox: deque = deque()  # (is_broadcast, coalesce_key, encoded message)
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._writer = asyncio.create_task(self._write())
+        
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.peak_depth = 0
+    
+    async def send(self, message: Dict):
+        """Queue a reply, waiting while the outbox is full"""
+        data = encode_message(message)
+        while len(self._outbox) >= self.max_queue and not self.closed:
+            self._space.clear()
+            await self._space.wait()
+        if not self.closed:
+            self._push(False, None, data)
+    
+    def enqueue(self, message: Dict, coalesce_key: Optional[str] = None) -> bool:
+        """Queue a broadcast without waiting; False if it was not queued"""
+        if self.closed:
+            return False
+        data = encode_message(message)
+        
+        if coalesce_key is not None and self.policy == "coalesce":
+            for index, (is_broadcast, key, _) in enumerate(self._outbox):
+                if is_broadcast and key == coalesce_key:
+                    self._outbox[index] = (True, key, data)
+                    self.coalesced += 1
+                    return True
+        
+        if len(self._outbox) >= self.max_queue:
+            if self.policy == "disconnect":
+                _totals["slow_disconnects"] += 1
+                logger.warning(f"⚠️  Disconnecting slow WebSocket client ({self.session_id})")
+                self.abort(code=1013)
+                return False
+            # Make room by evicting a broadcast; replies must reach the client
+            oldest = next((i for i, entry in enumerate(self._outbox) if entry[0]), None)
+            self.dropped += 1
+            if oldest is None:
+                return False
+            del self._outbox[oldest]
+        
+        self._push(True, coalesce_key, data)
+        return True
+    
+    def _push(self, is_broadcast: bool, coalesce_key: Optional[str], data: str):
+        self._outbox.append((is_broadcast, coalesce_key, data))
+        self.peak_depth = max(self.peak_depth, len(self._outbox))
+        self._ready.set()
+    
+    async def _write(self):
+        """Writer task - the only code that sends on the socket"""
+        try:
+            # The closed check backs up cancellation, which wait_for can swallow
+            while not self.closed:
+                if not self._outbox:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                _, _, data = self._outbox.popleft()
+                self._space.set()
+                await asyncio.wait_for(self.websocket.send_text(data), self.send_timeout)
+                self.sent += 1
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            # Failed or timed-out send: the client is gone or not reading
+            logger.info(f"🔌 Pruning dead WebSocket ({self.session_id}): {type(e).__name__}")
+            _totals["pruned"] += 1
+            self.abort()
+    
+    def abort(self, code: int = 1011):
+        """Forget the connection and close its socket; the reader then winds down"""
+        if self.closed:
+            return
+        self.closed = True
+        self._ready.set()
+        self._space.set()
+        _discard(self)
+        self._closing = asyncio.create_task(self._close_socket(code))
+    
+    async def _close_socket(self, code: int):
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
+    
+    @property
+    def depth(self) -> int:
+        return len(self._outbox)
+    
+    def start(self, request_id: str, handler, message: Dict) -> bool:
+        """Run a handler in its own task; False when the in-flight limit is reached"""
+        if len(self.in_flight) >= self.max_in_flight or request_id in self.in_flight:
+            return False
+        task = asyncio.create_task(self._run(request_id, handler, message))
+        self.in_flight[request_id] = task
+        return True
+    
+    async def _run(self, request_id: str, handler, message: Dict):
+        try:
+            with loop_monitor.activity(f"ws:{message.get('type')}"):
+                await handler(self, message)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.warning(f"⚠️  WebSocket request {request_id} failed: {str(e)}")
+        finally:
+            self.in_flight.pop(request_id, None)
+    
+    def cancel(self, request_id: str) -> bool:
+        task = self.in_flight.get(request_id)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+    
+    async def close(self):
+        """Cancel whatever is still running for this client and stop its writer"""
+        self.closed = True
+        self._ready.set()
+        self._space.set()
+        tasks = [*self.in_flight.values(), self._writer]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        _totals["dropped"] += self.dropped
+        _totals["coalesced"] += self.coalesced
+        self.dropped = self.coalesced = 0
+
 # Active WebSocket connections
-active_connections: Dict[str, Set[WebSocket]] = {}
+active_connections: Dict[str, Set[ClientConnection]] = {}
+
+def _discard(connection: ClientConnection):
+    """Remove a connection; the session's speculation ends with its last one"""
+    connections = active_connections.get(connection.session_id)
+    if connections is None or connection not in connections:
+        return
+    connections.discard(connection)
+    if not connections:
+        del active_connections[connection.session_id]
+        
+        from main import graph_builder
+        if graph_builder:
+            graph_builder.speculator.end_session(connection.session_id)
+
+# Pending catalog_version broadcast (bursts of registry changes coalesce into one)
+_catalog_broadcast: Optional[asyncio.Task] = None
 
 @router.websocket("/chat/{session_id}")
 async def websocket_chat(websocket: WebSocket, session_id: str):
-    """WebSocket endpoint for real-time chat"""
+    """
+    WebSocket endpoint for real-time chat
+    
+    This coroutine is the connection's reader. `chat` and `multi_tool`
+    messages are handed to worker tasks (at most WS_MAX_IN_FLIGHT at once),
+    so pings, toggles and further queries are handled while turns run.
+    Every reply carries the `request_id` of the message it answers - the
+    client's own, or one assigned here - since replies can arrive out of order.
+    """
     await websocket.accept()
+    connection = ClientConnection(
+        websocket,
+        session_id,
+        settings.WS_MAX_IN_FLIGHT,
+        max_queue=settings.WS_SEND_QUEUE_MAX,
+        policy=settings.WS_SLOW_CONSUMER_POLICY,
+        send_timeout=settings.WS_SEND_TIMEOUT_S
+    )
     
     # Add to active connections
     if session_id not in active_connections:
         active_connections[session_id] = set()
-    active_connections[session_id].add(websocket)
+    active_connections[session_id].add(connection)
     
     logger.info(f"🔌 WebSocket connected: {session_id}")
     
     try:
+        # Tell the client which tool catalog is current so it only refetches on change
+        await connection.send(catalog_version_message())
+        
         while True:
             # Receive message
             data = await websocket.receive_text()
-            message = json.loads(data)
+            try:
+                message = json.loads(data)
+            except json.JSONDecodeError:
+                await connection.send({"type": "error", "error": "Invalid JSON"})
+                continue
+            
+            message_type = message.get("type")
+            request_id = str(message.get("request_id") or uuid.uuid4().hex)
+            message["request_id"] = request_id
             
-            # Process based on message type
-            if message.get("type") == "chat":
-                await handle_chat_message(websocket, session_id, message)
-            elif message.get("type") == "tool_toggle":
-                await handle_tool_toggle(websocket, message)
-            elif message.get("type") == "ping":
-                await websocket.send_json({"type": "pong"})
+            if message_type in WORKER_MESSAGE_TYPES:
+                handler = handle_chat_message if message_type == "chat" else handle_multi_tool_message
+                if not connection.start(request_id, handler, message):
+                    await connection.send({
+                        "type": "error",
+                        "request_id": request_id,
+                        "error": f"Too many requests in flight (limit {connection.max_in_flight})"
+                    })
+                continue
             
+            # Control messages - answered inline
+            with loop_monitor.activity(f"ws:{message_type}"):
+                if message_type == "typing":
+                    await handle_typing_message(session_id, message)
+                elif message_type == "tool_toggle":
+                    await handle_tool_toggle(connection, message)
+                elif message_type == "cancel":
+                    await connection.send({
+                        "type": "cancelled",
+                        "request_id": request_id,
+                        "success": connection.cancel(request_id)
+                    })
+                elif message_type == "ping":
+                    await connection.send({"type": "pong", "request_id": request_id})
+    
     except WebSocketDisconnect:
-        # Remove from active connections
-        active_connections[session_id].discard(websocket)
-        if not active_connections[session_id]:
-            del active_connections[session_id]
-        
         logger.info(f"🔌 WebSocket disconnected: {session_id}")
     
     except Exception as e:
-        logger.error(f"❌ WebSocket error: {str(e)}")
-        await websocket.close()
+        if not connection.closed:
+            logger.error(f"❌ WebSocket error: {str(e)}")
+            connection.abort()
+    
+    finally:
+        await connection.close()
+        
+        # Remove from active connections
+        _discard(connection)
 
-async def handle_chat_message(websocket: WebSocket, session_id: str, message: Dict):
+async def handle_chat_message(connection: ClientConnection, message: Dict):
     """Handle chat message via WebSocket"""
     from main import graph_builder
     
+    session_id = connection.session_id
+    request_id = message["request_id"]
+    
     try:
         query = message.get("query", "")
         active_tools = message.get("active_tools", [])
         
         # Send acknowledgment
-        await websocket.send_json({
+        await connection.send({
             "type": "processing",
+            "request_id": request_id,
             "message": "Processing your request..."
         })
         
+        # Keep speculative prefetches the final query needs, cancel the rest
+        await graph_builder.speculator.reconcile(session_id, query, active_tools)
+        
         # Run through pipeline
         result = await graph_builder.run(
             query=query,
@@ -71,18 +327,82 @@ async def handle_chat_message(websocket: WebSocket, session_id: str, message: Di
         )
         
         # Send response
-        await websocket.send_json({
+        await connection.send({
             "type": "response",
+            "request_id": request_id,
             "data": result
         })
+    
+    except Exception as e:
+        await connection.send({
+            "type": "error",
+            "request_id": request_id,
+            "error": str(e)
+        })
+
+async def handle_typing_message(session_id: str, message: Dict):
+    """Handle a partial query by speculatively warming cacheable tools"""
+    from main import graph_builder
+    
+    try:
+        await graph_builder.speculator.on_typing(
+            session_id,
+            message.get("query", ""),
+            message.get("active_tools", [])
+        )
+    except Exception as e:
+        # Speculation is best-effort and never reported to the client
+        logger.warning(f"⚠️  Speculation error: {str(e)}")
+
+async def handle_multi_tool_message(connection: ClientConnection, message: Dict):
+    """Handle multi-tool execution via WebSocket, streaming results as they complete"""
+    from main import graph_builder
+    
+    request_id = message["request_id"]
+    
+    try:
+        tool_actions = message.get("tool_actions", [])
+        results = [None] * len(tool_actions)
         
+        # Clients may ask for less parallelism than the server allows, never more
+        max_concurrency = message.get("max_concurrency")
+        if max_concurrency is not None:
+            if isinstance(max_concurrency, bool) or not isinstance(max_concurrency, int):
+                raise ValueError("max_concurrency must be an integer")
+            max_concurrency = max(1, min(max_concurrency, settings.MAX_CONCURRENT_TOOLS))
+        
+        async for item in graph_builder.router.iter_multi_tool(
+            tool_actions,
+            max_concurrency=max_concurrency
+        ):
+            results[item["index"]] = item["result"]
+            
+            # Forward each partial result as soon as it is ready
+            await connection.send({
+                "type": "tool_result",
+                "request_id": request_id,
+                "index": item["index"],
+                "data": item["result"]
+            })
+        
+        await connection.send({
+            "type": "multi_tool_complete",
+            "request_id": request_id,
+            "data": {
+                "success": all(r.get("success", False) for r in results),
+                "results": results,
+                "count": len(results)
+            }
+        })
+    
     except Exception as e:
-        await websocket.send_json({
+        await connection.send({
             "type": "error",
+            "request_id": request_id,
             "error": str(e)
         })
 
-async def handle_tool_toggle(websocket: WebSocket, message: Dict):
+async def handle_tool_toggle(connection: ClientConnection, message: Dict):
     """Handle tool toggle via WebSocket"""
     from main import tool_registry
     
@@ -95,24 +415,86 @@ async def handle_tool_toggle(websocket: WebSocket, message: Dict):
         else:
             success = tool_registry.disable_tool(tool_name)
         
-        await websocket.send_json({
+        await connection.send({
             "type": "tool_status",
+            "request_id": message["request_id"],
             "tool_name": tool_name,
             "enabled": enabled,
             "success": success
         })
-        
+    
     except Exception as e:
-        await websocket.send_json({
+        await connection.send({
             "type": "error",
+            "request_id": message["request_id"],
             "error": str(e)
         })
 
-async def broadcast_to_session(session_id: str, message: Dict):
-    """Broadcast message to all connections in a session"""
-    if session_id in active_connections:
-        for connection in active_connections[session_id]:
-            try:
-                await connection.send_json(message)
-            except:
-                pass
+async def broadcast_to_session(session_id: str, message: Dict, coalesce_key: Optional[str] = None) -> int:
+    """Queue a message for every connection of a session without waiting on any; returns how many took it"""
+    connections = active_connections.get(session_id, ())
+    return sum(connection.enqueue(message, coalesce_key) for connection in list(connections))
+
+async def broadcast_to_all(message: Dict, coalesce_key: Optional[str] = None) -> int:
+    """Queue a message for every open connection without waiting on any"""
+    return sum(
+        connection.enqueue(message, coalesce_key)
+        for connections in list(active_connections.values())
+        for connection in list(connections)
+    )
+
+def connection_stats() -> Dict[str, Any]:
+    """Outbound queue depth and slow-consumer counters across connections"""
+    connections = [c for group in list(active_connections.values()) for c in group]
+    depths = [c.depth for c in connections]
+    return {
+        "sessions": len(active_connections),
+        "connections": len(connections),
+        "in_flight": sum(len(c.in_flight) for c in connections),
+        "queued": sum(depths),
+        "max_depth": max(depths, default=0),
+        "peak_depth": max((c.peak_depth for c in connections), default=0),
+        "queue_max": settings.WS_SEND_QUEUE_MAX,
+        "policy": settings.WS_SLOW_CONSUMER_POLICY,
+        "dropped": _totals["dropped"] + sum(c.dropped for c in connections),
+        "coalesced": _totals["coalesced"] + sum(c.coalesced for c in connections),
+        "slow_disconnects": _totals["slow_disconnects"],
+        "pruned": _totals["pruned"]
+    }
+
+def catalog_version_message() -> Dict:
+    """Build the catalog_version message for the registry's current catalog"""
+    from main import tool_registry
+    
+    catalog = tool_registry.get_catalog()
+    return {
+        "type": "catalog_version",
+        "version": catalog["version"],
+        "etag": catalog["etag"]
+    }
+
+def notify_catalog_changed(version: int):
+    """Tool registry listener - push the new catalog version to all clients"""
+    global _catalog_broadcast
+    
+    if not active_connections or (_catalog_broadcast and not _catalog_broadcast.done()):
+        return
+    
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    
+    async def send_latest():
+        sent_version = None
+        while True:
+            # Yield first so changes made in the same step land in a single message
+            await asyncio.sleep(0)
+            message = catalog_version_message()
+            if message["version"] == sent_version:
+                return
+            # Only the newest catalog version matters to a client that is behind
+            await broadcast_to_all(message, coalesce_key="catalog_version")
+            sent_version = message["version"]
+    
+    _catalog_broadcast = loop.create_task(send_latest())
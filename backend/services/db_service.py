@@ -1,25 +1,34 @@
 """Database Service - MongoDB connection and operations"""
 
 from config import settings
+from services.mongo_client import MongoClientProvider, mongo_client
+from services.storage import ChatStore, SESSION_PREVIEW_CHARS
+from services.write_buffer import WriteBehindBuffer
+from utils.pagination import decode_cursor, keyset_filter, build_projection
+from utils.payloads import expand_payload
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, AsyncIterator
 
 logger = logging.getLogger(__name__)
 
-class DatabaseService:
+class DatabaseService(ChatStore):
     """MongoDB database service (optional)"""
     
-    def __init__(self):
+    backend = "mongo"
+    
+    def __init__(self, client_provider: MongoClientProvider = None):
+        self.client_provider = client_provider or mongo_client
         self.client = None
         self.db = None
         self._connected = False
+        self._buffers: Dict[str, WriteBehindBuffer] = {}
     
     async def connect(self):
         """Connect to MongoDB (optional - will work without it)"""
         try:
-            from motor.motor_asyncio import AsyncIOMotorClient
-            
-            self.client = AsyncIOMotorClient(settings.MONGODB_URL, serverSelectionTimeoutMS=3000)
+            self.client = self.client_provider.get_client()
             self.db = self.client[settings.DATABASE_NAME]
             
             # Test connection
@@ -27,6 +36,21 @@ class DatabaseService:
             self._connected = True
             logger.info("✅ MongoDB connected successfully")
             
+            await self.ensure_indexes()
+            await self.backfill_sessions()
+            
+            if settings.DB_WRITE_BEHIND_ENABLED:
+                for name in ("chat_messages", "tool_logs"):
+                    buffer = WriteBehindBuffer(
+                        self.db[name],
+                        name,
+                        batch_size=settings.DB_WRITE_BATCH_SIZE,
+                        flush_interval=settings.DB_WRITE_FLUSH_MS / 1000,
+                        max_queue=settings.DB_WRITE_QUEUE_MAX
+                    )
+                    buffer.start()
+                    self._buffers[name] = buffer
+        
         except ImportError:
             logger.warning("⚠️  MongoDB driver not installed - running without database")
             self._connected = False
@@ -35,15 +59,114 @@ class DatabaseService:
             self._connected = False
     
     async def disconnect(self):
-        """Disconnect from MongoDB"""
+        """Drain buffered writes and release the shared client"""
+        for buffer in self._buffers.values():
+            await buffer.close()
+        if self._buffers:
+            logger.info(f"✅ Flushed write buffers: {self.write_buffer_stats()}")
+        self._buffers = {}
+        
         if self.client:
-            self.client.close()
+            self.client_provider.close()
+            self.client = None
             logger.info("✅ MongoDB disconnected")
     
+    async def ensure_indexes(self):
+        """Create the indexes history, log and session queries rely on (idempotent)"""
+        try:
+            await self.db.chat_messages.create_index(
+                [("session_id", 1), ("timestamp", -1), ("seq", -1)], name="session_timestamp"
+            )
+            await self.db.chat_messages.create_index([("timestamp", 1)], name="timestamp")  # retention sweeps
+            await self.db.sessions.create_index([("last_message", -1)], name="last_message")
+            await self.db.tool_logs.create_index([("session_id", 1), ("timestamp", -1)], name="session_timestamp")
+            await self.db.tool_logs.create_index([("timestamp", 1)], name="timestamp")  # retention sweeps
+            await self.db.tool_logs.create_index([("payload.hash", 1)], name="payload_hash", sparse=True)
+            await self.db.tool_logs.create_index([("tool_name", 1), ("timestamp", -1)], name="tool_timestamp")
+            await self.db.tool_logs.create_index(
+                [("session_id", 1), ("tool_name", 1), ("timestamp", -1)], name="session_tool_timestamp"
+            )
+        except Exception as e:
+            logger.warning(f"⚠️  Could not create indexes: {str(e)}")
+    
+    async def backfill_sessions(self):
+        """Build the sessions collection from existing messages (once, on first run after upgrade)"""
+        try:
+            if await self.db.sessions.estimated_document_count() > 0:
+                return
+            if await self.db.chat_messages.estimated_document_count() == 0:
+                return
+            
+            logger.info("🔄 Building sessions collection from existing chat messages...")
+            pipeline = [
+                {"$sort": {"session_id": 1, "timestamp": 1, "seq": 1}},
+                {
+                    "$group": {
+                        "_id": "$session_id",
+                        "message_count": {"$sum": 1},
+                        "created_at": {"$min": "$timestamp"},
+                        "last_message": {"$max": "$timestamp"},
+                        "preview": {"$first": {"$cond": [{"$eq": ["$role", "user"]}, "$content", ""]}}
+                    }
+                },
+                {"$set": {"preview": {"$substrCP": ["$preview", 0, SESSION_PREVIEW_CHARS]}}},
+                {"$merge": {"into": "sessions", "whenMatched": "keepExisting"}}
+            ]
+            async for _ in self.db.chat_messages.aggregate(pipeline, allowDiskUse=True):
+                pass
+        except Exception as e:
+            logger.warning(f"⚠️  Could not backfill sessions: {str(e)}")
+    
+    async def _record_turn(self, session_id: str, messages: List[Dict[str, Any]], now: datetime) -> int:
+        """
+        Update the session summary for new messages and reserve their sequence numbers
+        
+        One atomic upsert bumps message_count (which doubles as the per-session
+        sequence), advances last_message and sets the preview from the first
+        user message. Returns the first reserved seq.
+        """
+        from pymongo import ReturnDocument
+        
+        count = len(messages)
+        on_insert: Dict[str, Any] = {"created_at": now}
+        first_user = next((msg for msg in messages if msg["role"] == "user"), None)
+        if first_user:
+            on_insert["preview"] = first_user["content"][:SESSION_PREVIEW_CHARS]
+        
+        session = await self.db.sessions.find_one_and_update(
+            {"_id": session_id},
+            {
+                "$inc": {"message_count": count},
+                "$max": {"last_message": now},
+                "$setOnInsert": on_insert
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return session["message_count"] - count + 1
+    
     def is_connected(self) -> bool:
         """Check if database is connected"""
         return self._connected
     
+    async def _insert(self, collection_name: str, document: Dict[str, Any]):
+        """Queue an insert for batching, or write it directly when write-behind is off"""
+        buffer = self._buffers.get(collection_name)
+        if buffer:
+            await buffer.put(document)
+        else:
+            await self.db[collection_name].insert_one(document)
+    
+    async def flush(self, collection_name: Optional[str] = None):
+        """Wait for buffered writes (of one collection or all) to reach the database"""
+        for name, buffer in self._buffers.items():
+            if collection_name is None or name == collection_name:
+                await buffer.flush()
+    
+    def write_buffer_stats(self) -> Dict[str, Any]:
+        """Queue depth and batching stats of each write buffer"""
+        return {name: buffer.snapshot() for name, buffer in self._buffers.items()}
+    
     def get_collection(self, collection_name: str):
         """Get a collection"""
         if not self.db:
@@ -51,58 +174,133 @@ class DatabaseService:
             return None
         return self.db[collection_name]
     
-    async def save_chat_message(
-        self,
-        session_id: str,
-        role: str,
-        content: str,
-        metadata: Dict[str, Any] = None
-    ) -> bool:
-        """Save chat message to database"""
-        if not self._connected:
+    async def save_chat_messages(self, session_id: str, messages: List[Dict[str, Any]]) -> bool:
+        """Save several messages of a session (e.g. a user/assistant turn) in order"""
+        if not self._connected or not messages:
             return False
         
         try:
-            message = {
-                "session_id": session_id,
-                "role": role,
-                "content": content,
-                "metadata": metadata or {},
-                "timestamp": "2025-10-26T20:57:35+05:30"
-            }
+            from bson import ObjectId
             
-            await self.db.chat_messages.insert_one(message)
-            return True
+            now = datetime.now(timezone.utc)
+            seq = await self._record_turn(session_id, messages, now)
+            
+            # Ids are assigned here rather than by the driver so cached copies carry them
+            documents = [
+                {
+                    "_id": ObjectId(),
+                    "session_id": session_id,
+                    "role": msg["role"],
+                    "content": msg["content"],
+                    "metadata": msg.get("metadata") or {},
+                    "timestamp": now,
+                    "seq": seq + offset
+                }
+                for offset, msg in enumerate(messages)
+            ]
+            for document in documents:
+                await self._insert("chat_messages", document)
             
+            # Reads return naive UTC datetimes; keep cached messages comparable with them
+            self._remember(session_id, [{**doc, "timestamp": now.replace(tzinfo=None)} for doc in documents])
+            return True
+        
         except Exception as e:
             logger.error(f"❌ Error saving message: {str(e)}")
             return False
     
-    async def get_chat_history(
+    @staticmethod
+    def _keyset_query(
+        query: Dict[str, Any],
+        before: Optional[str],
+        after: Optional[str],
+        tiebreak_field: str
+    ) -> Dict[str, Any]:
+        """Add before/after cursor bounds to a query (raises ValueError for bad cursors)"""
+        bounds = []
+        for direction, cursor in (("before", before), ("after", after)):
+            if cursor:
+                timestamp, tiebreak = decode_cursor(cursor)
+                if tiebreak_field == "_id":
+                    from bson import ObjectId
+                    tiebreak = ObjectId(tiebreak)
+                bounds.append(keyset_filter((timestamp, tiebreak), tiebreak_field, direction))
+        return {"$and": [query, *bounds]} if bounds else query
+    
+    async def latest_seq(self, session_id: str) -> Optional[int]:
+        """Seq of a session's newest message - a point read of its summary"""
+        if not self._connected:
+            return None
+        try:
+            session = await self.db.sessions.find_one({"_id": session_id}, {"message_count": 1})
+            return session["message_count"] if session else None
+        except Exception as e:
+            logger.warning(f"⚠️  Could not read session summary: {str(e)}")
+            return None
+    
+    async def _query_chat_history(
         self,
         session_id: str,
-        limit: int = 50
+        limit: int = 50,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
-        """Get chat history for session"""
+        """
+        Get a page of chat history for session, oldest first
+        
+        Without cursors this is the latest `limit` messages. `before` pages
+        back through older messages and `after` fetches newer ones; both are
+        index range scans on (session_id, timestamp, seq).
+        """
         if not self._connected:
             return []
         
+        query = self._keyset_query({"session_id": session_id}, before, after, "seq")
+        # Walk forward from an `after` cursor, otherwise backward from the newest match
+        direction = 1 if after and not before else -1
+        
         try:
+            await self.flush("chat_messages")
             cursor = self.db.chat_messages.find(
-                {"session_id": session_id}
-            ).sort("timestamp", -1).limit(limit)
+                query,
+                build_projection(fields, exclude, ["_id", "timestamp", "seq"])
+            ).sort([("timestamp", direction), ("seq", direction)]).limit(limit)
             
             messages = []
             async for msg in cursor:
                 msg['_id'] = str(msg['_id'])
                 messages.append(msg)
             
-            return list(reversed(messages))
-            
+            return messages if direction == 1 else list(reversed(messages))
+        
         except Exception as e:
             logger.error(f"❌ Error retrieving history: {str(e)}")
             return []
     
+    async def iter_chat_history(
+        self,
+        session_id: str,
+        after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a session's full history oldest first without holding it in memory"""
+        if not self._connected:
+            return
+        
+        query = self._keyset_query({"session_id": session_id}, None, after, "seq")
+        await self.flush("chat_messages")
+        cursor = self.db.chat_messages.find(
+            query,
+            build_projection(fields, exclude, ["_id", "timestamp", "seq"])
+        ).sort([("timestamp", 1), ("seq", 1)]).batch_size(500)
+        
+        async for msg in cursor:
+            msg['_id'] = str(msg['_id'])
+            yield msg
+    
     async def save_tool_log(
         self,
         session_id: str,
@@ -115,79 +313,200 @@ class DatabaseService:
             return False
         
         try:
+            now = datetime.now(timezone.utc)
+            fields, payload = await self._compact_result(result)
+            if payload:
+                # Content-addressed: an identical result is stored once
+                await self.db.tool_payloads.update_one(
+                    {"_id": payload["hash"]},
+                    {"$setOnInsert": {
+                        "codec": payload["codec"],
+                        "size": payload["size"],
+                        "data": payload["data"],
+                        "created_at": now
+                    }},
+                    upsert=True
+                )
+            
             log = {
                 "session_id": session_id,
                 "tool_name": tool_name,
                 "action": action,
-                "result": result,
-                "timestamp": "2025-10-26T20:57:35+05:30"
+                **fields,
+                "timestamp": now
             }
             
-            await self.db.tool_logs.insert_one(log)
+            await self._insert("tool_logs", log)
             return True
-            
+        
         except Exception as e:
             logger.error(f"❌ Error saving tool log: {str(e)}")
             return False
     
+    async def get_tool_log(self, log_id: str) -> Optional[Dict[str, Any]]:
+        """One tool log with its full result (large payloads are only loaded here)"""
+        if not self._connected:
+            return None
+        
+        from bson import ObjectId
+        from bson.errors import InvalidId
+        
+        try:
+            object_id = ObjectId(log_id)
+        except (InvalidId, TypeError):
+            return None
+        
+        try:
+            await self.flush("tool_logs")
+            log = await self.db.tool_logs.find_one({"_id": object_id})
+            if not log:
+                return None
+            log['_id'] = str(log['_id'])
+            
+            reference = log.get("payload")
+            if reference and not reference.get("dropped"):
+                stored = await self.db.tool_payloads.find_one({"_id": reference["hash"]})
+                if stored:
+                    log["result"] = await asyncio.to_thread(expand_payload, bytes(stored["data"]), stored["codec"])
+            return log
+        
+        except Exception as e:
+            logger.error(f"❌ Error retrieving log: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _log_query(session_id: Optional[str], tool_name: Optional[str]) -> Dict[str, Any]:
+        query = {}
+        if session_id:
+            query["session_id"] = session_id
+        if tool_name:
+            query["tool_name"] = tool_name
+        return query
+    
     async def get_tool_logs(
         self,
         session_id: str = None,
         tool_name: str = None,
-        limit: int = 50
+        limit: int = 50,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
-        """Get tool execution logs"""
+        """Get a page of tool execution logs, newest first (`before`/`after` cursors page older/newer)"""
         if not self._connected:
             return []
         
+        query = self._keyset_query(self._log_query(session_id, tool_name), before, after, "_id")
+        direction = 1 if after and not before else -1
+        
         try:
-            query = {}
-            if session_id:
-                query["session_id"] = session_id
-            if tool_name:
-                query["tool_name"] = tool_name
-            
-            cursor = self.db.tool_logs.find(query).sort("timestamp", -1).limit(limit)
+            await self.flush("tool_logs")
+            cursor = self.db.tool_logs.find(
+                query,
+                build_projection(fields, exclude, ["_id", "timestamp"])
+            ).sort([("timestamp", direction), ("_id", direction)]).limit(limit)
             
             logs = []
             async for log in cursor:
                 log['_id'] = str(log['_id'])
                 logs.append(log)
             
-            return logs
-            
+            return logs if direction == -1 else list(reversed(logs))
+        
         except Exception as e:
             logger.error(f"❌ Error retrieving logs: {str(e)}")
             return []
     
+    async def iter_tool_logs(
+        self,
+        session_id: Optional[str] = None,
+        tool_name: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream matching tool logs oldest first without holding them in memory"""
+        if not self._connected:
+            return
+        
+        await self.flush("tool_logs")
+        cursor = self.db.tool_logs.find(
+            self._log_query(session_id, tool_name),
+            build_projection(fields, exclude, ["_id", "timestamp"])
+        ).sort([("timestamp", 1), ("_id", 1)]).batch_size(500)
+        
+        async for log in cursor:
+            log['_id'] = str(log['_id'])
+            yield log
+    
     async def get_sessions(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Get recent chat sessions"""
         if not self._connected:
             return []
         
         try:
-            pipeline = [
-                {
-                    "$group": {
-                        "_id": "$session_id",
-                        "last_message": {"$last": "$timestamp"},
-                        "message_count": {"$sum": 1}
-                    }
-                },
-                {"$sort": {"last_message": -1}},
-                {"$limit": limit}
-            ]
+            cursor = self.db.sessions.find(
+                {},
+                {"created_at": 1, "last_message": 1, "message_count": 1, "preview": 1}
+            ).sort("last_message", -1).limit(limit)
             
             sessions = []
-            async for session in self.db.chat_messages.aggregate(pipeline):
+            async for session in cursor:
                 sessions.append({
                     "session_id": session["_id"],
-                    "last_message": session["last_message"],
-                    "message_count": session["message_count"]
+                    "created_at": session.get("created_at"),
+                    "last_message": session.get("last_message"),
+                    "message_count": session.get("message_count", 0),
+                    "preview": session.get("preview", "")
                 })
             
             return sessions
-            
+        
         except Exception as e:
             logger.error(f"❌ Error retrieving sessions: {str(e)}")
             return []
+    
+    async def expired_batch(self, collection: str, cutoff: datetime, limit: int) -> List[Dict[str, Any]]:
+        """Oldest documents of a collection written before `cutoff` (tool logs with full results)"""
+        cursor = self.db[collection].find(
+            {"timestamp": {"$lt": cutoff}}
+        ).sort([("timestamp", 1), ("_id", 1)]).limit(limit)
+        
+        docs = []
+        async for doc in cursor:
+            doc['_id'] = str(doc['_id'])
+            docs.append(doc)
+        
+        hashes = list({doc["payload"]["hash"] for doc in docs if doc.get("payload") and not doc["payload"].get("dropped")})
+        if hashes:
+            payloads = {}
+            async for stored in self.db.tool_payloads.find({"_id": {"$in": hashes}}):
+                payloads[stored["_id"]] = await asyncio.to_thread(expand_payload, bytes(stored["data"]), stored["codec"])
+            for doc in docs:
+                if doc.get("payload") and doc["payload"]["hash"] in payloads:
+                    doc["result"] = payloads[doc["payload"]["hash"]]
+        return docs
+    
+    async def delete_by_ids(self, collection: str, ids: List[str]) -> int:
+        from bson import ObjectId
+        
+        result = await self.db[collection].delete_many({"_id": {"$in": [ObjectId(i) for i in ids]}})
+        return result.deleted_count
+    
+    async def prune_payloads(self, hashes: List[str]) -> int:
+        """Delete stored payloads that no remaining tool log references"""
+        # A queued log may reference one of these payloads - make it visible first
+        await self.flush("tool_logs")
+        orphaned = [
+            digest for digest in hashes
+            if not await self.db.tool_logs.find_one({"payload.hash": digest}, {"_id": 1})
+        ]
+        if not orphaned:
+            return 0
+        result = await self.db.tool_payloads.delete_many({"_id": {"$in": orphaned}})
+        return result.deleted_count
+    
+    async def expire_sessions(self, cutoff: datetime) -> int:
+        """Delete session summaries whose last message is older than `cutoff`"""
+        result = await self.db.sessions.delete_many({"last_message": {"$lt": cutoff}})
+        return result.deleted_count
@@ -0,0 +1,158 @@
+"""Health Prober - Periodically run cheap health checks against loaded tools"""
+
+from typing import Dict, Any, Optional
+from config import settings
+import asyncio
+import random
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class _ProbeState:
+    """Probe history for one tool"""
+    
+    def __init__(self):
+        self.score = 1.0  # decayed probe outcome: 1 ok, 0.5 degraded, 0 failed
+        self.consecutive_failures = 0
+        self.probes = 0
+        self.last_latency: Optional[float] = None
+        self.last_checked: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.degraded = False
+
+class HealthProber:
+    """
+    Background health probing feeding a per-tool readiness score
+    
+    Tools opt in by defining an async health_check() returning
+    {"success": bool, "degraded": bool, ...}. Only tools that are already
+    loaded are probed, so probing never defeats lazy loading. Each round
+    spreads probes over a jittered delay and runs at most `concurrency` at once.
+    """
+    
+    def __init__(self, tool_registry, tool_stats=None, decay: float = 0.5):
+        self.tool_registry = tool_registry
+        self.tool_stats = tool_stats  # live execution stats from the router
+        self.decay = decay
+        self.interval = settings.HEALTH_PROBE_INTERVAL_S
+        self.jitter = settings.HEALTH_PROBE_JITTER
+        self.timeout = settings.HEALTH_PROBE_TIMEOUT_S
+        self.dead_after = settings.HEALTH_DEAD_AFTER
+        self._semaphore = asyncio.Semaphore(max(1, settings.HEALTH_PROBE_CONCURRENCY))
+        self._states: Dict[str, _ProbeState] = {}
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the background probe loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"🩺 Health prober started (every {self.interval}s)")
+    
+    async def stop(self):
+        """Stop the background probe loop"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+    
+    async def _run(self):
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logger.warning(f"⚠️  Health probe round failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+    
+    async def probe_all(self):
+        """Probe every loaded, enabled tool that has a health check"""
+        tool_names = [
+            name for name, tool in self.tool_registry.get_all_tools().items()
+            if hasattr(tool, "health_check") and tool.enabled
+        ]
+        await asyncio.gather(*(self._probe_with_jitter(name) for name in tool_names))
+    
+    async def _probe_with_jitter(self, tool_name: str):
+        # Spread probes so they don't hit dependencies in lockstep
+        await asyncio.sleep(random.uniform(0, self.interval * self.jitter))
+        async with self._semaphore:
+            await self.probe(tool_name)
+    
+    async def probe(self, tool_name: str) -> Dict[str, Any]:
+        """Run one health check now and record its outcome"""
+        tool = self.tool_registry.get_tool(tool_name)
+        if tool is None or not hasattr(tool, "health_check"):
+            return {"success": False, "error": f"Tool '{tool_name}' has no health check"}
+        
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(tool.health_check(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            result = {"success": False, "error": f"Health check timed out after {self.timeout}s"}
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        
+        self._record(tool_name, time.perf_counter() - start, result)
+        return result
+    
+    def _record(self, tool_name: str, latency: float, result: Dict[str, Any]):
+        state = self._states.get(tool_name)
+        if state is None:
+            state = self._states[tool_name] = _ProbeState()
+        
+        success = bool(result.get("success"))
+        state.degraded = success and bool(result.get("degraded"))
+        outcome = (0.5 if state.degraded else 1.0) if success else 0.0
+        
+        state.score += self.decay * (outcome - state.score)
+        state.consecutive_failures = 0 if success else state.consecutive_failures + 1
+        state.probes += 1
+        state.last_latency = latency
+        state.last_checked = time.time()
+        state.last_error = result.get("error") if not success or state.degraded else None
+        
+        if not success:
+            logger.warning(f"🩺 {tool_name} health check failed: {state.last_error}")
+    
+    def readiness_score(self, tool_name: str) -> Optional[float]:
+        """
+        Readiness in [0, 1], or None when nothing is known about the tool yet
+        
+        Disabled, failed or warming tools score 0, as does a tool whose last
+        HEALTH_DEAD_AFTER probes all failed. Otherwise the decayed probe score
+        is capped by the live execution success rate.
+        """
+        if not self.tool_registry.tool_status.get(tool_name, False):
+            return 0.0
+        
+        tool_state = self.tool_registry.get_tool_state(tool_name)
+        if tool_state in ("failed", "warming"):
+            return 0.0
+        
+        scores = []
+        state = self._states.get(tool_name)
+        if state is not None:
+            if state.consecutive_failures >= self.dead_after:
+                return 0.0
+            scores.append(state.score)
+        
+        stats = self.tool_stats.get(tool_name) if self.tool_stats else None
+        if stats is not None and stats.count >= self.tool_stats.min_samples:
+            scores.append(stats.ewma_success)
+        
+        if not scores:
+            return 1.0 if tool_state == "ready" else None
+        return round(min(scores), 4)
+    
+    def get_readiness(self, tool_name: str) -> Dict[str, Any]:
+        """Readiness score plus the latest probe details"""
+        state = self._states.get(tool_name)
+        return {
+            "score": self.readiness_score(tool_name),
+            "probes": state.probes if state else 0,
+            "consecutive_failures": state.consecutive_failures if state else 0,
+            "degraded": state.degraded if state else False,
+            "last_latency_ms": round(state.last_latency * 1000, 2) if state and state.last_latency is not None else None,
+            "last_checked": state.last_checked if state else None,
+            "last_error": state.last_error if state else None
+        }
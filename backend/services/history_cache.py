@@ -0,0 +1,142 @@
+"""History Cache - Per-session ring buffers of the most recent chat messages"""
+
+from typing import Dict, Any, List, Optional
+from collections import OrderedDict, deque
+import threading
+
+class _Ring:
+    """Contiguous run of a session's latest messages, ordered by seq"""
+    
+    def __init__(self, capacity: int):
+        self.messages = deque(maxlen=capacity)
+    
+    @property
+    def first_seq(self) -> int:
+        return self.messages[0]["seq"]
+    
+    @property
+    def last_seq(self) -> int:
+        return self.messages[-1]["seq"]
+
+class HistoryCache:
+    """
+    Bounded LRU of per-session ring buffers holding the newest messages
+    
+    Rings are filled when this process writes a turn and when a history page
+    is read from storage. A ring only ever holds consecutive seq numbers, so
+    whether it can answer a request is a matter of comparing seqs:
+    
+    - it must end at the session's latest seq (`latest_seq`, read from the
+      session summary when `validate` is on) - if another worker wrote since,
+      the ring is stale and dropped;
+    - it must contain `limit` messages below the requested position, or reach
+      back to seq 1 so there is nothing older to miss.
+    
+    Anything else falls through to storage.
+    """
+    
+    def __init__(self, max_sessions: int = 1000, per_session: int = 100, validate: bool = True):
+        self.max_sessions = max(1, max_sessions)
+        self.per_session = max(1, per_session)
+        self.validate = validate
+        self._rings: "OrderedDict[str, _Ring]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+    
+    def append(self, session_id: str, messages: List[Dict[str, Any]]):
+        """Record messages this process just wrote (consecutive seqs, oldest first)"""
+        if not messages:
+            return
+        with self._lock:
+            ring = self._rings.get(session_id)
+            if ring is not None and ring.last_seq != messages[0]["seq"] - 1:
+                # Another worker wrote in between - our copy has a gap
+                self.stale += 1
+                ring = None
+            if ring is None:
+                ring = self._new_ring(session_id)
+            ring.messages.extend(messages)
+            self._rings.move_to_end(session_id)
+    
+    def fill(self, session_id: str, messages: List[Dict[str, Any]], latest_seq: Optional[int]):
+        """Seed a ring from the newest page read from storage (oldest first)"""
+        if not messages or any("seq" not in msg for msg in messages):
+            return
+        seqs = [msg["seq"] for msg in messages]
+        if seqs != list(range(seqs[0], seqs[0] + len(seqs))):
+            return
+        if latest_seq is not None and seqs[-1] != latest_seq:
+            return
+        with self._lock:
+            ring = self._new_ring(session_id)
+            ring.messages.extend(messages)
+    
+    def get(
+        self,
+        session_id: str,
+        limit: int,
+        latest_seq: Optional[int] = None,
+        before_seq: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Up to `limit` messages older than `before_seq` (newest when None), or None on a miss"""
+        with self._lock:
+            ring = self._rings.get(session_id)
+            if ring is None or not ring.messages:
+                self.misses += 1
+                return None
+            
+            if self.validate and latest_seq != ring.last_seq:
+                del self._rings[session_id]
+                self.stale += 1
+                self.misses += 1
+                return None
+            
+            upper = ring.last_seq if before_seq is None else before_seq - 1
+            if upper > ring.last_seq:
+                self.misses += 1
+                return None
+            
+            window = [msg for msg in ring.messages if msg["seq"] <= upper][-limit:] if limit > 0 else []
+            # Short of `limit` is only a hit when the ring reaches back to the first message
+            if len(window) < limit and ring.first_seq != 1:
+                self.misses += 1
+                return None
+            
+            self._rings.move_to_end(session_id)
+            self.hits += 1
+            return list(window)
+    
+    def invalidate(self, session_id: str):
+        with self._lock:
+            self._rings.pop(session_id, None)
+    
+    def clear(self):
+        with self._lock:
+            self._rings.clear()
+    
+    def _new_ring(self, session_id: str) -> _Ring:
+        ring = _Ring(self.per_session)
+        self._rings[session_id] = ring
+        self._rings.move_to_end(session_id)
+        while len(self._rings) > self.max_sessions:
+            self._rings.popitem(last=False)
+            self.evictions += 1
+        return ring
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "sessions": len(self._rings),
+            "max_sessions": self.max_sessions,
+            "per_session": self.per_session,
+            "validate": self.validate,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "stale": self.stale,
+            "evictions": self.evictions
+        }
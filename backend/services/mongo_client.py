@@ -0,0 +1,164 @@
+"""Mongo Client - One shared, pool-tuned MongoDB client per process"""
+
+from typing import Dict, Any, Optional
+from config import settings
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from pymongo.monitoring import ConnectionPoolListener
+except ImportError:  # driver not installed - provider reports unavailable
+    ConnectionPoolListener = object
+
+class PoolMetrics(ConnectionPoolListener):
+    """
+    Connection pool listener tracking utilization and checkout waits
+    
+    pymongo calls these hooks from its own threads, so counters are guarded
+    by a lock.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.checkouts = 0
+        self.checkout_failures: Dict[str, int] = {}
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.pool_clears = 0
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_created(self, event):
+        with self._lock:
+            self.open += 1
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_closed(self, event):
+        with self._lock:
+            self.open = max(0, self.open - 1)
+    
+    def connection_check_out_started(self, event):
+        with self._lock:
+            self.waiting += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+    
+    def connection_check_out_failed(self, event):
+        reason = str(getattr(event, "reason", "unknown"))
+        with self._lock:
+            self.waiting = max(0, self.waiting - 1)
+            self.checkout_failures[reason] = self.checkout_failures.get(reason, 0) + 1
+    
+    def connection_checked_out(self, event):
+        wait = getattr(event, "duration", None) or 0.0  # seconds, pymongo >= 4.7
+        with self._lock:
+            self.waiting = max(0, self.waiting - 1)
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+    
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+    
+    def snapshot(self, max_pool_size: int) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "open": self.open,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "utilization": round(self.in_use / max_pool_size, 3) if max_pool_size else None,
+                "waiting": self.waiting,
+                "peak_waiting": self.peak_waiting,
+                "checkouts": self.checkouts,
+                "checkout_failures": dict(self.checkout_failures),
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 2) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+                "pool_clears": self.pool_clears
+            }
+
+class MongoClientProvider:
+    """
+    Creates the process's AsyncIOMotorClient on first use and hands it out
+    
+    DatabaseService and the database tool share this client, so a worker
+    holds one connection pool and one set of monitoring threads no matter
+    how many components talk to MongoDB.
+    """
+    
+    def __init__(
+        self,
+        url: str,
+        max_pool_size: int = 50,
+        min_pool_size: int = 0,
+        max_idle_time_ms: int = 60000,
+        wait_queue_timeout_ms: int = 2000,
+        server_selection_timeout_ms: int = 3000
+    ):
+        self.url = url
+        self.options = {
+            "maxPoolSize": max_pool_size,
+            "minPoolSize": min_pool_size,
+            "maxIdleTimeMS": max_idle_time_ms,
+            "waitQueueTimeoutMS": wait_queue_timeout_ms,
+            "serverSelectionTimeoutMS": server_selection_timeout_ms
+        }
+        self.metrics = PoolMetrics()
+        self._client = None
+    
+    def get_client(self):
+        """The shared client (raises ImportError when motor is not installed)"""
+        if self._client is None:
+            from motor.motor_asyncio import AsyncIOMotorClient
+            
+            self._client = AsyncIOMotorClient(self.url, event_listeners=[self.metrics], **self.options)
+            logger.info(
+                f"🔌 MongoDB client created (pool {self.options['minPoolSize']}-{self.options['maxPoolSize']})"
+            )
+        return self._client
+    
+    def get_database(self, name: Optional[str] = None):
+        return self.get_client()[name or settings.DATABASE_NAME]
+    
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+            logger.info("✅ MongoDB client closed")
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Pool configuration and live utilization / wait metrics"""
+        return {
+            "client_created": self._client is not None,
+            "config": self.options,
+            **self.metrics.snapshot(self.options["maxPoolSize"])
+        }
+
+mongo_client = MongoClientProvider(
+    settings.MONGODB_URL,
+    max_pool_size=settings.MONGO_MAX_POOL_SIZE,
+    min_pool_size=settings.MONGO_MIN_POOL_SIZE,
+    max_idle_time_ms=settings.MONGO_MAX_IDLE_TIME_MS,
+    wait_queue_timeout_ms=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS
+)
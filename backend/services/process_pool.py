@@ -0,0 +1,238 @@
+"""Process Pool - Run CPU-bound tool calls outside the event loop process
+
+Tools declare an execution class:
+
+    io-async     awaits I/O properly; runs on the event loop (default)
+    io-blocking  blocks in sync calls (sleeps, blocking clients); runs on a thread
+    cpu          holds the GIL (pandas, eval/exec); runs in a worker process
+
+Worker processes import and instantiate the cpu-class tools once at start,
+then execute picklable ToolCall envelopes and answer with ToolReply envelopes.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from utils.startup_profiler import current_rss_mb
+import multiprocessing
+import importlib
+import asyncio
+import pickle
+import os
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_CLASSES = ("io-async", "io-blocking", "cpu")
+
+
+@dataclass
+class ToolCall:
+    """Request envelope sent to a worker process"""
+    module: str
+    class_name: str
+    action: str
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ToolReply:
+    """Response envelope returned by a worker process"""
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    worker_pid: int
+    rss_mb: float
+    duration: float
+
+
+# Tool instances living in this worker process, keyed by (module, class)
+_worker_tools: Dict[Tuple[str, str], Any] = {}
+
+
+def _worker_tool(module: str, class_name: str):
+    key = (module, class_name)
+    tool = _worker_tools.get(key)
+    if tool is None:
+        tool = _worker_tools[key] = getattr(importlib.import_module(module), class_name)()
+    return tool
+
+
+def _init_worker(tool_specs: List[Tuple[str, str]]):
+    """Warm a new worker: import and instantiate the cpu-class tools up front"""
+    logging.basicConfig(level=logging.WARNING)
+    for module, class_name in tool_specs:
+        try:
+            _worker_tool(module, class_name)
+        except Exception as e:
+            logger.warning(f"⚠️  Worker {os.getpid()} could not preload {class_name}: {str(e)}")
+
+
+def _run_call(call: ToolCall) -> ToolReply:
+    """Execute one envelope inside a worker process"""
+    start = time.perf_counter()
+    try:
+        tool = _worker_tool(call.module, call.class_name)
+        result = asyncio.run(tool.execute(action=call.action, **call.params))
+        error = None
+    except Exception as e:
+        result, error = None, str(e)
+    return ToolReply(result, error, os.getpid(), current_rss_mb(), time.perf_counter() - start)
+
+
+def _ping() -> Tuple[int, float]:
+    return os.getpid(), current_rss_mb()
+
+
+class ProcessToolPool:
+    """
+    Managed ProcessPoolExecutor for cpu-class tool calls
+    
+    Workers are spawned (not forked) and warmed at start. Each worker is
+    replaced after `max_tasks_per_child` calls; the whole pool is recycled
+    gracefully when a worker grows more than `max_rss_growth_mb` above its
+    warm baseline, and forcefully when a call exceeds its timeout (the only
+    way to stop a runaway CPU-bound call).
+    """
+    
+    def __init__(
+        self,
+        tool_specs: List[Tuple[str, str]],
+        max_workers: int = 2,
+        max_tasks_per_child: int = 200,
+        max_rss_growth_mb: float = 256.0,
+        timeout: float = 30.0
+    ):
+        self.tool_specs = tool_specs
+        self.max_workers = max(1, max_workers)
+        self.max_tasks_per_child = max_tasks_per_child
+        self.max_rss_growth_mb = max_rss_growth_mb
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._start_lock = asyncio.Lock()
+        self._baseline_rss: Dict[int, float] = {}
+        self.stats = {"calls": 0, "timeouts": 0, "recycles": 0, "errors": 0}
+    
+    async def start(self):
+        """Create the pool and warm every worker"""
+        async with self._start_lock:
+            if self._executor is not None:
+                return
+            
+            executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.tool_specs,),
+                max_tasks_per_child=self.max_tasks_per_child
+            )
+            self._baseline_rss = {}
+            
+            # Submitting one ping per worker makes the executor spawn all of them now
+            loop = asyncio.get_running_loop()
+            pings = await asyncio.gather(
+                *(loop.run_in_executor(executor, _ping) for _ in range(self.max_workers)),
+                return_exceptions=True
+            )
+            for ping in pings:
+                if isinstance(ping, tuple):
+                    pid, rss = ping
+                    self._baseline_rss.setdefault(pid, rss)
+            
+            self._executor = executor
+            logger.info(f"⚙️  Process pool ready with {self.max_workers} warm workers")
+    
+    async def shutdown(self):
+        """Stop all workers"""
+        if self._executor:
+            self._terminate(self._executor)
+            self._executor = None
+    
+    async def run(
+        self,
+        module: str,
+        class_name: str,
+        action: str,
+        params: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Execute a tool call in a worker process"""
+        call = ToolCall(module, class_name, action, params or {})
+        try:
+            pickle.dumps(call)
+        except Exception as e:
+            return {"success": False, "error": f"Parameters cannot be sent to a worker process: {str(e)}"}
+        
+        if self._executor is None:
+            await self.start()
+        
+        executor = self._executor
+        if executor is None:
+            return {"success": False, "error": "Process pool is not running"}
+        timeout = timeout or self.timeout
+        self.stats["calls"] += 1
+        
+        try:
+            reply: ToolReply = await asyncio.wait_for(
+                asyncio.get_running_loop().run_in_executor(executor, _run_call, call),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            logger.warning(f"⏱️ {class_name}.{action} exceeded {timeout}s in worker - recycling pool")
+            await self._recycle(executor, force=True)
+            return {"success": False, "error": f"Tool call timed out after {timeout}s"}
+        except BrokenProcessPool:
+            self.stats["errors"] += 1
+            await self._recycle(executor, force=True)
+            return {"success": False, "error": "Worker process crashed"}
+        
+        # Workers that grew too far above their warm size are replaced
+        baseline = self._baseline_rss.setdefault(reply.worker_pid, reply.rss_mb)
+        if reply.rss_mb - baseline > self.max_rss_growth_mb:
+            logger.info(f"♻️  Worker {reply.worker_pid} grew to {reply.rss_mb:.0f} MB - recycling pool")
+            await self._recycle(executor, force=False)
+        
+        if reply.error is not None:
+            self.stats["errors"] += 1
+            return {"success": False, "error": reply.error}
+        return reply.result
+    
+    async def _recycle(self, executor: ProcessPoolExecutor, force: bool):
+        """Replace the pool; force terminates workers instead of letting them drain"""
+        if executor is not self._executor:
+            return  # another call already recycled it
+        
+        self.stats["recycles"] += 1
+        self._executor = None
+        
+        if force:
+            self._terminate(executor)
+        else:
+            executor.shutdown(wait=False, cancel_futures=False)
+        
+        await self.start()
+    
+    def _terminate(self, executor: ProcessPoolExecutor):
+        # ProcessPoolExecutor cannot cancel running calls; kill the processes
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Pool configuration and counters"""
+        return {
+            "workers": self.max_workers,
+            "running": self._executor is not None,
+            "max_tasks_per_child": self.max_tasks_per_child,
+            "max_rss_growth_mb": self.max_rss_growth_mb,
+            **self.stats
+        }
+
+
+def run_blocking(tool, action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Run an io-blocking tool's coroutine to completion on the calling thread"""
+    return asyncio.run(tool.execute(action=action, **params))
@@ -0,0 +1,192 @@
+"""Retention - Archive and delete expired chat messages and tool logs"""
+
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from utils.pagination import to_json_line
+import asyncio
+import gzip
+import time
+import os
+import logging
+
+try:
+    import fcntl  # one sweeper per host when several workers share the archive
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class RetentionSweeper:
+    """
+    Background job enforcing per-collection retention
+    
+    Every `interval` seconds, documents older than the collection's retention
+    (in days) are read oldest first in batches. Each batch is appended to
+    gzip-compressed NDJSON files partitioned by date:
+    
+        <archive_dir>/<collection>/<YYYY>/<MM>/<YYYY-MM-DD>.ndjson.gz
+    
+    and only deleted once the archive write has been fsynced. Payloads no
+    longer referenced by any log and sessions with no remaining messages are
+    removed as well, so the hot collections stay bounded.
+    """
+    
+    def __init__(
+        self,
+        store,
+        policies: Dict[str, int],
+        archive_dir: Optional[str] = None,
+        interval: float = 3600,
+        batch_size: int = 1000
+    ):
+        self.store = store
+        self.policies = {name: days for name, days in policies.items() if days and days > 0}
+        self.archive_dir = Path(archive_dir) if archive_dir else None
+        self.interval = interval
+        self.batch_size = max(1, batch_size)
+        self._task: Optional[asyncio.Task] = None
+        
+        self.sweeps = 0
+        self.archived: Dict[str, int] = {}
+        self.deleted: Dict[str, int] = {}
+        self.last_sweep: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[str] = None
+    
+    def start(self):
+        """Start the background sweep loop"""
+        if not self.policies:
+            logger.info("🗄️  No retention policies configured - keeping all history")
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"🗄️  Retention sweeper started ({self.policies} days, every {self.interval}s)")
+    
+    async def stop(self):
+        """Stop the background sweep loop"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+    
+    async def _run(self):
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning(f"⚠️  Retention sweep failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+    
+    async def sweep(self) -> Dict[str, int]:
+        """Archive and delete everything past its retention now; returns deletions per collection"""
+        if not self.store.is_connected():
+            return {}
+        
+        lock = self._acquire_lock()
+        if lock is False:
+            logger.info("🗄️  Another worker is sweeping - skipping this round")
+            return {}
+        
+        started = time.perf_counter()
+        deleted: Dict[str, int] = {}
+        try:
+            for collection, days in self.policies.items():
+                cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+                deleted[collection] = await self._sweep_collection(collection, cutoff)
+        finally:
+            self._release_lock(lock)
+        
+        self.sweeps += 1
+        self.last_error = None
+        self.last_sweep = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "deleted": deleted
+        }
+        if any(deleted.values()):
+            logger.info(f"🗄️  Retention sweep removed {deleted}")
+        return deleted
+    
+    async def _sweep_collection(self, collection: str, cutoff: datetime) -> int:
+        total = 0
+        while True:
+            batch = await self.store.expired_batch(collection, cutoff, self.batch_size)
+            if not batch:
+                break
+            
+            if self.archive_dir:
+                # Raises (and so keeps the documents) if the archive cannot be written
+                await asyncio.to_thread(self._archive, collection, batch)
+                self.archived[collection] = self.archived.get(collection, 0) + len(batch)
+            
+            count = await self.store.delete_by_ids(collection, [doc["_id"] for doc in batch])
+            total += count
+            self.deleted[collection] = self.deleted.get(collection, 0) + count
+            
+            if collection == "tool_logs":
+                hashes = {doc["payload"]["hash"] for doc in batch if doc.get("payload")}
+                if hashes:
+                    await self.store.prune_payloads(list(hashes))
+            
+            if len(batch) < self.batch_size:
+                break
+        
+        if collection == "chat_messages":
+            await self.store.expire_sessions(cutoff)
+            if total and self.store.history_cache is not None:
+                self.store.history_cache.clear()
+        return total
+    
+    def _archive(self, collection: str, batch: List[Dict[str, Any]]):
+        """Append documents to their day's gzip NDJSON file (runs in a worker thread)"""
+        by_day: Dict[str, List[Dict[str, Any]]] = {}
+        for doc in batch:
+            timestamp = doc.get("timestamp")
+            day = timestamp.strftime("%Y-%m-%d") if isinstance(timestamp, datetime) else "undated"
+            by_day.setdefault(day, []).append(doc)
+        
+        for day, docs in by_day.items():
+            folder = self.archive_dir / collection
+            if day != "undated":
+                folder = folder / day[:4] / day[5:7]
+            folder.mkdir(parents=True, exist_ok=True)
+            
+            # Appending starts a new gzip member; readers see one continuous stream
+            with open(folder / f"{day}.ndjson.gz", "ab") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="ab") as f:
+                    for doc in docs:
+                        f.write(to_json_line(doc))
+                raw.flush()
+                os.fsync(raw.fileno())
+    
+    def _acquire_lock(self):
+        """Non-blocking per-host lock; None when locking is unavailable, False when held elsewhere"""
+        if fcntl is None or self.archive_dir is None:
+            return None
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        handle = open(self.archive_dir / ".sweeper.lock", "w")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        return handle
+    
+    @staticmethod
+    def _release_lock(lock):
+        if lock:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+            lock.close()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "policies_days": self.policies,
+            "archive_dir": str(self.archive_dir) if self.archive_dir else None,
+            "sweeps": self.sweeps,
+            "archived": self.archived,
+            "deleted": self.deleted,
+            "last_sweep": self.last_sweep,
+            "last_error": self.last_error
+        }
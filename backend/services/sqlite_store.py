@@ -0,0 +1,569 @@
+"""SQLite Store - Embedded WAL-mode storage for single-node deployments"""
+
+from typing import Dict, Any, List, Optional, AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from services.storage import ChatStore, SESSION_PREVIEW_CHARS
+from services.write_buffer import WriteBehindBuffer
+from utils.pagination import encode_cursor, decode_cursor, apply_projection
+from utils.payloads import expand_payload
+import functools
+import sqlite3
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chat_messages (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chat_session_timestamp ON chat_messages (session_id, timestamp, seq);
+CREATE INDEX IF NOT EXISTS chat_timestamp ON chat_messages (timestamp);
+
+CREATE TABLE IF NOT EXISTS tool_logs (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT,
+    tool_name TEXT NOT NULL,
+    action TEXT,
+    result TEXT NOT NULL DEFAULT '{}',
+    payload TEXT,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS logs_session_timestamp ON tool_logs (session_id, timestamp);
+CREATE INDEX IF NOT EXISTS logs_tool_timestamp ON tool_logs (tool_name, timestamp);
+CREATE INDEX IF NOT EXISTS logs_session_tool_timestamp ON tool_logs (session_id, tool_name, timestamp);
+CREATE INDEX IF NOT EXISTS logs_timestamp ON tool_logs (timestamp);
+
+CREATE TABLE IF NOT EXISTS tool_payloads (
+    hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    last_message TEXT NOT NULL,
+    preview TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS sessions_last_message ON sessions (last_message);
+"""
+
+COLUMNS = {
+    "chat_messages": ("session_id", "seq", "role", "content", "metadata", "timestamp"),
+    "tool_logs": ("session_id", "tool_name", "action", "result", "payload", "timestamp")
+}
+JSON_COLUMNS = ("metadata", "result", "payload")
+
+def _ts(value: datetime) -> str:
+    """Fixed-width UTC timestamp so text order matches time order"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+class _SQLiteTable:
+    """insert_many adapter so WriteBehindBuffer can batch into a table"""
+    
+    def __init__(self, store: "SQLiteStore", table: str):
+        self.store = store
+        self.table = table
+    
+    async def insert_many(self, documents: List[Dict[str, Any]], ordered: bool = False):
+        count = await self.store._run(self.store._insert_rows, self.table, documents)
+        return SimpleNamespace(inserted_ids=range(count))
+
+class SQLiteStore(ChatStore):
+    """
+    ChatStore backed by a local SQLite database in WAL mode
+    
+    All SQLite calls run on one dedicated thread so the event loop never
+    blocks on disk. Inserts go through the same write-behind buffers as the
+    MongoDB backend and each batch is committed in a single transaction.
+    """
+    
+    backend = "sqlite"
+    
+    def __init__(self, path: str, batch_size: int = 100, flush_interval: float = 0.2, max_queue: int = 5000):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._buffers: Dict[str, WriteBehindBuffer] = {}
+        self._connected = False
+    
+    async def connect(self):
+        """Open (or create) the database file"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-store")
+            await self._run(self._open)
+            
+            for table in COLUMNS:
+                buffer = WriteBehindBuffer(
+                    _SQLiteTable(self, table),
+                    table,
+                    batch_size=self.batch_size,
+                    flush_interval=self.flush_interval,
+                    max_queue=self.max_queue
+                )
+                buffer.start()
+                self._buffers[table] = buffer
+            
+            self._connected = True
+            logger.info(f"✅ SQLite storage ready at {self.path}")
+        
+        except Exception as e:
+            logger.warning(f"⚠️  SQLite storage failed to open: {str(e)} - running without database")
+            self._connected = False
+    
+    def _open(self):
+        conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints, no fsync per commit
+        conn.execute("PRAGMA busy_timeout=5000")  # other workers may hold the write lock briefly
+        conn.executescript(SCHEMA)
+        # Databases created before payloads were split out lack the column
+        if "payload" not in {row["name"] for row in conn.execute("PRAGMA table_info(tool_logs)")}:
+            conn.execute("ALTER TABLE tool_logs ADD COLUMN payload TEXT")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS logs_payload_hash ON tool_logs (json_extract(payload, '$.hash'))"
+        )
+        self._conn = conn
+    
+    async def disconnect(self):
+        """Drain buffered writes and close the database"""
+        for buffer in self._buffers.values():
+            await buffer.close()
+        self._buffers = {}
+        
+        if self._conn is not None:
+            await self._run(self._conn.close)
+            self._conn = None
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._connected = False
+        logger.info("✅ SQLite storage closed")
+    
+    def is_connected(self) -> bool:
+        return self._connected
+    
+    async def _run(self, func: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+    
+    async def flush(self, collection_name: Optional[str] = None):
+        for name, buffer in self._buffers.items():
+            if collection_name is None or name == collection_name:
+                await buffer.flush()
+    
+    def write_buffer_stats(self) -> Dict[str, Any]:
+        return {name: buffer.snapshot() for name, buffer in self._buffers.items()}
+    
+    def _insert_rows(self, table: str, documents: List[Dict[str, Any]]) -> int:
+        columns = COLUMNS[table]
+        rows = [
+            tuple(
+                json.dumps(doc[col], default=str) if col in JSON_COLUMNS and col in doc
+                else _ts(doc[col]) if col == "timestamp"
+                else doc.get(col)
+                for col in columns
+            )
+            for doc in documents
+        ]
+        placeholders = ", ".join("?" for _ in columns)
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        self._conn.execute("BEGIN")
+        try:
+            for doc, row in zip(documents, rows):
+                # Row ids are handed back to the documents, which the history cache may share
+                doc["_id"] = str(self._conn.execute(sql, row).lastrowid)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return len(rows)
+    
+    def _record_turn(self, session_id: str, count: int, now: str, preview: Optional[str]) -> int:
+        """Upsert the session summary and reserve `count` sequence numbers, returning the first"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                """
+                INSERT INTO sessions (session_id, message_count, created_at, last_message, preview)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (session_id) DO UPDATE SET
+                    message_count = message_count + excluded.message_count,
+                    last_message = max(last_message, excluded.last_message)
+                """,
+                (session_id, count, now, now, preview or "")
+            )
+            total = self._conn.execute(
+                "SELECT message_count FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()[0]
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return total - count + 1
+    
+    async def save_chat_messages(self, session_id: str, messages: List[Dict[str, Any]]) -> bool:
+        """Save several messages of a session (e.g. a user/assistant turn) in order"""
+        if not self._connected or not messages:
+            return False
+        
+        try:
+            now = datetime.now(timezone.utc)
+            first_user = next((msg for msg in messages if msg["role"] == "user"), None)
+            preview = first_user["content"][:SESSION_PREVIEW_CHARS] if first_user else None
+            seq = await self._run(self._record_turn, session_id, len(messages), _ts(now), preview)
+            
+            documents = [
+                {
+                    "session_id": session_id,
+                    "role": msg["role"],
+                    "content": msg["content"],
+                    "metadata": msg.get("metadata") or {},
+                    "timestamp": now,
+                    "seq": seq + offset
+                }
+                for offset, msg in enumerate(messages)
+            ]
+            for document in documents:
+                await self._buffers["chat_messages"].put(document)
+            self._remember(session_id, documents)
+            return True
+        
+        except Exception as e:
+            logger.error(f"❌ Error saving message: {str(e)}")
+            return False
+    
+    def _put_payload(self, payload: Dict[str, Any], now: str):
+        # Content-addressed: an identical result is stored once
+        self._conn.execute(
+            "INSERT OR IGNORE INTO tool_payloads (hash, codec, size, data, created_at) VALUES (?, ?, ?, ?, ?)",
+            (payload["hash"], payload["codec"], payload["size"], payload["data"], now)
+        )
+    
+    async def save_tool_log(
+        self,
+        session_id: str,
+        tool_name: str,
+        action: str,
+        result: Dict[str, Any]
+    ) -> bool:
+        """Save tool execution log"""
+        if not self._connected:
+            return False
+        
+        try:
+            now = datetime.now(timezone.utc)
+            fields, payload = await self._compact_result(result)
+            if payload:
+                await self._run(self._put_payload, payload, _ts(now))
+            
+            await self._buffers["tool_logs"].put({
+                "session_id": session_id,
+                "tool_name": tool_name,
+                "action": action,
+                **fields,
+                "timestamp": now
+            })
+            return True
+        
+        except Exception as e:
+            logger.error(f"❌ Error saving tool log: {str(e)}")
+            return False
+    
+    @staticmethod
+    def _row_to_doc(row: sqlite3.Row) -> Dict[str, Any]:
+        doc = dict(row)
+        doc["_id"] = str(doc.pop("id"))
+        doc["timestamp"] = datetime.fromisoformat(doc["timestamp"])
+        for col in JSON_COLUMNS:
+            if col in doc:
+                if doc[col] is None:
+                    del doc[col]
+                else:
+                    doc[col] = json.loads(doc[col])
+        return doc
+    
+    @staticmethod
+    def _keyset_sql(before: Optional[str], after: Optional[str], tiebreak: str):
+        """SQL bounds for before/after cursors (raises ValueError for bad cursors)"""
+        clauses, params = [], []
+        for op, cursor in (("<", before), (">", after)):
+            if cursor:
+                timestamp, key = decode_cursor(cursor)
+                ts = _ts(timestamp)
+                clauses.append(f"(timestamp {op} ? OR (timestamp = ? AND {tiebreak} {op} ?))")
+                params.extend([ts, ts, int(key)])
+        return clauses, params
+    
+    def _select(self, table: str, where: List[str], params: List[Any], tiebreak: str, direction: str, limit: int):
+        sql = f"SELECT * FROM {table}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY timestamp {direction}, {tiebreak} {direction} LIMIT ?"
+        return [self._row_to_doc(row) for row in self._conn.execute(sql, [*params, limit])]
+    
+    def _select_latest_seq(self, session_id: str) -> Optional[int]:
+        row = self._conn.execute(
+            "SELECT message_count FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    async def latest_seq(self, session_id: str) -> Optional[int]:
+        """Seq of a session's newest message - a point read of its summary"""
+        if not self._connected:
+            return None
+        try:
+            return await self._run(self._select_latest_seq, session_id)
+        except Exception as e:
+            logger.warning(f"⚠️  Could not read session summary: {str(e)}")
+            return None
+    
+    async def _query_chat_history(
+        self,
+        session_id: str,
+        limit: int = 50,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get a page of chat history for session, oldest first"""
+        if not self._connected:
+            return []
+        
+        bounds, params = self._keyset_sql(before, after, "seq")
+        direction = "ASC" if after and not before else "DESC"
+        
+        try:
+            await self.flush("chat_messages")
+            messages = await self._run(
+                self._select, "chat_messages", ["session_id = ?", *bounds], [session_id, *params], "seq", direction, limit
+            )
+            messages = [apply_projection(msg, fields, exclude, ["_id", "timestamp", "seq"]) for msg in messages]
+            return messages if direction == "ASC" else list(reversed(messages))
+        
+        except Exception as e:
+            logger.error(f"❌ Error retrieving history: {str(e)}")
+            return []
+    
+    async def iter_chat_history(
+        self,
+        session_id: str,
+        after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a session's full history oldest first, one page at a time"""
+        if not self._connected:
+            return
+        
+        await self.flush("chat_messages")
+        while True:
+            bounds, params = self._keyset_sql(None, after, "seq")
+            page = await self._run(
+                self._select, "chat_messages", ["session_id = ?", *bounds], [session_id, *params], "seq", "ASC", 500
+            )
+            for msg in page:
+                yield apply_projection(msg, fields, exclude, ["_id", "timestamp", "seq"])
+            if len(page) < 500:
+                return
+            after = encode_cursor(page[-1]["timestamp"], page[-1]["seq"])
+    
+    def _select_log(self, log_id: int) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT * FROM tool_logs WHERE id = ?", (log_id,)).fetchone()
+        if row is None:
+            return None
+        log = self._row_to_doc(row)
+        
+        reference = log.get("payload")
+        if reference and not reference.get("dropped"):
+            stored = self._conn.execute(
+                "SELECT codec, data FROM tool_payloads WHERE hash = ?", (reference["hash"],)
+            ).fetchone()
+            if stored:
+                log["result"] = expand_payload(stored["data"], stored["codec"])
+        return log
+    
+    async def get_tool_log(self, log_id: str) -> Optional[Dict[str, Any]]:
+        """One tool log with its full result (large payloads are only loaded here)"""
+        if not self._connected or not str(log_id).isdigit():
+            return None
+        
+        try:
+            await self.flush("tool_logs")
+            return await self._run(self._select_log, int(log_id))
+        except Exception as e:
+            logger.error(f"❌ Error retrieving log: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _log_where(session_id: Optional[str], tool_name: Optional[str]):
+        where, params = [], []
+        if session_id:
+            where.append("session_id = ?")
+            params.append(session_id)
+        if tool_name:
+            where.append("tool_name = ?")
+            params.append(tool_name)
+        return where, params
+    
+    async def get_tool_logs(
+        self,
+        session_id: str = None,
+        tool_name: str = None,
+        limit: int = 50,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get a page of tool execution logs, newest first"""
+        if not self._connected:
+            return []
+        
+        where, params = self._log_where(session_id, tool_name)
+        bounds, bound_params = self._keyset_sql(before, after, "id")
+        direction = "ASC" if after and not before else "DESC"
+        
+        try:
+            await self.flush("tool_logs")
+            logs = await self._run(
+                self._select, "tool_logs", [*where, *bounds], [*params, *bound_params], "id", direction, limit
+            )
+            logs = [apply_projection(log, fields, exclude, ["_id", "timestamp"]) for log in logs]
+            return logs if direction == "DESC" else list(reversed(logs))
+        
+        except Exception as e:
+            logger.error(f"❌ Error retrieving logs: {str(e)}")
+            return []
+    
+    async def iter_tool_logs(
+        self,
+        session_id: Optional[str] = None,
+        tool_name: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream matching tool logs oldest first, one page at a time"""
+        if not self._connected:
+            return
+        
+        await self.flush("tool_logs")
+        where, params = self._log_where(session_id, tool_name)
+        after = None
+        while True:
+            bounds, bound_params = self._keyset_sql(None, after, "id")
+            page = await self._run(
+                self._select, "tool_logs", [*where, *bounds], [*params, *bound_params], "id", "ASC", 500
+            )
+            for log in page:
+                yield apply_projection(log, fields, exclude, ["_id", "timestamp"])
+            if len(page) < 500:
+                return
+            after = encode_cursor(page[-1]["timestamp"], page[-1]["_id"])
+    
+    def _select_sessions(self, limit: int) -> List[Dict[str, Any]]:
+        rows = self._conn.execute(
+            "SELECT session_id, message_count, created_at, last_message, preview FROM sessions "
+            "ORDER BY last_message DESC LIMIT ?",
+            (limit,)
+        )
+        return [
+            {
+                **dict(row),
+                "created_at": datetime.fromisoformat(row["created_at"]),
+                "last_message": datetime.fromisoformat(row["last_message"])
+            }
+            for row in rows
+        ]
+    
+    async def get_sessions(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Get recent chat sessions"""
+        if not self._connected:
+            return []
+        
+        try:
+            return await self._run(self._select_sessions, limit)
+        except Exception as e:
+            logger.error(f"❌ Error retrieving sessions: {str(e)}")
+            return []
+    
+    def _select_expired(self, table: str, cutoff: str, limit: int) -> List[Dict[str, Any]]:
+        rows = self._conn.execute(
+            f"SELECT * FROM {table} WHERE timestamp < ? ORDER BY timestamp, id LIMIT ?", (cutoff, limit)
+        )
+        docs = [self._row_to_doc(row) for row in rows]
+        for doc in docs:
+            reference = doc.get("payload")
+            if reference and not reference.get("dropped"):
+                stored = self._conn.execute(
+                    "SELECT codec, data FROM tool_payloads WHERE hash = ?", (reference["hash"],)
+                ).fetchone()
+                if stored:
+                    doc["result"] = expand_payload(stored["data"], stored["codec"])
+        return docs
+    
+    async def expired_batch(self, collection: str, cutoff: datetime, limit: int) -> List[Dict[str, Any]]:
+        """Oldest documents of a collection written before `cutoff` (tool logs with full results)"""
+        return await self._run(self._select_expired, collection, _ts(cutoff), limit)
+    
+    def _execute(self, sql: str, params) -> int:
+        self._conn.execute("BEGIN")
+        try:
+            count = self._conn.execute(sql, params).rowcount
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return count
+    
+    async def delete_by_ids(self, collection: str, ids: List[str]) -> int:
+        if collection not in COLUMNS or not ids:
+            return 0
+        placeholders = ", ".join("?" for _ in ids)
+        return await self._run(
+            self._execute, f"DELETE FROM {collection} WHERE id IN ({placeholders})", [int(i) for i in ids]
+        )
+    
+    async def prune_payloads(self, hashes: List[str]) -> int:
+        """Delete stored payloads that no remaining tool log references"""
+        if not hashes:
+            return 0
+        # A queued log may reference one of these payloads - make it visible first
+        await self.flush("tool_logs")
+        placeholders = ", ".join("?" for _ in hashes)
+        return await self._run(
+            self._execute,
+            f"""
+            DELETE FROM tool_payloads WHERE hash IN ({placeholders})
+            AND NOT EXISTS (
+                SELECT 1 FROM tool_logs WHERE json_extract(tool_logs.payload, '$.hash') = tool_payloads.hash
+            )
+            """,
+            hashes
+        )
+    
+    async def expire_sessions(self, cutoff: datetime) -> int:
+        """Delete session summaries whose last message is older than `cutoff`"""
+        return await self._run(self._execute, "DELETE FROM sessions WHERE last_message < ?", (_ts(cutoff),))
@@ -0,0 +1,238 @@
+"""Storage - Backend-agnostic interface for chat history, sessions and tool logs"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional, AsyncIterator
+from datetime import datetime
+from config import settings
+from utils.pagination import decode_cursor, apply_projection
+from utils.payloads import compact_result
+from services.history_cache import HistoryCache
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+SESSION_PREVIEW_CHARS = 120
+
+class ChatStore(ABC):
+    """
+    Persistence for chat messages, session summaries and tool logs
+    
+    Implemented by DatabaseService (MongoDB) and SQLiteStore (embedded file).
+    Routes only use these methods, so either backend can serve them.
+    History is returned oldest first and tool logs newest first; both page
+    with opaque before/after cursors from utils.pagination.
+    """
+    
+    backend = "none"
+    history_cache: Optional[HistoryCache] = None
+    
+    @abstractmethod
+    async def connect(self):
+        ...
+    
+    @abstractmethod
+    async def disconnect(self):
+        """Flush pending writes and release resources"""
+    
+    @abstractmethod
+    def is_connected(self) -> bool:
+        ...
+    
+    async def flush(self, collection_name: Optional[str] = None):
+        """Wait for buffered writes to become readable"""
+    
+    def write_buffer_stats(self) -> Dict[str, Any]:
+        return {}
+    
+    async def save_chat_message(
+        self,
+        session_id: str,
+        role: str,
+        content: str,
+        metadata: Dict[str, Any] = None
+    ) -> bool:
+        """Save chat message to database"""
+        return await self.save_chat_messages(session_id, [
+            {"role": role, "content": content, "metadata": metadata}
+        ])
+    
+    @abstractmethod
+    async def save_chat_messages(self, session_id: str, messages: List[Dict[str, Any]]) -> bool:
+        """Save several messages of a session (e.g. a user/assistant turn) in order"""
+    
+    def _remember(self, session_id: str, documents: List[Dict[str, Any]]):
+        """Add just-written messages to the recent-history cache"""
+        if self.history_cache is not None:
+            self.history_cache.append(session_id, documents)
+    
+    @abstractmethod
+    async def latest_seq(self, session_id: str) -> Optional[int]:
+        """Seq of a session's newest message (its message count), None if unknown"""
+    
+    async def get_chat_history(
+        self,
+        session_id: str,
+        limit: int = 50,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a page of chat history for session, oldest first
+        
+        Pages inside the recent-history cache window are answered from memory
+        after a point read of the session's latest seq (skipped when the cache
+        does not validate); older pages and `after` queries go to the backend.
+        """
+        cache = self.history_cache
+        if cache is None or after or not self.is_connected():
+            return await self._query_chat_history(session_id, limit, before, after, fields, exclude)
+        
+        before_seq = decode_cursor(before)[1] if before else None
+        if before_seq is not None and not isinstance(before_seq, int):
+            # Cursor from a message written before seq numbers existed
+            return await self._query_chat_history(session_id, limit, before, after, fields, exclude)
+        
+        latest = await self.latest_seq(session_id) if cache.validate else None
+        cached = cache.get(session_id, limit, latest, before_seq)
+        if cached is not None:
+            if any("_id" not in msg for msg in cached):
+                # Written by this process and still waiting for its id from the backend
+                await self.flush("chat_messages")
+            return [
+                apply_projection({**msg, "_id": str(msg["_id"])}, fields, exclude, ["_id", "timestamp", "seq"])
+                for msg in cached
+            ]
+        
+        messages = await self._query_chat_history(session_id, limit, before, after, fields, exclude)
+        if not before and not fields and not exclude:
+            cache.fill(session_id, messages, latest)
+        return messages
+    
+    @abstractmethod
+    async def _query_chat_history(
+        self,
+        session_id: str,
+        limit: int,
+        before: Optional[str],
+        after: Optional[str],
+        fields: Optional[List[str]],
+        exclude: Optional[List[str]]
+    ) -> List[Dict[str, Any]]:
+        ...
+    
+    @abstractmethod
+    def iter_chat_history(
+        self,
+        session_id: str,
+        after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        ...
+    
+    @abstractmethod
+    async def save_tool_log(
+        self,
+        session_id: str,
+        tool_name: str,
+        action: str,
+        result: Dict[str, Any]
+    ) -> bool:
+        ...
+    
+    async def _compact_result(self, result: Dict[str, Any]):
+        """Inline fields and optional compressed payload for a tool result (see utils.payloads)"""
+        return await asyncio.to_thread(
+            compact_result,
+            result,
+            settings.TOOL_LOG_INLINE_MAX_BYTES,
+            settings.TOOL_LOG_COMPRESSION or None
+        )
+    
+    @abstractmethod
+    async def get_tool_log(self, log_id: str) -> Optional[Dict[str, Any]]:
+        """One tool log with its full result (large payloads are only loaded here)"""
+    
+    @abstractmethod
+    async def get_tool_logs(
+        self,
+        session_id: str = None,
+        tool_name: str = None,
+        limit: int = 50,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        ...
+    
+    @abstractmethod
+    def iter_tool_logs(
+        self,
+        session_id: Optional[str] = None,
+        tool_name: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        ...
+    
+    @abstractmethod
+    async def get_sessions(self, limit: int = 20) -> List[Dict[str, Any]]:
+        ...
+    
+    @abstractmethod
+    async def expired_batch(self, collection: str, cutoff: datetime, limit: int) -> List[Dict[str, Any]]:
+        """Oldest documents of a collection written before `cutoff` (tool logs with full results)"""
+    
+    @abstractmethod
+    async def delete_by_ids(self, collection: str, ids: List[str]) -> int:
+        ...
+    
+    @abstractmethod
+    async def prune_payloads(self, hashes: List[str]) -> int:
+        """Delete stored payloads that no remaining tool log references"""
+    
+    @abstractmethod
+    async def expire_sessions(self, cutoff: datetime) -> int:
+        """Delete session summaries whose last message is older than `cutoff`"""
+
+async def open_store(backend: Optional[str] = None) -> ChatStore:
+    """
+    Connect the configured storage backend
+    
+    "mongo" uses MongoDB only (history is not persisted while it is down),
+    "sqlite" uses the embedded WAL-mode file at SQLITE_PATH, and "auto" uses
+    MongoDB when reachable and falls back to SQLite otherwise.
+    """
+    from services.db_service import DatabaseService
+    from services.sqlite_store import SQLiteStore
+    
+    backend = (backend or settings.STORAGE_BACKEND).lower()
+    
+    store = None
+    if backend in ("mongo", "auto"):
+        store = DatabaseService()
+        await store.connect()
+        if not store.is_connected() and backend == "auto":
+            logger.info("💾 MongoDB unavailable - falling back to SQLite storage")
+            store = None
+    
+    if store is None:
+        store = SQLiteStore(
+            settings.SQLITE_PATH,
+            batch_size=settings.DB_WRITE_BATCH_SIZE,
+            flush_interval=settings.DB_WRITE_FLUSH_MS / 1000,
+            max_queue=settings.DB_WRITE_QUEUE_MAX
+        )
+        await store.connect()
+    
+    if settings.HISTORY_CACHE_ENABLED:
+        store.history_cache = HistoryCache(
+            max_sessions=settings.HISTORY_CACHE_SESSIONS,
+            per_session=settings.HISTORY_CACHE_MESSAGES,
+            validate=settings.HISTORY_CACHE_VALIDATE
+        )
+    return store
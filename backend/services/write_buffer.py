@@ -0,0 +1,141 @@
+"""Write Buffer - Write-behind batching of inserts into a MongoDB collection"""
+
+from typing import Dict, Any, List, Optional
+import asyncio
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class WriteBehindBuffer:
+    """
+    Queues documents and inserts them in unordered batches
+    
+    A flush happens when `batch_size` documents are waiting or `flush_interval`
+    seconds after the first one arrived, whichever comes first. The queue holds
+    at most `max_queue` documents; when it is full `put` waits for the flusher
+    to catch up (backpressure) instead of growing without bound.
+    
+    `flush` writes the pending batch right away and waits only for documents
+    queued before it was called, so reads are not held up by later writers.
+    """
+    
+    def __init__(self, collection, name: str, batch_size: int = 100, flush_interval: float = 0.2, max_queue: int = 5000):
+        self.collection = collection
+        self.name = name
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_queue))
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._wake = asyncio.Event()  # a document arrived or a flush was requested
+        self._flush_requested = asyncio.Event()
+        self._progress = asyncio.Condition()
+        self._processed = 0  # documents taken off the queue and written (or failed)
+        
+        self.enqueued = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.backpressure_waits = 0
+        self.last_flush_ms = 0.0
+    
+    def start(self):
+        """Start the background flusher on the running loop"""
+        if self._task and not self._task.done():
+            return
+        self._closed = False
+        self._task = asyncio.create_task(self._run(), name=f"write-behind-{self.name}")
+    
+    async def put(self, document: Dict[str, Any]):
+        """Queue a document, waiting while the queue is full"""
+        if self._closed:
+            raise RuntimeError(f"Write buffer '{self.name}' is closed")
+        if self._queue.full():
+            self.backpressure_waits += 1
+        await self._queue.put(document)
+        self.enqueued += 1
+        self._wake.set()
+    
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+    
+    async def flush(self):
+        """Write what is pending now and wait until everything queued before this call is written"""
+        target = self.enqueued
+        if not self._task or self._task.done() or self._processed >= target:
+            return
+        self._flush_requested.set()
+        self._wake.set()
+        async with self._progress:
+            await self._progress.wait_for(lambda: self._processed >= target)
+    
+    async def close(self, timeout: float = 10.0):
+        """Stop accepting documents and drain what is queued"""
+        self._closed = True
+        if not self._task:
+            return
+        try:
+            await asyncio.wait_for(self.flush(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️  Write buffer '{self.name}' drain timed out with {self.pending} documents unwritten")
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+    
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._flush_requested.is_set():
+                    break
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+                if self._queue.empty():
+                    # Everything queued so far is written - no flush is waiting any more
+                    self._flush_requested.clear()
+                async with self._progress:
+                    self._processed += len(batch)
+                    self._progress.notify_all()
+    
+    async def _write(self, batch: List[Dict[str, Any]]):
+        started = time.perf_counter()
+        try:
+            result = await self.collection.insert_many(batch, ordered=False)
+            self.written += len(result.inserted_ids)
+        except Exception as e:
+            # Unordered inserts keep going past a bad document; count what made it
+            inserted = getattr(e, "details", {}) or {}
+            written = inserted.get("nInserted", 0)
+            self.written += written
+            self.failed += len(batch) - written
+            logger.error(f"❌ Batch insert into {self.name} failed for {len(batch) - written} documents: {str(e)}")
+        self.batches += 1
+        self.last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "pending": self.pending,
+            "capacity": self._queue.maxsize,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+            "avg_batch": round(self.written / self.batches, 1) if self.batches else 0,
+            "backpressure_waits": self.backpressure_waits,
+            "last_flush_ms": self.last_flush_ms
+        }
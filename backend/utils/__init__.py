@@ -1,5 +1,6 @@
 """Utilities module"""
 
 from .tool_registry import ToolRegistry
+from .param_extractor import ParamExtractor
 
-__all__ = ['ToolRegistry']
+__all__ = ['ToolRegistry', 'ParamExtractor']
@@ -0,0 +1,127 @@
+"""Bulkheads - Bounded per-tool thread pools for blocking libraries"""
+
+from typing import Dict, Any, Callable
+from concurrent.futures import ThreadPoolExecutor
+from config import settings
+import functools
+import threading
+import asyncio
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class BulkheadFull(Exception):
+    """Raised when a bulkhead's workers and queue are all taken"""
+
+class Bulkhead:
+    """
+    A dedicated thread pool with a bounded queue
+    
+    At most `max_workers` calls run at once and at most `max_queue` more
+    wait; further calls are rejected immediately instead of piling up, so
+    one slow dependency cannot starve other tools or the default executor.
+    """
+    
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=f"bulkhead-{name}"
+        )
+        self._lock = threading.Lock()
+        self.in_flight = 0  # running + queued
+        self.active = 0  # running
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+    
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call in this bulkhead"""
+        with self._lock:
+            if self.in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise BulkheadFull(
+                    f"'{self.name}' is saturated ({self.in_flight} calls in flight) - try again shortly"
+                )
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        
+        submitted_at = time.perf_counter()
+        future = self._executor.submit(self._call, submitted_at, functools.partial(func, *args, **kwargs))
+        # Release the slot when the thread is actually done (or the queued call is cancelled),
+        # not when the awaiting coroutine gives up
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+    
+    def _call(self, submitted_at: float, call: Callable) -> Any:
+        with self._lock:
+            self.active += 1
+            self.total_wait += time.perf_counter() - submitted_at
+        try:
+            result = call()
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.active -= 1
+        with self._lock:
+            self.completed += 1
+        return result
+    
+    def _release(self, _future):
+        with self._lock:
+            self.in_flight -= 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Current depth, saturation and counters"""
+        with self._lock:
+            started = self.completed + self.failed + self.active
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self.active,
+                "queued": self.in_flight - self.active,
+                "saturation": round(self.in_flight / (self.max_workers + self.max_queue), 4),
+                "peak_in_flight": self.peak_in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_queue_wait_ms": round(self.total_wait / started * 1000, 2) if started else None
+            }
+    
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+_bulkheads: Dict[str, Bulkhead] = {}
+_bulkheads_lock = threading.Lock()
+
+def get_bulkhead(name: str) -> Bulkhead:
+    """Get (or create from BULKHEAD_LIMITS) the bulkhead for a tool"""
+    bulkhead = _bulkheads.get(name)
+    if bulkhead is None:
+        with _bulkheads_lock:
+            bulkhead = _bulkheads.get(name)
+            if bulkhead is None:
+                max_workers, max_queue = settings.BULKHEAD_LIMITS.get(
+                    name,
+                    [settings.BULKHEAD_DEFAULT_WORKERS, settings.BULKHEAD_DEFAULT_QUEUE]
+                )
+                bulkhead = _bulkheads[name] = Bulkhead(name, max_workers, max_queue)
+                logger.info(f"🧱 Bulkhead '{name}': {max_workers} workers, queue {max_queue}")
+    return bulkhead
+
+def bulkhead_snapshot() -> Dict[str, Dict[str, Any]]:
+    """Metrics for every bulkhead created so far"""
+    return {name: bulkhead.snapshot() for name, bulkhead in list(_bulkheads.items())}
+
+def shutdown_bulkheads():
+    """Stop all bulkhead thread pools"""
+    for bulkhead in list(_bulkheads.values()):
+        bulkhead.shutdown()
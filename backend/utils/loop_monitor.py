@@ -0,0 +1,229 @@
+"""Loop Monitor - Detect event-loop blocking and attribute it to a tool or route"""
+
+from typing import Dict, Any, List, Optional
+from collections import deque
+from contextlib import contextmanager
+from config import settings
+import traceback
+import threading
+import asyncio
+import time
+import sys
+import logging
+
+logger = logging.getLogger(__name__)
+
+class LoopLagMonitor:
+    """
+    Samples event-loop scheduling delay and captures the blocking stack
+    
+    A heartbeat task sleeps `interval` seconds and measures how late it
+    wakes up. A watchdog thread notices when the heartbeat is overdue by more
+    than `threshold` and snapshots the loop thread's stack while it is still
+    blocked, attributing it to the activity label (tool or route) of the task
+    that was running. The report is finalized with the measured lag once the
+    loop recovers.
+    """
+    
+    def __init__(self, interval_ms: float = 100, threshold_ms: float = 250, max_reports: int = 50, max_labels: int = 200):
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.lags = deque(maxlen=1000)  # recent lag samples in seconds
+        self.reports = deque(maxlen=max_reports)
+        self.by_label: Dict[str, Dict[str, float]] = {}
+        self.max_labels = max(1, max_labels)  # further labels are totalled under "other"
+        self.stalls = 0
+        self.max_lag = 0.0
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._pending: Optional[Dict[str, Any]] = None  # report captured during the current stall
+        self._labels: Dict[asyncio.Task, List[str]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Start the heartbeat task and watchdog thread on the running loop"""
+        if self._task and not self._task.done():
+            return
+        
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"⏲️  Loop lag monitor started (threshold {self.threshold * 1000:.0f} ms)")
+    
+    async def stop(self):
+        """Stop monitoring"""
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+    
+    @contextmanager
+    def activity(self, label):
+        """Attribute anything that blocks the loop inside this block to `label` (read with str() when a stall is caught)"""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is None:
+            yield
+            return
+        
+        stack = self._labels.setdefault(task, [])
+        stack.append(label)
+        try:
+            yield
+        finally:
+            stack.pop()
+            if not stack:
+                self._labels.pop(task, None)
+    
+    async def _heartbeat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._last_beat = now
+            self._record_lag(lag)
+    
+    def _record_lag(self, lag: float):
+        self.lags.append(lag)
+        self.max_lag = max(self.max_lag, lag)
+        
+        report, self._pending = self._pending, None
+        if report is not None and lag < self.threshold:
+            report = None  # captured just as the loop recovered
+        if report is None:
+            if lag < self.threshold:
+                return
+            # Blocked between watchdog checks - no stack, but still count it
+            report = {"label": "unknown", "task": None, "stack": [], "blocking_frame": None, "detected_at": time.time()}
+        
+        report["lag_ms"] = round(lag * 1000, 2)
+        self.stalls += 1
+        self.reports.append(report)
+        
+        label = report["label"]
+        if label not in self.by_label and len(self.by_label) >= self.max_labels:
+            label = "other"
+        totals = self.by_label.setdefault(label, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        totals["count"] += 1
+        totals["total_ms"] = round(totals["total_ms"] + report["lag_ms"], 2)
+        totals["max_ms"] = max(totals["max_ms"], report["lag_ms"])
+        
+        logger.warning(
+            f"🐢 Event loop blocked for {report['lag_ms']:.0f} ms by {report['label']}"
+            + (f" at {report['blocking_frame']}" if report["blocking_frame"] else "")
+        )
+    
+    def _watch(self):
+        """Watchdog thread: snapshot the loop thread while it is blocked"""
+        poll = min(self.interval, self.threshold) / 2
+        while not self._stop.wait(poll):
+            overdue = time.monotonic() - self._last_beat - self.interval
+            if overdue >= self.threshold and self._pending is None:
+                try:
+                    self._pending = self._capture()
+                except Exception as e:
+                    logger.debug(f"Loop lag capture failed: {str(e)}")
+    
+    def _capture(self) -> Dict[str, Any]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.extract_stack(frame) if frame is not None else []
+        frames = [f"{entry.filename}:{entry.lineno} in {entry.name}" for entry in stack[-15:]]
+        
+        task = asyncio.current_task(self._loop)
+        labels = self._labels.get(task) if task is not None else None
+        label = str(labels[-1]) if labels else self._label_from_stack(stack)
+        
+        return {
+            "label": label,
+            "task": task.get_name() if task is not None else None,
+            "stack": frames,
+            "blocking_frame": frames[-1] if frames else None,
+            "detected_at": time.time()
+        }
+    
+    @staticmethod
+    def _label_from_stack(stack) -> str:
+        """Fallback attribution from the innermost tool or route module on the stack"""
+        for entry in reversed(stack):
+            path = entry.filename.replace("\\", "/")
+            for package, prefix in (("/mcp_tools/", "tool"), ("/routes/", "route")):
+                if package in path:
+                    module = path.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+                    return f"{prefix}:{module}"
+        return "unknown"
+    
+    def _percentile(self, pct: float) -> Optional[float]:
+        if not self.lags:
+            return None
+        ordered = sorted(self.lags)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Lag distribution and blocking totals per label"""
+        def ms(value):
+            return round(value * 1000, 2) if value is not None else None
+        
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "threshold_ms": ms(self.threshold),
+            "samples": len(self.lags),
+            "lag_ms": {
+                "p50": ms(self._percentile(50)),
+                "p99": ms(self._percentile(99)),
+                "max": ms(self.max_lag)
+            },
+            "stalls": self.stalls,
+            "by_label": self.by_label
+        }
+    
+    def recent_reports(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent blocking reports, newest first"""
+        return list(reversed(self.reports))[:limit]
+
+class _RouteLabel:
+    """
+    Request label resolved when read: the middleware runs before routing, so
+    the matched route template (not the raw path, which would make one label
+    per session id) is only in the scope once the router has run
+    """
+    
+    def __init__(self, scope):
+        self.scope = scope
+    
+    def __str__(self) -> str:
+        route = self.scope.get("route")
+        path = getattr(route, "path", None) or "<unmatched>"
+        return f"route:{self.scope.get('method', 'WS')} {path}"
+
+class LoopActivityMiddleware:
+    """ASGI middleware labeling each request's task with its route for attribution"""
+    
+    def __init__(self, app, monitor: LoopLagMonitor):
+        self.app = app
+        self.monitor = monitor
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+        
+        with self.monitor.activity(_RouteLabel(scope)):
+            await self.app(scope, receive, send)
+
+loop_monitor = LoopLagMonitor(
+    interval_ms=settings.LOOP_LAG_INTERVAL_MS,
+    threshold_ms=settings.LOOP_LAG_THRESHOLD_MS,
+    max_reports=settings.LOOP_LAG_MAX_REPORTS
+)
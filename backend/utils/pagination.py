@@ -0,0 +1,107 @@
+"""Pagination - Keyset cursors, field projections and NDJSON streaming for history queries"""
+
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator
+from datetime import datetime
+import base64
+import json
+
+def encode_cursor(timestamp: datetime, tiebreak: Any) -> str:
+    """Opaque cursor pointing at a (timestamp, tiebreak) position"""
+    raw = json.dumps({"t": timestamp.isoformat(), "k": tiebreak}, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, Any]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(data["t"]), data["k"]
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+def keyset_filter(position: Tuple[datetime, Any], tiebreak_field: str, direction: str) -> Dict[str, Any]:
+    """Mongo filter for documents strictly before/after a cursor position in (timestamp, tiebreak) order"""
+    timestamp, tiebreak = position
+    op = "$lt" if direction == "before" else "$gt"
+    return {"$or": [
+        {"timestamp": {op: timestamp}},
+        {"timestamp": timestamp, tiebreak_field: {op: tiebreak}}
+    ]}
+
+def parse_fields(value: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated field list query parameter"""
+    if not value:
+        return None
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    return fields or None
+
+def build_projection(
+    fields: Optional[List[str]],
+    exclude: Optional[List[str]],
+    keys: List[str]
+) -> Optional[Dict[str, int]]:
+    """
+    Mongo projection from include/exclude lists
+    
+    `keys` (the sort and cursor fields) are always returned so every page
+    can produce its own cursors. Inclusion wins when both lists are given.
+    """
+    if fields:
+        projection = {field: 1 for field in fields}
+        projection.update({key: 1 for key in keys})
+        return projection
+    if exclude:
+        return {field: 0 for field in exclude if field not in keys} or None
+    return None
+
+def apply_projection(
+    document: Dict[str, Any],
+    fields: Optional[List[str]],
+    exclude: Optional[List[str]],
+    keys: List[str]
+) -> Dict[str, Any]:
+    """Same semantics as build_projection, applied to a document already in memory"""
+    if fields:
+        return {k: v for k, v in document.items() if k in fields or k in keys}
+    if exclude:
+        return {k: v for k, v in document.items() if k not in exclude or k in keys}
+    return document
+
+def page_cursors(items: List[Dict[str, Any]], tiebreak_field: str) -> Dict[str, Optional[str]]:
+    """Cursors for the pages before (older than) and after (newer than) a page, in either sort order"""
+    def position(doc):
+        return doc.get("timestamp"), doc.get(tiebreak_field)
+    
+    if not items or not all(isinstance(position(doc)[0], datetime) for doc in (items[0], items[-1])):
+        return {"before": None, "after": None}
+    
+    first, last = items[0], items[-1]
+    tiebreaks = [position(first)[1], position(last)[1]]
+    if all(isinstance(t, str) and t.isdigit() for t in tiebreaks):
+        # SQLite row ids come back as integer strings - "10" must sort after "9"
+        tiebreaks = [int(t) for t in tiebreaks]
+    elif type(tiebreaks[0]) is not type(tiebreaks[1]):
+        tiebreaks = [str(t) for t in tiebreaks]
+    
+    if (position(first)[0], tiebreaks[0]) <= (position(last)[0], tiebreaks[1]):
+        oldest, newest = first, last
+    else:
+        oldest, newest = last, first
+    return {
+        "before": encode_cursor(*position(oldest)),
+        "after": encode_cursor(*position(newest))
+    }
+
+def json_default(value: Any):
+    """json.dumps default for datetimes, ObjectIds and other non-JSON values"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+def to_json_line(document: Dict[str, Any]) -> bytes:
+    return (json.dumps(document, default=json_default, ensure_ascii=False) + "\n").encode("utf-8")
+
+async def ndjson_stream(documents: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Serialize documents one per line as they are read"""
+    async for document in documents:
+        yield to_json_line(document)
@@ -0,0 +1,501 @@
+"""Parameter Extractor - Rule-based tool parameters from natural language queries"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import date
+import ast
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (value, confidence) returned by the individual extractors
+Extracted = Optional[Tuple[Any, float]]
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10
+}
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# Words that end a place name ("weather in Paris tomorrow", "in Rome and ...")
+PLACE_TERMINATORS = (
+    r"today|tomorrow|tonight|now|right now|this|next|on|over|during|and|then|to|"
+    r"please|currently|at the moment|for the|in the"
+)
+
+NOT_PLACES = {"the weekend", "weekend", "the week", "a week", "the morning", "the evening", "my area", "celsius", "fahrenheit"}
+
+# "the city", "my place" - a determiner and a generic noun never name somewhere specific
+GENERIC_PLACE = re.compile(
+    r"^(?:the|my|our|your|this|that|his|her|their)\s+"
+    r"(?:city|town|village|area|region|country|neighbou?rhood|office|place|home|house|building|street|world)$",
+    re.IGNORECASE
+)
+
+LANGUAGES = {
+    "english": "en", "spanish": "es", "french": "fr", "german": "de",
+    "italian": "it", "portuguese": "pt", "russian": "ru", "japanese": "ja",
+    "korean": "ko", "chinese": "zh", "mandarin": "zh", "arabic": "ar", "hindi": "hi"
+}
+
+UNITS = {
+    "m": "m", "meter": "m", "meters": "m", "metre": "m", "metres": "m",
+    "km": "km", "kilometer": "km", "kilometers": "km", "kilometre": "km", "kilometres": "km",
+    "cm": "cm", "centimeter": "cm", "centimeters": "cm",
+    "mm": "mm", "millimeter": "mm", "millimeters": "mm",
+    "ft": "ft", "foot": "ft", "feet": "ft",
+    "in": "in", "inch": "in", "inches": "in",
+    "mi": "mi", "mile": "mi", "miles": "mi",
+    "g": "g", "gram": "g", "grams": "g",
+    "kg": "kg", "kilo": "kg", "kilos": "kg", "kilogram": "kg", "kilograms": "kg",
+    "mg": "mg", "milligram": "mg", "milligrams": "mg",
+    "lb": "lb", "lbs": "lb", "pound": "lb", "pounds": "lb",
+    "oz": "oz", "ounce": "oz", "ounces": "oz",
+    "c": "c", "celsius": "c", "°c": "c",
+    "f": "f", "fahrenheit": "f", "°f": "f",
+    "k": "k", "kelvin": "k"
+}
+
+CALC_FUNCTIONS = {"sqrt", "sin", "cos", "tan", "log", "log10", "exp", "abs", "round", "pow", "min", "max", "sum"}
+CALC_CONSTANTS = {"pi", "e"}
+
+_ALLOWED_AST_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Call, ast.Name, ast.Load,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.FloorDiv, ast.USub, ast.UAdd
+)
+
+_QUOTED = re.compile(r"""(?:^|[\s:(])["'“‘]([^"'“”‘’]+)["'”’](?=$|[\s?.!,:;)])""")
+_URL = re.compile(r"https?://[^\s'\"<>]+", re.IGNORECASE)
+_FILE_PATH = re.compile(r"(?<![\w@/])((?:[\w.-]+/)*[\w-][\w.-]*\.[A-Za-z0-9]{1,6})(?![\w@])")
+_NUMBER = r"-?\d+(?:\.\d+)?"
+
+
+class ParamExtractor:
+    """
+    Fast, schema-driven parameter extraction for common tools
+    
+    For each supported tool an action is picked from keyword rules and then
+    the parameters that action needs are pulled out of the query with
+    grammar-like patterns. Only parameters present in the tool's
+    get_schema() are returned, values are coerced to the schema type and
+    every result carries a confidence in [0, 1]; confident results let the
+    pipeline skip an LLM planning call.
+    """
+    
+    # action -> parameters it needs (required, optional)
+    ACTION_PARAMS = {
+        "climate": {
+            "weather": (["location"], []),
+            "forecast": (["location"], ["days"]),
+            "climate": (["location"], [])
+        },
+        "calculator": {
+            "calculate": (["expression"], []),
+            "convert": (["value", "from_unit", "to_unit"], []),
+            "solve": (["equation"], [])
+        },
+        "translator": {
+            "translate": (["text", "to_lang"], ["from_lang"]),
+            "detect": (["text"], []),
+            "languages": ([], [])
+        },
+        "api_integration": {
+            "get": (["url"], []),
+            "post": (["url"], []),
+            "put": (["url"], []),
+            "delete": (["url"], [])
+        },
+        "file_manager": {
+            "read": (["path"], []),
+            "write": (["path", "content"], []),
+            "list": ([], ["path"]),
+            "delete": (["path"], []),
+            "exists": (["path"], [])
+        },
+        "wikipedia": {
+            "summary": (["title"], []),
+            "search": (["query"], [])
+        }
+    }
+    
+    def __init__(self, tool_registry=None):
+        self.tool_registry = tool_registry
+    
+    def supports(self, tool_name: str) -> bool:
+        """Whether local extraction is available for a tool"""
+        return tool_name in self.ACTION_PARAMS
+    
+    def extract(
+        self,
+        tool_name: str,
+        query: str,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Extract an action and parameters for a tool
+        
+        Args:
+            tool_name: Tool to extract parameters for
+            query: Raw user query
+            schema: Tool schema (looked up in the registry when omitted)
+        
+        Returns:
+            {"tool", "action", "params", "confidence", "missing"} or None if unsupported
+        """
+        if not self.supports(tool_name) or not query:
+            return None
+        
+        schema = schema or self._lookup_schema(tool_name)
+        properties = (schema or {}).get("parameters", {}).get("properties", {})
+        
+        action, action_confidence = getattr(self, f"_action_{tool_name}")(query)
+        allowed_actions = properties.get("action", {}).get("enum")
+        if allowed_actions and action not in allowed_actions:
+            return None
+        
+        required, optional = self.ACTION_PARAMS[tool_name][action]
+        params: Dict[str, Any] = {}
+        confidences: List[float] = []
+        missing: List[str] = []
+        
+        for name in required + optional:
+            if properties and name not in properties:
+                continue
+            
+            extracted = getattr(self, f"_extract_{tool_name}")(name, query, action)
+            if extracted is None:
+                if name in required:
+                    missing.append(name)
+                    confidences.append(0.0)
+                continue
+            
+            value, confidence = extracted
+            params[name] = self._coerce(value, properties.get(name, {}))
+            if name in required:
+                confidences.append(confidence)
+        
+        param_confidence = sum(confidences) / len(confidences) if confidences else 1.0
+        
+        return {
+            "tool": tool_name,
+            "action": action,
+            "params": params,
+            "confidence": round(action_confidence * param_confidence, 4),
+            "missing": missing
+        }
+    
+    def _lookup_schema(self, tool_name: str) -> Optional[Dict[str, Any]]:
+        if not self.tool_registry:
+            return None
+        info = self.tool_registry.get_tool_info(tool_name)
+        return info.get("schema") if info else None
+    
+    @staticmethod
+    def _coerce(value: Any, prop: Dict[str, Any]) -> Any:
+        """Coerce a value to the JSON-schema type of its property"""
+        try:
+            if prop.get("type") == "integer":
+                return int(value)
+            if prop.get("type") == "number":
+                return float(value)
+        except (TypeError, ValueError):
+            pass
+        return value
+    
+    @staticmethod
+    def _has(query: str, pattern: str) -> bool:
+        return re.search(pattern, query, re.IGNORECASE) is not None
+    
+    @staticmethod
+    def _quoted(query: str) -> Optional[str]:
+        match = _QUOTED.search(query)
+        return match.group(1).strip() if match else None
+    
+    # ------------------------------------------------------------------ climate
+    
+    def _action_climate(self, query: str) -> Tuple[str, float]:
+        if self._has(query, r"\bclimate\b") and not self._has(query, r"\bweather\b"):
+            return "climate", 0.9
+        if self._has(query, r"\bforecast\b|\btomorrow\b|\bweekend\b|\bnext week\b|\d+\s*-?\s*days?\b|\b(?:on )?(?:%s)\b|\b(?:%s)[- ]days?\b"
+                     % ("|".join(WEEKDAYS), "|".join(NUMBER_WORDS))):
+            return "forecast", 0.9
+        if self._has(query, r"\bweather\b|\btemperature\b|\brain\b|\bsunny\b|\bcloudy\b|\bhumid|\bhot\b|\bcold\b|\bumbrella\b"):
+            return "weather", 0.9
+        return "weather", 0.6
+    
+    def _extract_climate(self, name: str, query: str, action: str) -> Extracted:
+        if name == "location":
+            return self.extract_location(query)
+        if name == "days":
+            return self.extract_days(query)
+        return None
+    
+    def extract_location(self, query: str) -> Extracted:
+        """City or region named in a weather-style query"""
+        match = re.search(
+            r"\b(?:in|for|at|of)\s+([a-z][a-z .'-]*?)\s*(?=$|[?.!,;]|\s+(?:%s)\b)" % PLACE_TERMINATORS,
+            query,
+            re.IGNORECASE
+        )
+        if match:
+            place = match.group(1).strip(" .'-")
+            if (
+                place
+                and place.lower() not in NOT_PLACES
+                and not GENERIC_PLACE.match(place)
+                and not place.lower().startswith(("the next", "the coming"))
+            ):
+                return place.title(), 0.9
+        
+        # "Tokyo weather", "San Francisco forecast"
+        match = re.search(r"\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:weather|forecast|temperature)\b", query)
+        if match and match.group(1).lower() not in {"what", "the", "current"} and not GENERIC_PLACE.match(match.group(1)):
+            return match.group(1), 0.75
+        return None
+    
+    def extract_days(self, query: str, today: Optional[date] = None) -> Extracted:
+        """Forecast horizon in days (today counts as day one)"""
+        q = query.lower()
+        match = re.search(r"\b(\d+)\s*-?\s*days?\b", q)
+        if match:
+            return int(match.group(1)), 1.0
+        match = re.search(r"\b(%s)[- ]days?\b" % "|".join(NUMBER_WORDS), q)
+        if match:
+            return NUMBER_WORDS[match.group(1)], 1.0
+        if "tomorrow" in q:
+            return 2, 0.9
+        if "next week" in q:
+            return 7, 0.8
+        
+        today = today or date.today()
+        if "weekend" in q:
+            return 7 - today.weekday(), 0.8
+        match = re.search(r"\b(%s)\b" % "|".join(WEEKDAYS), q)
+        if match:
+            return (WEEKDAYS.index(match.group(1)) - today.weekday()) % 7 + 1, 0.8
+        return None
+    
+    # --------------------------------------------------------------- calculator
+    
+    def _action_calculator(self, query: str) -> Tuple[str, float]:
+        if self._has(query, r"\bsolve\b|\bequation\b|=") and self._has(query, r"[a-z]\s*[=+\-*/]|[=+\-*/]\s*[a-z]|\d[a-z]\b"):
+            return "solve", 0.9
+        if self._conversion(query):
+            return "convert", 0.95
+        return "calculate", 0.9 if self._has(query, r"\d") else 0.5
+    
+    def _extract_calculator(self, name: str, query: str, action: str) -> Extracted:
+        if name == "expression":
+            return self.extract_expression(query)
+        if name == "equation":
+            match = re.search(r"(?:solve|equation)\s*:?\s*(?:the equation\s*)?(.+?)\s*[?.!]*$", query, re.IGNORECASE)
+            return (match.group(1), 0.9) if match else None
+        
+        conversion = self._conversion(query)
+        if not conversion:
+            return None
+        return conversion[name], 1.0
+    
+    def _conversion(self, query: str) -> Optional[Dict[str, Any]]:
+        """'5 km to miles', 'convert 100 f to c', 'how many grams in 2.5 pounds'"""
+        unit = r"(°?[a-z]+)"
+        match = re.search(rf"({_NUMBER})\s*{unit}\s+(?:to|in|into|as)\s+{unit}\b", query, re.IGNORECASE)
+        if match:
+            value, from_unit, to_unit = match.groups()
+        else:
+            match = re.search(rf"how many\s+{unit}\s+(?:are\s+)?(?:in|is)\s+({_NUMBER})\s*{unit}\b", query, re.IGNORECASE)
+            if not match:
+                return None
+            to_unit, value, from_unit = match.groups()
+        
+        from_unit, to_unit = UNITS.get(from_unit.lower()), UNITS.get(to_unit.lower())
+        if not from_unit or not to_unit:
+            return None
+        return {"value": float(value), "from_unit": from_unit, "to_unit": to_unit}
+    
+    def extract_expression(self, query: str) -> Extracted:
+        """Arithmetic expression in calculator syntax, validated with ast"""
+        q = query.lower()
+        q = re.sub(rf"({_NUMBER})\s*%\s*of\s*({_NUMBER})", r"(\1/100*\2)", q)
+        q = re.sub(r"square root of\s*(\(?[\w.]+\)?)", r"sqrt(\1)", q)
+        q = re.sub(r"(\S+)\s+squared\b", r"\1**2", q)
+        q = re.sub(r"(\S+)\s+cubed\b", r"\1**3", q)
+        replacements = [
+            (r"\bto the power of\b|\^", "**"),
+            (r"\bplus\b|\badded to\b", "+"),
+            (r"\bminus\b|\bless\b", "-"),
+            (r"\btimes\b|\bmultiplied by\b|(?<=\d)\s*[x×]\s*(?=\d)", "*"),
+            (r"\bdivided by\b|\bover\b|÷", "/"),
+            (r"\bmultiply\s+(\S+)\s+by\s+(\S+)", r"\1*\2"),
+            (r"\bdivide\s+(\S+)\s+by\s+(\S+)", r"(\1)/(\2)")
+        ]
+        for pattern, replacement in replacements:
+            q = re.sub(pattern, replacement, q)
+        
+        tokens = re.findall(r"\d+(?:\.\d+)?|\*\*|[+\-*/%(),]|[a-z_][a-z0-9_]*|\S", q)
+        best, current = [], []
+        for token in tokens:
+            allowed = (
+                token[0].isdigit() or token in {"**", "+", "-", "*", "/", "%", "(", ")", ","}
+                or token in CALC_FUNCTIONS or token in CALC_CONSTANTS
+            )
+            if allowed:
+                current.append(token)
+            else:
+                best = max(best, current, key=len)
+                current = []
+        best = max(best, current, key=len)
+        
+        expression = "".join(best).strip(",")
+        while expression and expression[-1] in "+-*/%(,":
+            expression = expression[:-1]
+        if not expression or not self._is_safe_expression(expression):
+            return None
+        
+        has_operation = bool(re.search(r"[+\-*/%]|\w\(", expression))
+        return expression, 1.0 if has_operation else 0.5
+    
+    @staticmethod
+    def _is_safe_expression(expression: str) -> bool:
+        try:
+            tree = ast.parse(expression, mode="eval")
+        except SyntaxError:
+            return False
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_AST_NODES):
+                return False
+            if isinstance(node, ast.Name) and node.id not in CALC_FUNCTIONS | CALC_CONSTANTS:
+                return False
+            if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+                return False
+        return True
+    
+    # --------------------------------------------------------------- translator
+    
+    def _action_translator(self, query: str) -> Tuple[str, float]:
+        if self._has(query, r"\b(?:list|which|what|supported)\b.*\blanguages\b"):
+            return "languages", 0.95
+        if self._has(query, r"\bdetect\b|\bwhat language\b|\bwhich language\b"):
+            return "detect", 0.95
+        return "translate", 0.9 if self._has(query, r"\btranslat|\bsay\b|\bmean\b") else 0.6
+    
+    def _extract_translator(self, name: str, query: str, action: str) -> Extracted:
+        language_names = "|".join(LANGUAGES)
+        if name == "to_lang":
+            match = re.search(rf"\b(?:to|into|in)\s+({language_names})\b", query, re.IGNORECASE)
+            return (LANGUAGES[match.group(1).lower()], 1.0) if match else None
+        if name == "from_lang":
+            match = re.search(rf"\bfrom\s+({language_names})\b", query, re.IGNORECASE)
+            return (LANGUAGES[match.group(1).lower()], 1.0) if match else None
+        if name == "text":
+            quoted = self._quoted(query)
+            if quoted:
+                return quoted, 1.0
+            match = re.search(r":\s*(.+?)\s*$", query)
+            if match:
+                return match.group(1), 0.9
+            match = re.search(
+                rf"\b(?:how (?:do you|would i|to) say|say)\s+(.+?)\s+in\s+(?:{language_names})\b",
+                query,
+                re.IGNORECASE
+            )
+            if match:
+                return match.group(1), 0.9
+            text = re.sub(
+                rf"\b(?:please\s+)?(?:translate|how do you say|how would i say|say|detect the language of|"
+                rf"what language is|what does)\b|\b(?:from|to|into|in)\s+(?:{language_names})\b|\bmean\b",
+                " ",
+                query,
+                flags=re.IGNORECASE
+            )
+            text = re.sub(r"\s+", " ", text).strip(" ?.!")
+            return (text, 0.5) if text else None
+        return None
+    
+    # ---------------------------------------------------------- api_integration
+    
+    def _action_api_integration(self, query: str) -> Tuple[str, float]:
+        for method in ("post", "put", "delete"):
+            if self._has(query, rf"\b{method}\b"):
+                return method, 0.95
+        return "get", 0.9 if self._has(query, r"\bget\b|\bfetch\b|\bcall\b|\bhit\b|\bquery\b") else 0.75
+    
+    def _extract_api_integration(self, name: str, query: str, action: str) -> Extracted:
+        if name != "url":
+            return None
+        match = _URL.search(query)
+        return (match.group(0).rstrip(".,;:!?)"), 1.0) if match else None
+    
+    # ------------------------------------------------------------- file_manager
+    
+    def _action_file_manager(self, query: str) -> Tuple[str, float]:
+        if self._has(query, r"\bdelete\b|\bremove\b"):
+            return "delete", 0.9
+        if self._has(query, r"\bexists?\b|\bis there\b|\bwhether\b"):
+            return "exists", 0.9
+        if self._has(query, r"\bwrite\b|\bsave\b|\bcreate\b|\boverwrite\b"):
+            return "write", 0.9
+        if self._has(query, r"\blist\b|\bwhat'?s in\b|\bwhat is in\b|\bcontents of the\b.*\b(?:folder|directory)\b"):
+            return "list", 0.9
+        if self._has(query, r"\bread\b|\bopen\b|\bshow\b|\bcat\b|\bcontents?\b"):
+            return "read", 0.9
+        return "read", 0.5
+    
+    def _extract_file_manager(self, name: str, query: str, action: str) -> Extracted:
+        if name == "path":
+            return self.extract_path(query, directory=(action == "list"))
+        if name == "content":
+            quoted = self._quoted(query)
+            if quoted:
+                return quoted, 1.0
+            match = re.search(r"\bwith\s+(.+?)\s*$", query, re.IGNORECASE)
+            return (match.group(1), 0.6) if match else None
+        return None
+    
+    def extract_path(self, query: str, directory: bool = False) -> Extracted:
+        """File or directory path relative to the workspace"""
+        if directory:
+            match = re.search(r"\b(?:folder|directory|dir)\s+([\w./-]+)", query, re.IGNORECASE) or \
+                re.search(r"\b(?:the\s+)?([\w./-]+)\s+(?:folder|directory)\b", query, re.IGNORECASE)
+            if match:
+                path = match.group(1)
+                return ("." if path.lower() in {"workspace", "the", "this", "my"} else path), 0.9
+        
+        for match in _FILE_PATH.finditer(query):
+            candidate = match.group(1)
+            if not _URL.search(candidate) and not re.fullmatch(_NUMBER, candidate):
+                return candidate, 1.0
+        return None
+    
+    # ---------------------------------------------------------------- wikipedia
+    
+    def _action_wikipedia(self, query: str) -> Tuple[str, float]:
+        if self._has(query, r"\bsearch\b|\bfind\b.*\barticles\b"):
+            return "search", 0.85
+        return "summary", 0.85
+    
+    def _extract_wikipedia(self, name: str, query: str, action: str) -> Extracted:
+        if name == "query":
+            match = re.search(r"\b(?:search|find)\b(?:\s+wikipedia)?\s+(?:for\s+)?(.+?)\s*[?.!]*$", query, re.IGNORECASE)
+            return (match.group(1), 0.85) if match else None
+        
+        match = re.search(
+            r"(?:who (?:was|is|were)|what (?:is|are|was)|tell me about|explain|definition of|look up|"
+            r"(?:wikipedia|encyclopedia) (?:article |summary |entry )?(?:on|of|about|for))\s+"
+            r"(.+?)(?=\s+on wikipedia\b|\s+(?:and|then)\s|\s*[?.!]*$)",
+            query,
+            re.IGNORECASE
+        )
+        if not match:
+            return None
+        
+        title = re.sub(
+            r"^(?:the\s+)?(?:(?:wikipedia|encyclopedia)\s+(?:article|summary|entry)\s+(?:on|of|about|for)\s+)?"
+            r"(?:what\s+(?:a|an)\s+)?(?:the\s+)?",
+            "",
+            match.group(1).strip(),
+            flags=re.IGNORECASE
+        )
+        title = re.sub(r"\s+(?:is|are|was|were)$", "", title, flags=re.IGNORECASE)
+        return (title, 0.85) if title else None
@@ -0,0 +1,71 @@
+"""Payloads - Bounded inline summaries and compressed, content-addressed tool results"""
+
+from typing import Dict, Any, Optional, Tuple
+import hashlib
+import json
+import zlib
+
+# zstd compresses faster and smaller than zlib; optional dependency
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+MAX_PAYLOAD_BYTES = 15 * 1024 * 1024  # stay under MongoDB's 16MB document limit
+
+def default_codec() -> str:
+    return "zstd" if ZSTD_AVAILABLE else "zlib"
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data, 6)
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("Payload is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+def compact_result(
+    result: Any,
+    inline_max_bytes: int,
+    codec: Optional[str] = None,
+    preview_chars: int = 512
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Split a tool result into the fields stored on the log and an optional payload
+    
+    Results up to `inline_max_bytes` of JSON stay inline unchanged. Larger ones
+    are replaced by a summary (success/error, top-level keys, a preview) plus a
+    `payload` reference; the full result is returned as a compressed payload
+    document keyed by the SHA-256 of its canonical JSON, so identical results
+    are stored once. Blocking for large results - call it off the event loop.
+    """
+    raw = json.dumps(result, default=str, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    if len(raw) <= inline_max_bytes:
+        return {"result": result}, None
+    
+    summary: Dict[str, Any] = {"truncated": True, "preview": raw[:preview_chars].decode("utf-8", errors="ignore")}
+    if isinstance(result, dict):
+        summary["keys"] = list(result)[:20]
+        for key in ("success", "error", "action", "count"):
+            if key in result and not isinstance(result[key], (dict, list)):
+                summary[key] = result[key]
+    
+    codec = codec or default_codec()
+    if codec == "zstd" and not ZSTD_AVAILABLE:
+        codec = "zlib"
+    data = compress(raw, codec)
+    digest = hashlib.sha256(raw).hexdigest()
+    reference = {"hash": digest, "size": len(raw), "stored_size": len(data), "codec": codec}
+    
+    if len(data) > MAX_PAYLOAD_BYTES:
+        return {"result": summary, "payload": {**reference, "dropped": True}}, None
+    return {"result": summary, "payload": reference}, {"hash": digest, "codec": codec, "size": len(raw), "data": data}
+
+def expand_payload(data: bytes, codec: str) -> Any:
+    """Decompress and parse a stored payload back into the original result"""
+    return json.loads(decompress(data, codec))
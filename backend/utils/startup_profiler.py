@@ -0,0 +1,80 @@
+"""Startup Profiler - Per-phase timing and memory of server startup"""
+
+from typing import Dict, Any, List, Optional
+from contextlib import contextmanager
+from pathlib import Path
+import json
+import time
+import sys
+import os
+import logging
+
+# Current RSS on every platform (the resource module is POSIX-only)
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+def current_rss_mb() -> float:
+    """Current resident set size in MB (0 when it cannot be read)"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0.0
+
+class StartupProfiler:
+    """Records how long each startup phase takes and the RSS after it"""
+    
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.phases: List[Dict[str, Any]] = []
+        self.finished_at: Optional[float] = None
+    
+    def record(self, name: str, start: float, end: Optional[float] = None):
+        """Record a phase measured elsewhere (perf_counter timestamps)"""
+        end = end if end is not None else time.perf_counter()
+        self.started_at = min(self.started_at, start)
+        self.phases.append({
+            "phase": name,
+            "duration_ms": round((end - start) * 1000, 2),
+            "rss_mb": round(current_rss_mb(), 1)
+        })
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Time a startup phase (works around sync and async code)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start)
+    
+    async def measure(self, name: str, awaitable):
+        """Await something as its own phase (lets concurrent phases be timed separately)"""
+        with self.phase(name):
+            return await awaitable
+    
+    def finish(self):
+        self.finished_at = time.perf_counter()
+    
+    def report(self) -> Dict[str, Any]:
+        """Startup report: total time, RSS and each phase"""
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return {
+            "total_ms": round((end - self.started_at) * 1000, 2),
+            "rss_mb": round(current_rss_mb(), 1),
+            "modules_loaded": len(sys.modules),
+            "phases": self.phases
+        }
+    
+    def write_report(self, path: str):
+        Path(path).write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+        logger.info(f"📝 Startup profile written to {path}")
+
+startup_profiler = StartupProfiler()
@@ -1,82 +1,164 @@
 """Tool Registry - Register and manage MCP tools"""
 
-from typing import Dict, Any, List, Optional
-from mcp_tools import (
-    WebSearchTool,
-    FileManagerTool,
-    DatabaseTool,
-    EmailTool,
-    DriveTool,
-    AutomationTool,
-    MemoryTool,
-    AnalyticsTool,
-    KnowledgebaseTool,
-    APIIntegrationTool,
-    ClimateTool,
-    WikipediaTool,
-    PythonCodeTool,
-    ScreenMonitorTool,
-    SystemMonitorTool,
-    CalculatorTool,
-    TranslatorTool
-)
+from typing import Dict, Any, List, Optional, Callable
+from pathlib import Path
+from config import settings
+import importlib
+import asyncio
+import hashlib
+import json
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+MANIFEST_PATH = Path(__file__).resolve().parent.parent / "mcp_tools" / "manifest.json"
+
 class ToolRegistry:
-    """Registry for managing MCP tools"""
+    """Registry for managing MCP tools
+    
+    Tool metadata (name, description, schema) comes from the static manifest
+    (mcp_tools/manifest.json); a tool's module is imported and the tool
+    instantiated only on first get_tool()/load_tool(), so startup does not pay
+    for heavy dependencies of unused tools.
+    """
     
     def __init__(self):
-        self.tools: Dict[str, Any] = {}
+        self.tools: Dict[str, Any] = {}  # loaded tool instances
         self.tool_status: Dict[str, bool] = {}
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+        self.tool_state: Dict[str, str] = {}  # cold -> warming -> ready | failed
+        self._init_tasks: Dict[str, asyncio.Task] = {}
+        
+        # Serialized tool catalog, rebuilt only after the registry changes
+        self.catalog_version = 0
+        self._catalog: Optional[Dict[str, Any]] = None
+        self._catalog_listeners: List[Callable[[int], None]] = []
     
     async def register_all_tools(self):
-        """Register all available MCP tools"""
-        tool_classes = [
-            WebSearchTool,
-            FileManagerTool,
-            DatabaseTool,
-            EmailTool,
-            DriveTool,
-            AutomationTool,
-            MemoryTool,
-            AnalyticsTool,
-            KnowledgebaseTool,
-            APIIntegrationTool,
-            ClimateTool,
-            WikipediaTool,
-            PythonCodeTool,
-            ScreenMonitorTool,
-            SystemMonitorTool,
-            CalculatorTool,
-            TranslatorTool
+        """Register all available MCP tools from the manifest"""
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        
+        for entry in entries:
+            self.manifest[entry["name"]] = entry
+            self.tool_status[entry["name"]] = entry.get("enabled", True)
+            self.tool_state[entry["name"]] = "cold"
+            logger.info(f"✅ Registered tool: {entry['name']}")
+        self._invalidate_catalog()
+        
+        # Preloaded tools and tools with an initialize() step (e.g. connections)
+        # warm up concurrently; any still running after TOOL_INIT_TIMEOUT finish
+        # in the background and stay "warming" until ready
+        startup_tools = [
+            name for name, entry in self.manifest.items()
+            if name in settings.TOOL_PRELOAD or entry.get("has_initialize")
         ]
+        await asyncio.gather(*(
+            self.load_tool(name, timeout=settings.TOOL_INIT_TIMEOUT)
+            for name in startup_tools
+        ))
+    
+    def get_tool(self, tool_name: str) -> Optional[Any]:
+        """Get tool by name, importing and instantiating it on first use"""
+        tool = self.tools.get(tool_name)
+        if tool is not None:
+            return tool
         
-        for tool_class in tool_classes:
+        entry = self.manifest.get(tool_name)
+        if not entry:
+            return None
+        
+        try:
+            module = importlib.import_module(entry["module"])
+            tool = getattr(module, entry["class"])()
+        except Exception as e:
+            logger.error(f"❌ Failed to load {entry['class']}: {str(e)}")
+            return None
+        
+        # Respect toggles made before the tool was loaded; tools may also disable themselves
+        tool.enabled = tool.enabled and self.tool_status.get(tool_name, True)
+        self.tool_status[tool_name] = tool.enabled
+        self.tools[tool_name] = tool
+        if not hasattr(tool, 'initialize'):
+            self.tool_state[tool_name] = "ready"
+        self._invalidate_catalog()
+        
+        logger.info(f"📦 Loaded tool: {tool_name}")
+        return tool
+    
+    async def load_tool(self, tool_name: str, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Get tool by name and start its initialize() if it has one
+        
+        Args:
+            tool_name: Name of the tool
+            timeout: Seconds to wait for initialization; None waits until done.
+                     On timeout the tool is returned while still "warming".
+        """
+        tool = self.get_tool(tool_name)
+        if tool is None or not hasattr(tool, 'initialize'):
+            return tool
+        
+        # Concurrent first callers share one initialization
+        init_task = self._init_tasks.get(tool_name)
+        if init_task is None:
+            init_task = asyncio.ensure_future(self._initialize(tool_name, tool))
+            self._init_tasks[tool_name] = init_task
+        
+        if not init_task.done():
             try:
-                tool = tool_class()
-                
-                # Initialize if needed
-                if hasattr(tool, 'initialize'):
-                    await tool.initialize()
-                
-                self.tools[tool.name] = tool
-                self.tool_status[tool.name] = tool.enabled
-                
-                logger.info(f"✅ Registered tool: {tool.name}")
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to register {tool_class.__name__}: {str(e)}")
+                await asyncio.wait_for(asyncio.shield(init_task), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"⏳ {tool_name} still warming after {timeout}s - continuing in background")
+        
+        return tool
     
-    def get_tool(self, tool_name: str) -> Optional[Any]:
-        """Get tool by name"""
-        return self.tools.get(tool_name)
+    async def _initialize(self, tool_name: str, tool):
+        """Run a tool's initialize() and record the resulting state"""
+        self.tool_state[tool_name] = "warming"
+        self._invalidate_catalog()
+        start = time.perf_counter()
+        failed = False
+        
+        try:
+            await tool.initialize()
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize {tool_name}: {str(e)}")
+            tool.enabled = False
+            failed = True
+        
+        # Tools disable themselves when a dependency is unavailable
+        failed = failed or (self.tool_status.get(tool_name, False) and not tool.enabled)
+        self.tool_status[tool_name] = tool.enabled
+        self.tool_state[tool_name] = "failed" if failed else "ready"
+        self._invalidate_catalog()
+        
+        logger.info(f"🔥 {tool_name} {self.tool_state[tool_name]} in {time.perf_counter() - start:.2f}s")
+    
+    def get_tool_state(self, tool_name: str) -> Optional[str]:
+        """Get a tool's lifecycle state: cold, warming, ready or failed"""
+        return self.tool_state.get(tool_name)
+    
+    async def shutdown(self):
+        """Cancel initializers still running in the background"""
+        pending = [task for task in self._init_tasks.values() if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    
+    def get_tool_metadata(self, tool_name: str) -> Optional[Dict[str, Any]]:
+        """Get static manifest metadata for a tool without loading it"""
+        return self.manifest.get(tool_name)
     
     def get_all_tools(self) -> Dict[str, Any]:
-        """Get all registered tools"""
+        """Get all loaded tool instances"""
         return self.tools
     
+    def get_tool_names(self) -> List[str]:
+        """Get names of all registered tools, loaded or not"""
+        return list(self.manifest.keys())
+    
     def get_active_tools(self) -> List[str]:
         """Get list of active tool names"""
         return [
@@ -84,32 +166,33 @@ class ToolRegistry:
             if status
         ]
     
+    def _set_enabled(self, tool_name: str, enabled: bool):
+        if tool_name in self.tools:
+            self.tools[tool_name].enabled = enabled
+        self.tool_status[tool_name] = enabled
+        self._invalidate_catalog()
+    
     def enable_tool(self, tool_name: str) -> bool:
         """Enable a tool"""
-        if tool_name in self.tools:
-            self.tools[tool_name].enabled = True
-            self.tool_status[tool_name] = True
+        if tool_name in self.manifest:
+            self._set_enabled(tool_name, True)
             logger.info(f"✅ Enabled tool: {tool_name}")
             return True
         return False
     
     def disable_tool(self, tool_name: str) -> bool:
         """Disable a tool"""
-        if tool_name in self.tools:
-            self.tools[tool_name].enabled = False
-            self.tool_status[tool_name] = False
+        if tool_name in self.manifest:
+            self._set_enabled(tool_name, False)
             logger.info(f"⏸️ Disabled tool: {tool_name}")
             return True
         return False
     
     def toggle_tool(self, tool_name: str) -> bool:
         """Toggle tool status"""
-        if tool_name in self.tools:
-            current_status = self.tool_status[tool_name]
-            new_status = not current_status
-            
-            self.tools[tool_name].enabled = new_status
-            self.tool_status[tool_name] = new_status
+        if tool_name in self.manifest:
+            new_status = not self.tool_status[tool_name]
+            self._set_enabled(tool_name, new_status)
             
             logger.info(f"🔄 Toggled {tool_name}: {new_status}")
             return new_status
@@ -117,20 +200,64 @@ class ToolRegistry:
     
     def get_tool_info(self, tool_name: str) -> Optional[Dict[str, Any]]:
         """Get tool information"""
-        tool = self.tools.get(tool_name)
-        if not tool:
+        entry = self.manifest.get(tool_name)
+        if not entry:
             return None
         
         return {
-            "name": tool.name,
-            "description": tool.description,
-            "enabled": tool.enabled,
-            "schema": tool.get_schema() if hasattr(tool, 'get_schema') else None
+            "name": entry["name"],
+            "description": entry["description"],
+            "enabled": self.tool_status.get(tool_name, False),
+            "loaded": tool_name in self.tools,
+            "state": self.tool_state.get(tool_name, "cold"),
+            "schema": entry.get("schema")
         }
     
     def get_all_tools_info(self) -> List[Dict[str, Any]]:
         """Get information for all tools"""
         return [
             self.get_tool_info(name)
-            for name in self.tools.keys()
+            for name in self.manifest.keys()
         ]
+    
+    def get_catalog(self) -> Dict[str, Any]:
+        """
+        Get the current tool catalog snapshot
+        
+        Returns:
+            {"version": ..., "etag": ..., "body": <serialized JSON bytes>},
+            built once per registry change and shared by all requests
+        """
+        if self._catalog is None:
+            tools_info = self.get_all_tools_info()
+            # The version counter is per process, so the ETag hashes only the tools -
+            # every worker serving the same catalog hands out the same ETag
+            content = json.dumps(tools_info, sort_keys=True, default=str).encode("utf-8")
+            body = json.dumps({
+                "success": True,
+                "tools": tools_info,
+                "count": len(tools_info),
+                "version": self.catalog_version
+            }).encode("utf-8")
+            
+            self._catalog = {
+                "version": self.catalog_version,
+                "etag": f'"{hashlib.sha1(content).hexdigest()[:16]}"',
+                "body": body
+            }
+        return self._catalog
+    
+    def add_catalog_listener(self, callback: Callable[[int], None]):
+        """Call callback(version) whenever the catalog changes"""
+        self._catalog_listeners.append(callback)
+    
+    def _invalidate_catalog(self):
+        """Drop the catalog snapshot and notify listeners of the new version"""
+        self.catalog_version += 1
+        self._catalog = None
+        
+        for callback in self._catalog_listeners:
+            try:
+                callback(self.catalog_version)
+            except Exception as e:
+                logger.warning(f"⚠️  Catalog listener error: {str(e)}")